@@ -3,17 +3,39 @@
 Simple PDF Text Extraction Script
 
 This script just extracts text from PDFs to see what we're working with.
+PDFs are parsed in parallel with a process pool since extraction is CPU-bound.
 """
 
-import sys
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
 
-# Add src to path for imports
-sys.path.append(str(Path(__file__).parent / "src"))
-
 from src.ingest.pdf_processor import PDFProcessor
 
 
+def _extract_one(pdf_path: Path) -> dict:
+    """
+    Extract text and metadata from a single PDF inside a worker process.
+    
+    A fresh PDFProcessor is created per call so the processor instance
+    never has to be pickled across the process boundary. Pages are streamed
+    so the full text is never held in memory; only a small summary is
+    returned to the parent.
+    """
+    processor = PDFProcessor(str(pdf_path.parent))
+    
+    summary = processor.summarize_pdf(pdf_path)
+    if not summary["token_count"]:
+        return {"path": pdf_path, "text_length": 0}
+    
+    return {
+        **summary,
+        "path": pdf_path,
+        "file_size": pdf_path.stat().st_size,
+        "preview": summary["preview"].replace('\n', ' ').strip()
+    }
+
+
 def main():
     """
     Just extract text from PDFs to see what we have.
@@ -35,43 +57,37 @@ def main():
     
     print(f"🔍 Found {len(pdf_files)} PDF files")
     
-    # Process each PDF individually
-    for i, pdf_path in enumerate(pdf_files, 1):
-        print(f"\n📄 PDF {i}/{len(pdf_files)}: {pdf_path.name}")
-        print("-" * 40)
+    # Extract all PDFs in parallel, reporting each one as it completes
+    with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+        futures = {executor.submit(_extract_one, pdf_path): pdf_path for pdf_path in pdf_files}
         
-        try:
-            # Extract text
-            text = processor.extract_text_from_pdf(pdf_path)
-            if not text:
-                print(f"⚠️ No text extracted")
-                continue
-            
-            # Classify service type
-            service_type = processor.classify_service_type(text, pdf_path.name)
-            
-            # Extract metadata
-            doc_title = processor.extract_document_title(text, pdf_path.name)
-            doc_date = processor.extract_date(text, pdf_path.name)
+        for i, future in enumerate(as_completed(futures), 1):
+            pdf_path = futures[future]
+            print(f"\n📄 PDF {i}/{len(pdf_files)}: {pdf_path.name}")
+            print("-" * 40)
             
-            print(f"✅ Text length: {len(text)} characters")
-            print(f"✅ Service: {service_type}")
-            print(f"✅ Title: {doc_title}")
-            print(f"✅ Date: {doc_date}")
-            print(f"✅ File size: {pdf_path.stat().st_size} bytes")
+            try:
+                result = future.result()
+                if not result["text_length"]:
+                    print(f"⚠️ No text extracted")
+                    continue
+                
+                print(f"✅ Text length: {result['text_length']} characters")
+                print(f"✅ Service: {result['service_type']}")
+                print(f"✅ Title: {result['doc_title']}")
+                print(f"✅ Date: {result['date']}")
+                print(f"✅ File size: {result['file_size']} bytes")
+                
+                # Show first 200 characters
+                print(f"📝 Preview: {result['preview']}...")
+                
+                # Simple token count
+                print(f"🔢 Approx tokens: {result['token_count']}")
+                
+            except Exception as e:
+                print(f"❌ Error: {e}")
             
-            # Show first 200 characters
-            preview = text[:200].replace('\n', ' ').strip()
-            print(f"📝 Preview: {preview}...")
-            
-            # Simple token count
-            tokens = text.split()
-            print(f"🔢 Approx tokens: {len(tokens)}")
-            
-        except Exception as e:
-            print(f"❌ Error: {e}")
-        
-        print(f"✅ PDF {i}/{len(pdf_files)} completed")
+            print(f"✅ PDF {i}/{len(pdf_files)} completed")
     
     print(f"\n🎯 Text extraction complete!")
 
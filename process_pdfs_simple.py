@@ -2,113 +2,201 @@
 """
 Simple PDF Processing Script for NYC Services GPT RAG System
 
-This script processes PDFs one at a time to avoid memory issues.
+This script extracts and chunks PDFs in a process pool, then streams the
+chunks of the whole corpus through fixed-size concurrent embedding batches,
+handing each batch to a writer thread so ChromaDB writes overlap with the
+next embedding round-trip.
 """
 
 import os
-import sys
-import gc
+import queue
+import asyncio
+import threading
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 from pathlib import Path
 
-# Add src to path for imports
-sys.path.append(str(Path(__file__).parent / "src"))
+import numpy as np
 
-from src.ingest.pdf_processor import PDFProcessor
-from src.ingest.data_processor import process_documents
-from src.retrieve.vector_store import init_vector_store, add_documents
+from src.ingest.pdf_processor import PDFProcessor, PageSummary
+from src.ingest.chunker import chunk_text_stream
+from src.ingest.data_processor import EmbeddingClient
+from src.ingest.ingest_manifest import IngestManifest
+from src.retrieve.vector_store import init_vector_store, add_arrays
+from src.models.async_utils import run_blocking
 
 
-def process_single_pdf(pdf_path: Path, processor: PDFProcessor, chunk_size: int = 300, overlap: int = 50):
+def _extract_and_chunk(pdf_path: Path, chunk_size: int = 300, overlap: int = 50):
     """
-    Process a single PDF file completely.
+    Extract, classify, and chunk a single PDF inside a worker process.
+    
+    A fresh PDFProcessor is created per call so the processor instance never
+    has to be pickled across the process boundary.
     """
-    print(f"📄 Processing: {pdf_path.name}")
+    processor = PDFProcessor(str(pdf_path.parent))
     
-    try:
-        # Extract text
-        text = processor.extract_text_from_pdf(pdf_path)
-        if not text:
-            print(f"⚠️ No text extracted from {pdf_path.name}")
-            return None
-        
-        # Classify service type
-        service_type = processor.classify_service_type(text, pdf_path.name)
-        
-        # Extract metadata
-        doc_title = processor.extract_document_title(text, pdf_path.name)
-        doc_date = processor.extract_date(text, pdf_path.name)
-        
-        # Create document record
-        doc_record = {
-            "text": text,
-            "metadata": {
-                "source": str(pdf_path),
-                "service_type": service_type,
-                "doc_title": doc_title,
-                "date": doc_date,
-                "filename": pdf_path.name,
-                "file_size": pdf_path.stat().st_size,
-                "processing_date": datetime.now().isoformat()
-            }
-        }
-        
-        print(f"✅ Extracted text: {len(text)} characters")
-        print(f"✅ Classified as: {service_type}")
-        print(f"✅ Title: {doc_title}")
-        
-        # Chunk the document
-        print(f"🔪 Chunking document...")
-        chunks = processor.chunk_and_prepare_for_embedding([doc_record], chunk_size, overlap)
-        
+    # Stream pages straight into the chunker, summarizing them on the way
+    summary = PageSummary(processor)
+    pages = summary.scan(processor.iter_pages(pdf_path))
+    chunks = list(chunk_text_stream(pages, chunk_size=chunk_size, overlap=overlap))
+    
+    result = summary.result(pdf_path.name)
+    if not result["token_count"]:
+        print(f"⚠️ No text extracted from {pdf_path.name}")
+        return None
+    
+    metadata = {
+        "source": str(pdf_path),
+        "service_type": result["service_type"],
+        "doc_title": result["doc_title"],
+        "date": result["date"],
+        "filename": pdf_path.name,
+        "file_size": pdf_path.stat().st_size,
+        "processing_date": datetime.now().isoformat()
+    }
+    
+    print(f"✅ Extracted text from {pdf_path.name}: {result['text_length']} characters")
+    print(f"✅ Classified {pdf_path.name} as: {result['service_type']}")
+    
+    return processor.build_chunk_records(chunks, metadata, chunk_size, overlap)
+
+
+def _collect_chunks(pdf_files, chunk_lists):
+    """
+    Flatten the chunks of every PDF into corpus-wide parallel arrays.
+    
+    Returns:
+        Tuple of (ids, documents, metadatas) across all PDFs, plus a dict
+        mapping each PDF path to its chunk ids
+    """
+    ids = []
+    documents = []
+    metadatas = []
+    pdf_ids = {}
+    
+    for pdf_path, chunks in zip(pdf_files, chunk_lists):
+        if isinstance(chunks, Exception):
+            print(f"❌ Error extracting {pdf_path.name}: {chunks}")
+            continue
         if not chunks:
-            print(f"⚠️ No chunks created for {pdf_path.name}")
-            return None
-        
-        print(f"✅ Created {len(chunks)} chunks")
+            print(f"⚠️ Skipping {pdf_path.name} - no chunks created")
+            continue
         
-        # Generate embeddings for chunks
-        print(f"🧮 Generating embeddings...")
-        chunk_texts = [chunk["text"] for chunk in chunks]
+        pdf_ids[pdf_path] = []
+        file_stem = pdf_path.stem
+        for i, chunk in enumerate(chunks):
+            record_id = f"{file_stem}_chunk_{i}"
+            metadata = chunk["metadata"]
+            metadata["record_id"] = record_id
+            metadata["source_type"] = "pdf_document"
+            
+            ids.append(record_id)
+            pdf_ids[pdf_path].append(record_id)
+            documents.append(chunk["text"])
+            metadatas.append(metadata)
         
-        embedded_records = process_documents(
-            chunk_texts,
-            chunk_size=chunk_size,
-            overlap=overlap
-        )
+        print(f"✅ Queued {len(chunks)} chunks from {pdf_path.name}")
+    
+    return ids, documents, metadatas, pdf_ids
+
+
+async def stream_record_batches(
+    ids,
+    documents,
+    metadatas,
+    embedding_client: EmbeddingClient,
+    batch_size: int = 128,
+    known_embeddings: dict = None,
+    shared_hashes: set = None
+):
+    """
+    Embed chunks in fixed-size batches and yield them ready for ChromaDB.
+    
+    Up to the client's max_concurrency batches are in flight at once, and
+    batches are yielded in order as they complete. Each batch's embeddings go
+    out of scope once the caller has written it, so memory stays flat
+    without forcing garbage collection.
+    
+    Chunks whose chunk_hash is in known_embeddings reuse that embedding
+    instead of being sent to the API. Fresh embeddings for hashes in
+    shared_hashes are added to known_embeddings so later duplicates reuse them.
+    
+    Yields:
+        Tuples of (ids, embeddings, documents, metadatas) per batch
+    """
+    known_embeddings = {} if known_embeddings is None else known_embeddings
+    shared_hashes = shared_hashes or set()
+    
+    async def embed_batch(start: int, end: int) -> np.ndarray:
+        batch_hashes = [metadata["chunk_hash"] for metadata in metadatas[start:end]]
         
-        if not embedded_records:
-            print(f"⚠️ No embeddings generated for {pdf_path.name}")
-            return None
+        # Only embed texts whose hash has no embedding yet, once per hash
+        missing = {}
+        for offset, chunk_hash in enumerate(batch_hashes):
+            if chunk_hash not in known_embeddings and chunk_hash not in missing:
+                missing[chunk_hash] = documents[start + offset]
         
-        print(f"✅ Generated {len(embedded_records)} embeddings")
+        fresh = {}
+        if missing:
+            vectors = await embedding_client.aget_embeddings(list(missing.values()), batch_size=batch_size)
+            fresh = dict(zip(missing, vectors))
+            known_embeddings.update((h, v) for h, v in fresh.items() if h in shared_hashes)
         
-        # Merge metadata
-        final_records = []
-        for i, (embedded_record, chunked_record) in enumerate(zip(embedded_records, chunks)):
-            final_record = {
-                "text": embedded_record["text"],
-                "embedding": embedded_record["embedding"],
-                "metadata": {
-                    **chunked_record["metadata"],
-                    **embedded_record["metadata"],
-                    "record_id": f"{pdf_path.stem}_chunk_{i}",
-                    "source_type": "pdf_document"
-                }
-            }
-            final_records.append(final_record)
+        rows = []
+        for chunk_hash in batch_hashes:
+            vector = fresh.get(chunk_hash)
+            if vector is None:
+                vector = known_embeddings.get(chunk_hash)
+            if vector is None:
+                # Embedding failed; records from here on are reported as missing
+                break
+            rows.append(vector)
         
-        print(f"✅ Merged metadata for {len(final_records)} records")
-        return final_records
+        return np.asarray(rows, dtype=np.float32)
+    
+    pending = deque()
+    
+    for start in range(0, len(ids), batch_size):
+        end = min(start + batch_size, len(ids))
+        pending.append((start, end, asyncio.ensure_future(embed_batch(start, end))))
         
-    except Exception as e:
-        print(f"❌ Error processing {pdf_path.name}: {e}")
-        return None
+        if len(pending) >= embedding_client.max_concurrency:
+            start, end, embed_job = pending.popleft()
+            yield ids[start:end], await embed_job, documents[start:end], metadatas[start:end]
+    
+    while pending:
+        start, end, embed_job = pending.popleft()
+        yield ids[start:end], await embed_job, documents[start:end], metadatas[start:end]
 
 
-def main():
+def _write_batches(vector_store, write_queue: queue.Queue, totals: dict):
     """
-    Process PDFs one at a time to avoid memory issues.
+    Writer thread: add embedded batches to ChromaDB until a None sentinel arrives.
+    
+    Args:
+        vector_store: Initialized VectorStore instance
+        write_queue: Queue of (ids, embeddings, documents, metadatas) batches
+        totals: Shared dict with the "added" count and the "failed" id set
+    """
+    while (batch := write_queue.get()) is not None:
+        batch_ids = batch[0]
+        print(f"📚 Adding {len(batch_ids)} records to ChromaDB...")
+        if add_arrays(vector_store, *batch):
+            totals["added"] += len(batch_ids)
+        else:
+            totals["failed"].update(batch_ids)
+            print(f"❌ Failed to add records starting at {batch_ids[0]}")
+
+
+async def main_async(batch_size: int = 128, write_queue_size: int = 4):
+    """
+    Extract PDFs in parallel, then embed the whole corpus in fixed-size
+    batches while a writer thread adds finished batches to ChromaDB.
+    
+    Args:
+        batch_size: Texts per embedding request and records per ChromaDB add
+        write_queue_size: Embedded batches allowed to wait for the writer
     """
     print("🚀 NYC Services GPT - Simple PDF Processing Pipeline")
     print("=" * 60)
@@ -125,7 +213,7 @@ def main():
         print(f"❌ No PDF files found in {processor.docs_folder}")
         return
     
-    print(f"🔍 Found {len(pdf_files)} PDF files to process")
+    print(f"🔍 Found {len(pdf_files)} PDF files")
     
     # Initialize vector store
     print(f"\n🗄️ Initializing ChromaDB...")
@@ -134,40 +222,107 @@ def main():
         print("❌ Failed to initialize vector store")
         return
     
-    # Process each PDF individually
-    total_added = 0
+    # Skip PDFs whose contents were already ingested; a manifest is only
+    # trusted while the collection still holds the data it describes
+    manifest = IngestManifest(processor.docs_folder / ".ingest_manifest.json")
+    if len(manifest) and not vector_store.collection.count():
+        print("⚠️ Collection is empty - ignoring ingest manifest")
+        manifest.clear()
     
-    for i, pdf_path in enumerate(pdf_files, 1):
-        print(f"\n📚 Processing PDF {i}/{len(pdf_files)}")
-        print("-" * 40)
-        
-        # Process this PDF
-        final_records = process_single_pdf(pdf_path, processor, chunk_size=300, overlap=50)
-        
-        if final_records:
-            # Add to ChromaDB
-            print(f"📚 Adding {len(final_records)} records to ChromaDB...")
-            
-            success = add_documents(vector_store, final_records)
-            if success:
-                total_added += len(final_records)
-                print(f"✅ Successfully added {len(final_records)} records from {pdf_path.name}")
-            else:
-                print(f"❌ Failed to add records from {pdf_path.name}")
+    file_hashes = {}
+    for pdf_path in pdf_files:
+        is_current, sha = manifest.check(pdf_path)
+        if is_current:
+            print(f"⏭️ Skipping unchanged {pdf_path.name}")
         else:
-            print(f"⚠️ Skipping {pdf_path.name} - processing failed")
-        
-        # Clear memory
-        if 'final_records' in locals():
-            del final_records
-        gc.collect()
-        
-        print(f"✅ PDF {i}/{len(pdf_files)} completed")
+            file_hashes[pdf_path] = sha
+    
+    skipped = len(pdf_files) - len(file_hashes)
+    pdf_files = list(file_hashes)
+    if not pdf_files:
+        manifest.save()
+        print(f"\n✅ All {skipped} PDF files are up to date - nothing to process")
+        return
+    
+    print(f"🔍 Processing {len(pdf_files)} new or changed PDF files ({skipped} unchanged)")
+    
+    # Phase 1: extract and chunk all PDFs in parallel worker processes
+    loop = asyncio.get_running_loop()
+    with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+        chunk_jobs = [
+            loop.run_in_executor(executor, _extract_and_chunk, pdf_path, 300, 50)
+            for pdf_path in pdf_files
+        ]
+        chunk_lists = await asyncio.gather(*chunk_jobs, return_exceptions=True)
+    
+    ids, documents, metadatas, pdf_ids = _collect_chunks(pdf_files, chunk_lists)
+    del chunk_lists
+    
+    if not ids:
+        print("❌ No chunks to embed")
+        return
+    
+    # Reuse embeddings of chunks whose exact text is already stored, including
+    # unchanged passages of edited PDFs and content repeated across documents
+    hash_counts = Counter(metadata["chunk_hash"] for metadata in metadatas)
+    known_embeddings = vector_store.get_embeddings_by_hash(list(hash_counts))
+    shared_hashes = {chunk_hash for chunk_hash, count in hash_counts.items() if count > 1}
+    reused = sum(count for chunk_hash, count in hash_counts.items() if chunk_hash in known_embeddings)
+    duplicates = sum(count - 1 for chunk_hash, count in hash_counts.items() if chunk_hash not in known_embeddings)
+    if reused or duplicates:
+        print(f"♻️ Reusing embeddings for {reused} stored and {duplicates} duplicate chunks")
+    
+    # Drop the chunks of earlier versions of changed files before re-adding
+    for pdf_path in pdf_files:
+        vector_store.delete_ids(manifest.stale_chunk_ids(pdf_path))
+    
+    # Phase 2: embed the whole corpus in fixed-size batches, so requests are
+    # full regardless of how the chunks are spread across PDFs. A writer thread
+    # commits each batch to ChromaDB while the next one is being embedded; the
+    # bounded queue caps how many embedded batches wait in memory.
+    print(f"\n🧮 Generating embeddings for {len(ids)} chunks in batches of {batch_size}...")
+    embedding_client = EmbeddingClient()
+    totals = {"added": 0, "failed": set()}
+    write_queue = queue.Queue(maxsize=write_queue_size)
+    writer = threading.Thread(
+        target=_write_batches,
+        args=(vector_store, write_queue, totals),
+        name="chromadb-writer"
+    )
+    writer.start()
+    
+    try:
+        async for batch_ids, embeddings, batch_documents, batch_metadatas in stream_record_batches(
+            ids, documents, metadatas, embedding_client, batch_size, known_embeddings, shared_hashes
+        ):
+            count = min(len(embeddings), len(batch_ids))
+            if count < len(batch_ids):
+                totals["failed"].update(batch_ids[count:])
+                print(f"⚠️ Only {count}/{len(batch_ids)} embeddings generated")
+            if not count:
+                continue
+            
+            # put() blocks while the writer is behind, so run it off the event loop
+            await run_blocking(
+                write_queue.put,
+                (batch_ids[:count], embeddings[:count], batch_documents[:count], batch_metadatas[:count])
+            )
+    finally:
+        await run_blocking(write_queue.put, None)
+        await run_blocking(writer.join)
+    
+    total_added = totals["added"]
+    
+    # Only PDFs whose chunks were all written count as ingested
+    for pdf_path, chunk_ids in pdf_ids.items():
+        if totals["failed"].isdisjoint(chunk_ids):
+            manifest.record(pdf_path, file_hashes[pdf_path], chunk_ids)
+    manifest.save()
     
     # Final summary
     print(f"\n🎉 PDF Processing Complete!")
     print("=" * 60)
-    print(f"✅ Processed: {len(pdf_files)} PDF files")
+    print(f"✅ Processed: {len(pdf_files)} PDF files ({skipped} unchanged skipped)")
     print(f"✅ Added to ChromaDB: {total_added} records")
     print(f"📊 Total in collection: {vector_store.collection.count()}")
     
@@ -188,5 +343,10 @@ def main():
         print(f"⚠️ Could not retrieve service distribution: {e}")
 
 
+def main():
+    """Run the async processing pipeline."""
+    asyncio.run(main_async())
+
+
 if __name__ == "__main__":
     main()
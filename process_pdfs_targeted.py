@@ -3,235 +3,412 @@
 Targeted PDF Processing Script for NYC Services GPT RAG System
 
 This script processes PDFs strategically, handling smaller ones first and
-the large welcome_english.pdf separately to avoid memory issues.
+the large welcome_english.pdf separately to avoid memory issues. Small PDFs
+are extracted in parallel worker processes while the main process embeds
+and writes the ones already extracted.
 """
 
-import sys
 import gc
+import logging
 import psutil
+import numpy as np
 import os
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from pathlib import Path
+from typing import Optional, Set
 
-# Add src to path for imports
-sys.path.append(str(Path(__file__).parent / "src"))
-
-from src.ingest.pdf_processor import PDFProcessor
+from src.ingest.pdf_processor import PDFProcessor, iter_extracted_documents, chunk_hash
 from src.ingest.data_processor import process_documents
 from src.ingest.chunker import chunk_large_text_streaming, chunk_large_text_batched
-from src.retrieve.vector_store import init_vector_store, add_documents
+from src.retrieve.vector_store import init_vector_store, add_arrays
+from src.ingest.logging_utils import start_queue_logging
+
+logger = logging.getLogger(__name__)
+
+
+# Memory logging is observability only; enable it with DEBUG_MEM=1
+_MEM_DEBUG = os.environ.get("DEBUG_MEM") == "1"
+
+# Built once; constructing a Process costs several syscalls on some platforms
+_PROCESS = psutil.Process(os.getpid())
 
 
 def get_memory_usage():
     """Get current memory usage information."""
-    process = psutil.Process(os.getpid())
-    memory_info = process.memory_info()
+    memory_info = _PROCESS.memory_info()
     return {
         'rss': memory_info.rss / 1024 / 1024,  # MB
         'vms': memory_info.vms / 1024 / 1024,  # MB
-        'percent': process.memory_percent()
+        'percent': _PROCESS.memory_percent()
     }
 
 
+def get_rss_mb() -> float:
+    """Resident set size in MB (one memory_info call, no system-wide stats)."""
+    return _PROCESS.memory_info().rss / 1024 / 1024
+
+
 def log_memory_usage(stage: str):
-    """Log memory usage at different stages."""
-    memory = get_memory_usage()
-    print(f"💾 Memory usage at {stage}: {memory['rss']:.1f}MB RSS, {memory['vms']:.1f}MB VMS")
+    """Log memory usage at different stages (only when DEBUG_MEM=1)."""
+    if _MEM_DEBUG:
+        memory = get_memory_usage()
+        logger.info(f"💾 Memory usage at {stage}: {memory['rss']:.1f}MB RSS, {memory['vms']:.1f}MB VMS")
+
+
+# Threads dispatching embedding requests; the GIL is released during HTTP waits
+EMBED_WORKERS = min(8, os.cpu_count() or 1)
+
+# Worker processes splitting the pages of a single large PDF
+LARGE_PDF_WORKERS = min(os.cpu_count() or 1, 4)
+
+# Records per ChromaDB add call; larger upserts mean fewer SQLite transactions
+CHROMA_WRITE_BATCH = int(os.getenv("CHROMA_WRITE_BATCH", "500"))
+
+# Full collections only run once RSS has grown this much since the last one
+GC_RSS_GROWTH_MB = 100
+
+_rss_at_last_collect = None
 
 
-def cleanup_memory():
-    """Force memory cleanup."""
-    gc.collect()
-    memory = get_memory_usage()
-    print(f"🧹 Memory cleanup completed: {memory['rss']:.1f}MB RSS")
+def cleanup_memory(force: bool = False):
+    """
+    Run a full (generation 2) collection if RSS grew past GC_RSS_GROWTH_MB.
+    
+    Most chunk and record objects are freed by reference counting as soon as
+    a batch is dropped; a full collection walks every tracked object, so it
+    is only worth paying once memory actually grows.
+    
+    Args:
+        force: Collect regardless of RSS growth
+    """
+    global _rss_at_last_collect
+    
+    rss = get_rss_mb()
+    if _rss_at_last_collect is None:
+        _rss_at_last_collect = rss
+    
+    if force or rss - _rss_at_last_collect > GC_RSS_GROWTH_MB:
+        gc.collect(2)
+        _rss_at_last_collect = get_rss_mb()
+        logger.info(f"🧹 Memory cleanup completed: {_rss_at_last_collect:.1f}MB RSS")
 
 
-def process_small_pdf(pdf_path: Path, processor: PDFProcessor, chunk_size: int = 300, overlap: int = 50):
+@dataclass
+class ChunkRecord:
     """
-    Process a smaller PDF file completely using streaming chunking.
+    One embedded chunk waiting to be written to ChromaDB.
+    
+    Uses __slots__ instead of a per-record metadata dict; document-level
+    metadata is a single dict shared by every chunk of the same PDF and is
+    only expanded into per-record dicts at write time.
     """
-    print(f"📄 Processing: {pdf_path.name}")
-    log_memory_usage(f"start of {pdf_path.name}")
+    __slots__ = ("text", "embedding", "record_id", "chunk_index", "token_count", "chunk_hash", "doc_metadata")
     
-    try:
-        # Extract text
-        text = processor.extract_text_from_pdf(pdf_path)
-        if not text:
-            print(f"⚠️ No text extracted from {pdf_path.name}")
-            return None
-        
-        # Classify service type
-        service_type = processor.classify_service_type(text, pdf_path.name)
-        
-        # Extract metadata
-        doc_title = processor.extract_document_title(text, pdf_path.name)
-        doc_date = processor.extract_date(text, pdf_path.name)
-        
-        print(f"✅ Extracted text: {len(text)} characters")
-        print(f"✅ Classified as: {service_type}")
-        print(f"✅ Title: {doc_title}")
-        
-        # Use streaming chunking for all documents to avoid memory issues
-        print(f"🔪 Chunking document with streaming approach...")
+    text: str
+    embedding: np.ndarray
+    record_id: str
+    chunk_index: int
+    token_count: int
+    chunk_hash: str
+    doc_metadata: dict
+    
+    def metadata(self) -> dict:
+        """ChromaDB metadata for this chunk."""
+        return {
+            **self.doc_metadata,
+            "record_id": self.record_id,
+            "chunk_index": self.chunk_index,
+            "token_count": self.token_count,
+            "chunk_hash": self.chunk_hash
+        }
+
+
+def _build_records(embedded_records: list, pdf_path: Path, doc_metadata: dict, first_index: int) -> list:
+    """
+    Attach document metadata to embedded chunks.
+    
+    Embeddings are kept as float16 while records wait to be written, halving
+    the memory held by each in-flight micro-batch.
+    
+    Returns:
+        ChunkRecords, numbered consecutively from first_index
+    """
+    file_stem = pdf_path.stem
+    return [
+        ChunkRecord(
+            text=embedded_record["text"],
+            embedding=np.asarray(embedded_record["embedding"], dtype=np.float16),
+            record_id=f"{file_stem}_chunk_{record_index}",
+            chunk_index=record_index,
+            token_count=embedded_record["metadata"]["token_count"],
+            chunk_hash=chunk_hash(embedded_record["text"]),
+            doc_metadata=doc_metadata
+        )
+        for record_index, embedded_record in enumerate(embedded_records or [], first_index)
+    ]
+
+
+def _embed_streamed_chunks(
+    text: str,
+    pdf_path: Path,
+    doc_metadata: dict,
+    chunk_size: int,
+    overlap: int,
+    batch_size: int = 32,
+    progress_every: int = 10,
+    max_in_flight: int = 8,
+    seen_hashes: Optional[Set[str]] = None
+):
+    """
+    Stream chunks out of text and embed them in fixed-size batches.
+    
+    Chunks are buffered until batch_size are pending, then embedded with a
+    single process_documents call, amortizing the per-request overhead of
+    the embedding API across the whole batch. Batches are embedded on a
+    thread pool while chunking continues; at most max_in_flight batches are
+    outstanding, and results are yielded in submission order so record
+    numbering stays deterministic.
+    
+    Chunks whose content hash is already in seen_hashes (boilerplate such as
+    agency headers and disclaimers repeated across PDFs) are skipped; the
+    set is shared across the whole run and updated in place. Hashes from a
+    batch whose embedding call fails are removed again, so a later copy of
+    those chunks is still embedded.
+    
+    Yields:
+        Micro-batches of final records, one per embedding call
+    """
+    if seen_hashes is None:
+        seen_hashes = set()
+    skipped = 0
+
+    pending_texts = []
+    pending_hashes = []
+    in_flight = deque()
+    chunk_count = 0
+    record_count = 0
+    
+    def collect():
+        nonlocal record_count
+        first_chunk, last_chunk, hashes, future = in_flight.popleft()
+        try:
+            embedded_records = future.result()
+        except Exception as e:
+            logger.warning(f"⚠️ Error processing chunks {first_chunk}-{last_chunk}: {e}")
+            seen_hashes.difference_update(hashes)
+            return []
         
-        all_final_records = []
-        chunk_count = 0
+        micro_batch = _build_records(embedded_records, pdf_path, doc_metadata, record_count + 1)
+        record_count += len(micro_batch)
+        return micro_batch
+    
+    with ThreadPoolExecutor(max_workers=EMBED_WORKERS, thread_name_prefix="embed") as executor:
+        def submit():
+            future = executor.submit(
+                process_documents, pending_texts, chunk_size=chunk_size, overlap=overlap, pre_chunked=True
+            )
+            in_flight.append((chunk_count - len(pending_texts) + 1, chunk_count, pending_hashes, future))
         
-        # Use the streaming chunker for memory efficiency
         for chunk in chunk_large_text_streaming(text, chunk_size=chunk_size, overlap=overlap):
             chunk_count += 1
             
-            if chunk_count % 10 == 0:
-                print(f"🔪 Processed {chunk_count} chunks...")
+            h = chunk_hash(chunk)
+            if h in seen_hashes:
+                skipped += 1
+                continue
+            seen_hashes.add(h)
+            pending_hashes.append(h)
+            pending_texts.append(chunk)
+            
+            if chunk_count % progress_every == 0:
+                logger.info("🔪 Processed %d chunks...", chunk_count)
                 log_memory_usage(f"chunk {chunk_count}")
             
-            # Process this single chunk
-            try:
-                embedded_record = process_documents(
-                    [chunk],
-                    chunk_size=chunk_size,
-                    overlap=overlap
-                )
-                
-                if embedded_record and len(embedded_record) > 0:
-                    # Create final record for this chunk
-                    final_record = {
-                        "text": embedded_record[0]["text"],
-                        "embedding": embedded_record[0]["embedding"],
-                        "metadata": {
-                            **embedded_record[0]["metadata"],
-                            "source": str(pdf_path),
-                            "service_type": service_type,
-                            "doc_title": doc_title,
-                            "date": doc_date,
-                            "filename": pdf_path.name,
-                            "file_size": pdf_path.stat().st_size,
-                            "record_id": f"{pdf_path.stem}_chunk_{chunk_count}",
-                            "source_type": "pdf_document",
-                            "chunk_index": chunk_count,
-                            "total_chunks": "unknown"  # We don't know total until done
-                        }
-                    }
-                    all_final_records.append(final_record)
+            if len(pending_texts) >= batch_size:
+                submit()
+                pending_texts = []
+                pending_hashes = []
                 
-                # Clear chunk memory immediately
-                del chunk
-                if 'embedded_record' in locals():
-                    del embedded_record
-                
-            except Exception as e:
-                print(f"⚠️ Error processing chunk {chunk_count}: {e}")
-                continue
-            
-            # Force garbage collection every 20 chunks
-            if chunk_count % 20 == 0:
-                gc.collect()
+                # Backpressure: wait for the oldest batch once the window is full
+                if len(in_flight) >= max_in_flight:
+                    micro_batch = collect()
+                    if micro_batch:
+                        yield micro_batch
         
-        print(f"✅ Created {len(all_final_records)} final records")
-        log_memory_usage(f"end of {pdf_path.name}")
-        return all_final_records
+        # Submit the final partial batch
+        if pending_texts:
+            submit()
         
-    except Exception as e:
-        print(f"❌ Error processing {pdf_path.name}: {e}")
-        return None
+        while in_flight:
+            micro_batch = collect()
+            if micro_batch:
+                yield micro_batch
+    
+    if skipped:
+        logger.info(f"♻️ Skipped {skipped} chunks already embedded from earlier content")
 
 
-def process_large_pdf(pdf_path: Path, processor: PDFProcessor, chunk_size: int = 200, overlap: int = 25):
-    """
-    Process the large welcome_english.pdf with memory-efficient streaming chunking.
+def write_record_stream(vector_store, record_batches, pdf_path: Path, write_batch_size: int = CHROMA_WRITE_BATCH) -> int:
     """
-    print(f"📄 Processing LARGE PDF: {pdf_path.name}")
-    log_memory_usage(f"start of large PDF {pdf_path.name}")
+    Write records to ChromaDB as they are produced, in large upserts.
     
-    try:
-        # Extract text
-        text = processor.extract_text_from_pdf(pdf_path)
-        if not text:
-            print(f"⚠️ No text extracted from {pdf_path.name}")
-            return None
-        
-        # Classify service type
-        service_type = processor.classify_service_type(text, pdf_path.name)
+    Embedding micro-batches are accumulated into columnar arrays and flushed
+    once write_batch_size records are pending, so ChromaDB commits a few
+    large SQLite transactions instead of one per embedding call. At most one
+    write batch of embeddings is held in memory, no matter how large the
+    PDF is.
+    
+    Args:
+        vector_store: Initialized VectorStore instance
+        record_batches: Iterable of ChunkRecord lists
+        pdf_path: PDF the records come from (for reporting)
+        write_batch_size: Records per ChromaDB add call
         
-        # Extract metadata
-        doc_title = processor.extract_document_title(text, pdf_path.name)
-        doc_date = processor.extract_date(text, pdf_path.name)
+    Returns:
+        Number of records added
+    """
+    added = 0
+    batch_num = 0
+    ids, embeddings, documents, metadatas = [], [], [], []
+    
+    def flush():
+        nonlocal added, batch_num
+        batch_num += 1
+        logger.info("📚 Adding batch %d (%d records)...", batch_num, len(ids))
         
-        print(f"✅ Extracted text: {len(text)} characters")
-        print(f"✅ Classified as: {service_type}")
-        print(f"✅ Title: {doc_title}")
+        # ChromaDB stores float32; widen the half-precision vectors on insert
+        success = add_arrays(vector_store, ids, np.asarray(embeddings, dtype=np.float32), documents, metadatas)
+        if success:
+            added += len(ids)
+        else:
+            logger.error(f"❌ Failed to add batch {batch_num} from {pdf_path.name}")
         
-        # Use streaming chunking for large documents
-        print(f"🔪 Chunking large document with streaming approach...")
+        # Release the flushed batch before more records are embedded
+        for column in (ids, embeddings, documents, metadatas):
+            column.clear()
+        cleanup_memory()
+    
+    for micro_batch in record_batches:
+        # Build the columnar arrays ChromaDB takes in a single pass
+        for record in micro_batch:
+            ids.append(record.record_id)
+            embeddings.append(record.embedding)
+            documents.append(record.text)
+            metadatas.append(record.metadata())
         
-        # Process chunks in streaming fashion to avoid memory issues
-        all_final_records = []
-        chunk_count = 0
+        if len(ids) >= write_batch_size:
+            flush()
+    
+    if ids:
+        flush()
+    
+    return added
+
+
+def process_extracted_pdf(
+    doc_record: dict,
+    chunk_size: int = 300,
+    overlap: int = 50,
+    batch_size: int = 32,
+    progress_every: int = 10,
+    seen_hashes: Optional[Set[str]] = None
+):
+    """
+    Chunk and embed a PDF whose text and metadata were already extracted.
+    
+    Args:
+        doc_record: Document record from PDFProcessor.extract_document
+        chunk_size: Maximum tokens per chunk
+        overlap: Overlapping tokens between chunks
+        batch_size: Chunks embedded per process_documents call
+        progress_every: Chunks between progress reports
+        seen_hashes: Content hashes of chunks already embedded in this run
         
-        # Use the new streaming chunker
-        for chunk in chunk_large_text_streaming(text, chunk_size=chunk_size, overlap=overlap):
-            chunk_count += 1
-            
-            if chunk_count % 50 == 0:
-                print(f"🔪 Processed {chunk_count} chunks...")
-                log_memory_usage(f"chunk {chunk_count}")
-            
-            # Process this single chunk
-            try:
-                embedded_record = process_documents(
-                    [chunk],
-                    chunk_size=chunk_size,
-                    overlap=overlap
-                )
-                
-                if embedded_record and len(embedded_record) > 0:
-                    # Create final record for this chunk
-                    final_record = {
-                        "text": embedded_record[0]["text"],
-                        "embedding": embedded_record[0]["embedding"],
-                        "metadata": {
-                            **embedded_record[0]["metadata"],
-                            "source": str(pdf_path),
-                            "service_type": service_type,
-                            "doc_title": doc_title,
-                            "date": doc_date,
-                            "filename": pdf_path.name,
-                            "file_size": pdf_path.stat().st_size,
-                            "record_id": f"{pdf_path.stem}_chunk_{chunk_count}",
-                            "source_type": "pdf_document",
-                            "chunk_index": chunk_count,
-                            "total_chunks": "unknown"  # We don't know total until done
-                        }
-                    }
-                    all_final_records.append(final_record)
-                
-                # Clear chunk memory immediately
-                del chunk
-                if 'embedded_record' in locals():
-                    del embedded_record
-                
-            except Exception as e:
-                print(f"⚠️ Error processing chunk {chunk_count}: {e}")
-                continue
-            
-            # Force garbage collection every 100 chunks
-            if chunk_count % 100 == 0:
-                gc.collect()
+    Yields:
+        Micro-batches of ChunkRecords for the PDF
+    """
+    text = doc_record["text"]
+    metadata = doc_record["metadata"]
+    pdf_path = Path(metadata["source"])
+    
+    logger.info(f"✅ Extracted text: {len(text)} characters")
+    logger.info(f"✅ Classified as: {metadata['service_type']}")
+    logger.info(f"✅ Title: {metadata['doc_title']}")
+    
+    # Use streaming chunking for all documents to avoid memory issues
+    logger.info("🔪 Chunking document with streaming approach...")
+    
+    # The chunker is deterministic, so a counting pass gives the total up
+    # front without holding every chunk in memory
+    total_chunks = sum(1 for _ in chunk_large_text_streaming(text, chunk_size=chunk_size, overlap=overlap))
+    logger.info(f"🔪 Document splits into {total_chunks} chunks")
+    
+    # Shared by every chunk of this PDF
+    doc_metadata = {
+        **metadata,
+        "source_type": "pdf_document",
+        "chunk_size": chunk_size,
+        "overlap": overlap,
+        "total_chunks": total_chunks
+    }
+    
+    yield from _embed_streamed_chunks(
+        text,
+        pdf_path,
+        doc_metadata,
+        chunk_size,
+        overlap,
+        batch_size=batch_size,
+        progress_every=progress_every,
+        seen_hashes=seen_hashes
+    )
+
+
+def process_large_pdf(
+    pdf_path: Path,
+    processor: PDFProcessor,
+    chunk_size: int = 200,
+    overlap: int = 25,
+    batch_size: int = 32,
+    seen_hashes: Optional[Set[str]] = None
+):
+    """
+    Process the large welcome_english.pdf with memory-efficient streaming chunking.
+    
+    Yields:
+        Micro-batches of final records
+    """
+    logger.info(f"📄 Processing LARGE PDF: {pdf_path.name}")
+    log_memory_usage(f"start of large PDF {pdf_path.name}")
+    
+    try:
+        # Large PDFs are extracted alone, so their pages are split across processes
+        doc_record = processor.extract_document(pdf_path, num_workers=LARGE_PDF_WORKERS)
+        if not doc_record:
+            logger.warning(f"⚠️ No text extracted from {pdf_path.name}")
+            return
         
-        print(f"✅ Created {len(all_final_records)} total records from large PDF")
+        yield from process_extracted_pdf(
+            doc_record, chunk_size, overlap, batch_size, progress_every=50, seen_hashes=seen_hashes
+        )
         log_memory_usage(f"end of large PDF {pdf_path.name}")
-        return all_final_records
         
     except Exception as e:
-        print(f"❌ Error processing large PDF {pdf_path.name}: {e}")
-        return None
+        logger.error(f"❌ Error processing large PDF {pdf_path.name}: {e}")
 
 
 def main():
     """
     Process PDFs strategically to avoid memory issues.
     """
-    print("🚀 NYC Services GPT - Targeted PDF Processing Pipeline")
-    print("=" * 60)
+    logger.info("🚀 NYC Services GPT - Targeted PDF Processing Pipeline")
+    logger.info("=" * 60)
+    
+    # Chunking allocates many short-lived containers; raise the generation-0
+    # threshold so the cyclic GC doesn't keep rescanning them mid-loop
+    gc.set_threshold(50000, 10, 10)
     
     # Log initial memory usage
     log_memory_usage("start of script")
@@ -240,15 +417,15 @@ def main():
     processor = PDFProcessor("data/Docs")
     
     if not processor.docs_folder.exists():
-        print(f"❌ Docs folder not found: {processor.docs_folder}")
+        logger.error(f"❌ Docs folder not found: {processor.docs_folder}")
         return
     
     pdf_files = list(processor.docs_folder.glob("*.pdf"))
     if not pdf_files:
-        print(f"❌ No PDF files found in {processor.docs_folder}")
+        logger.error(f"❌ No PDF files found in {processor.docs_folder}")
         return
     
-    print(f"🔍 Found {len(pdf_files)} PDF files")
+    logger.info(f"🔍 Found {len(pdf_files)} PDF files")
     
     # Separate large and small PDFs
     large_pdfs = []
@@ -261,111 +438,90 @@ def main():
         else:
             small_pdfs.append(pdf_path)
     
-    print(f"📊 PDF Classification:")
-    print(f"  Small PDFs: {len(small_pdfs)} files")
+    logger.info("📊 PDF Classification:")
+    logger.info(f"  Small PDFs: {len(small_pdfs)} files")
     for pdf in small_pdfs:
         size_mb = pdf.stat().st_size / 1024 / 1024
-        print(f"    - {pdf.name}: {size_mb:.2f}MB")
+        logger.info(f"    - {pdf.name}: {size_mb:.2f}MB")
     
-    print(f"  Large PDFs: {len(large_pdfs)} files")
+    logger.info(f"  Large PDFs: {len(large_pdfs)} files")
     for pdf in large_pdfs:
         size_mb = pdf.stat().st_size / 1024 / 1024
-        print(f"    - {pdf.name}: {size_mb:.2f}MB")
+        logger.info(f"    - {pdf.name}: {size_mb:.2f}MB")
     
     # Initialize vector store
-    print(f"\n🗄️ Initializing ChromaDB...")
+    logger.info("\n🗄️ Initializing ChromaDB...")
     vector_store = init_vector_store()
     if not vector_store:
-        print("❌ Failed to initialize vector store")
+        logger.error("❌ Failed to initialize vector store")
         return
     
     # Process small PDFs first
     total_added = 0
     
+    # Content hashes of every chunk embedded so far, shared across all PDFs
+    seen_hashes = set()
+    
     if small_pdfs:
-        print(f"\n📚 Processing Small PDFs First")
-        print("=" * 40)
+        logger.info("\n📚 Processing Small PDFs First")
+        logger.info("=" * 40)
         
-        for i, pdf_path in enumerate(small_pdfs, 1):
-            print(f"\n📚 Small PDF {i}/{len(small_pdfs)}")
-            print("-" * 30)
-            
-            final_records = process_small_pdf(pdf_path, processor, chunk_size=300, overlap=50)
+        # Extraction runs in worker processes; chunking, embedding and
+        # ChromaDB writes stay in this process as each PDF completes
+        for i, (pdf_path, doc_record) in enumerate(iter_extracted_documents(small_pdfs), 1):
+            logger.info(f"\n📚 Small PDF {i}/{len(small_pdfs)}")
+            logger.info("-" * 30)
+            logger.info(f"📄 Processing: {pdf_path.name}")
             
-            if final_records:
-                # Add to ChromaDB
-                print(f"📚 Adding {len(final_records)} records to ChromaDB...")
-                
-                success = add_documents(vector_store, final_records)
-                if success:
-                    total_added += len(final_records)
-                    print(f"✅ Successfully added {len(final_records)} records from {pdf_path.name}")
-                else:
-                    print(f"❌ Failed to add records from {pdf_path.name}")
+            if isinstance(doc_record, Exception):
+                logger.warning(f"⚠️ Skipping {pdf_path.name} - processing failed: {doc_record}")
+            elif not doc_record:
+                logger.warning(f"⚠️ Skipping {pdf_path.name} - no text extracted")
             else:
-                print(f"⚠️ Skipping {pdf_path.name} - processing failed")
+                try:
+                    added = write_record_stream(
+                        vector_store,
+                        process_extracted_pdf(doc_record, chunk_size=300, overlap=50, seen_hashes=seen_hashes),
+                        pdf_path
+                    )
+                    total_added += added
+                    logger.info(f"✅ Successfully added {added} records from {pdf_path.name}")
+                except Exception as e:
+                    logger.error(f"❌ Error processing {pdf_path.name}: {e}")
             
             # Clear memory
-            if 'final_records' in locals():
-                del final_records
+            del doc_record
             cleanup_memory()
             log_memory_usage(f"after processing {pdf_path.name}")
     
     # Process large PDFs
     if large_pdfs:
-        print(f"\n📚 Processing Large PDFs")
-        print("=" * 40)
+        logger.info("\n📚 Processing Large PDFs")
+        logger.info("=" * 40)
         
         for i, pdf_path in enumerate(large_pdfs, 1):
-            print(f"\n📚 Large PDF {i}/{len(large_pdfs)}")
-            print("-" * 30)
+            logger.info(f"\n📚 Large PDF {i}/{len(large_pdfs)}")
+            logger.info("-" * 30)
             
-            final_records = process_large_pdf(pdf_path, processor, chunk_size=200, overlap=25)
-            
-            if final_records:
-                # Add to ChromaDB in smaller batches
-                print(f"📚 Adding {len(final_records)} records to ChromaDB...")
-                
-                chroma_batch_size = 15
-                batch_added = 0
-                
-                for batch_start in range(0, len(final_records), chroma_batch_size):
-                    batch_end = min(batch_start + chroma_batch_size, len(final_records))
-                    batch = final_records[batch_start:batch_end]
-                    batch_num = (batch_start // chroma_batch_size) + 1
-                    total_batches = (len(final_records) + chroma_batch_size - 1) // chroma_batch_size
-                    
-                    print(f"📚 Adding batch {batch_num}/{total_batches} ({len(batch)} records)...")
-                    
-                    success = add_documents(vector_store, batch)
-                    if success:
-                        batch_added += len(batch)
-                        print(f"✅ Batch {batch_num} added successfully")
-                    else:
-                        print(f"❌ Failed to add batch {batch_num}")
-                        break
-                    
-                    # Clear batch memory
-                    del batch
-                    cleanup_memory()
-                
-                total_added += batch_added
-                print(f"✅ Successfully added {batch_added} records from {pdf_path.name}")
-            else:
-                print(f"⚠️ Skipping {pdf_path.name} - processing failed")
+            # Records are written in micro-batches as they are embedded
+            added = write_record_stream(
+                vector_store,
+                process_large_pdf(pdf_path, processor, chunk_size=200, overlap=25, seen_hashes=seen_hashes),
+                pdf_path
+            )
+            total_added += added
+            logger.info(f"✅ Successfully added {added} records from {pdf_path.name}")
             
             # Clear memory
-            if 'final_records' in locals():
-                del final_records
             cleanup_memory()
             log_memory_usage(f"after processing large PDF {pdf_path.name}")
     
     # Final summary
-    print(f"\n🎉 PDF Processing Complete!")
-    print("=" * 60)
-    print(f"✅ Processed: {len(pdf_files)} PDF files")
-    print(f"✅ Added to ChromaDB: {total_added} records")
-    print(f"📊 Total in collection: {vector_store.collection.count()}")
+    logger.info("\n🎉 PDF Processing Complete!")
+    logger.info("=" * 60)
+    logger.info(f"✅ Processed: {len(pdf_files)} PDF files")
+    logger.info(f"✅ Added to ChromaDB: {total_added} records")
+    logger.info(f"📊 Total in collection: {vector_store.collection.count()}")
     
     # Show service distribution
     try:
@@ -377,15 +533,20 @@ def main():
                     service = metadata['service_type']
                     service_counts[service] = service_counts.get(service, 0) + 1
             
-            print(f"\n📊 Service Distribution:")
+            logger.info("\n📊 Service Distribution:")
             for service, count in service_counts.items():
-                print(f"  {service}: {count} records")
+                logger.info(f"  {service}: {count} records")
     except Exception as e:
-        print(f"⚠️ Could not retrieve service distribution: {e}")
+        logger.warning(f"⚠️ Could not retrieve service distribution: {e}")
     
     # Final memory usage
     log_memory_usage("end of script")
 
 
 if __name__ == "__main__":
-    main()
+    # Log lines are written by a background thread; INGEST_LOG_LEVEL controls verbosity
+    listener = start_queue_logging()
+    try:
+        main()
+    finally:
+        listener.stop()
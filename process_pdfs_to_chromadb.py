@@ -10,36 +10,65 @@ Usage:
 """
 
 import os
-import sys
 import gc
-from pathlib import Path
-
-# Add src to path for imports
-sys.path.append(str(Path(__file__).parent / "src"))
+import logging
 
 from src.ingest.pdf_processor import process_pdfs_to_chunks
 from src.ingest.data_processor import process_documents
 from src.retrieve.vector_store import init_vector_store, add_documents
 from src.config import config
+from src.ingest.logging_utils import start_queue_logging
+
+logger = logging.getLogger(__name__)
+
 
+def _record_tokens(record) -> int:
+    """Token count of a chunk record, from its metadata when available."""
+    return record["metadata"].get("token_count") or len(record["text"].split())
 
-def process_in_batches(chunked_records, batch_size=50):
+
+def process_in_batches(chunked_records, token_budget=8000, max_items=64, window=256):
     """
-    Process documents in smaller batches to manage memory.
+    Group records into embedding batches bounded by total tokens.
+    
+    A batch is flushed once adding the next record would exceed token_budget
+    or it holds max_items records, so long-chunk batches don't balloon while
+    short-chunk batches are filled up. Within each window of records, chunks
+    are sorted by length so similar-sized chunks are embedded together.
+    
+    Yields:
+        Lists of (index, record) pairs, where index is the record's position
+        in chunked_records
     """
-    total_batches = (len(chunked_records) + batch_size - 1) // batch_size
+    batch_num = 0
     
-    for i in range(0, len(chunked_records), batch_size):
-        batch = chunked_records[i:i + batch_size]
-        batch_num = (i // batch_size) + 1
+    for window_start in range(0, len(chunked_records), window):
+        indexed = sorted(
+            enumerate(chunked_records[window_start:window_start + window], window_start),
+            key=lambda item: _record_tokens(item[1])
+        )
         
-        print(f"🔄 Processing batch {batch_num}/{total_batches} ({len(batch)} records)")
+        batch = []
+        batch_tokens = 0
+        for index, record in indexed:
+            tokens = _record_tokens(record)
+            if batch and (batch_tokens + tokens > token_budget or len(batch) >= max_items):
+                batch_num += 1
+                logger.info("🔄 Processing batch %d (%d records, %d tokens)", batch_num, len(batch), batch_tokens)
+                yield batch
+                batch = []
+                batch_tokens = 0
+            
+            batch.append((index, record))
+            batch_tokens += tokens
         
-        # Process this batch
-        yield batch
+        if batch:
+            batch_num += 1
+            logger.info("🔄 Processing batch %d (%d records, %d tokens)", batch_num, len(batch), batch_tokens)
+            yield batch
         
         # Clear memory
-        del batch
+        del indexed, batch
         gc.collect()
 
 
@@ -47,12 +76,12 @@ def main():
     """
     Main pipeline: Process PDFs → Chunk → Embed → Store in ChromaDB
     """
-    print("🚀 NYC Services GPT - PDF Processing Pipeline")
-    print("=" * 60)
+    logger.info("🚀 NYC Services GPT - PDF Processing Pipeline")
+    logger.info("=" * 60)
     
     # Step 1: Process PDFs and chunk them
-    print("\n📄 Step 1: Processing PDF Documents")
-    print("-" * 40)
+    logger.info("\n📄 Step 1: Processing PDF Documents")
+    logger.info("-" * 40)
     
     try:
         # Use smaller chunks and overlap for memory efficiency
@@ -63,10 +92,10 @@ def main():
         )
         
         if not chunked_records:
-            print("❌ No PDF documents processed. Check your /data/docs folder.")
+            logger.error("❌ No PDF documents processed. Check your /data/docs folder.")
             return
         
-        print(f"✅ Successfully processed {len(chunked_records)} chunks")
+        logger.info(f"✅ Successfully processed {len(chunked_records)} chunks")
         
         # Show service distribution
         service_counts = {}
@@ -74,73 +103,75 @@ def main():
             service = record["metadata"]["service_type"]
             service_counts[service] = service_counts.get(service, 0) + 1
         
-        print(f"\n📊 Service Distribution:")
+        logger.info("\n📊 Service Distribution:")
         for service, count in service_counts.items():
-            print(f"  {service}: {count} chunks")
+            logger.info(f"  {service}: {count} chunks")
         
     except Exception as e:
-        print(f"❌ Error processing PDFs: {e}")
-        print("Make sure you have PyMuPDF and PyPDF2 installed:")
-        print("pip install PyMuPDF PyPDF2")
+        logger.error(f"❌ Error processing PDFs: {e}")
+        logger.info("Make sure you have PyMuPDF and PyPDF2 installed:")
+        logger.info("pip install PyMuPDF PyPDF2")
         return
     
     # Step 2: Generate embeddings for chunks in batches
-    print(f"\n🧮 Step 2: Generating Embeddings (Batch Processing)")
-    print("-" * 40)
+    logger.info("\n🧮 Step 2: Generating Embeddings (Batch Processing)")
+    logger.info("-" * 40)
     
     try:
+        # (index, chunked record, embedded record) triples; batches are
+        # length-sorted, so the original index is kept for merging
         all_embedded_records = []
-        batch_size = 30  # Process 30 chunks at a time
         
-        for batch_num, batch in enumerate(process_in_batches(chunked_records, batch_size)):
-            print(f"🔧 Processing batch {batch_num + 1}...")
-            
+        for batch_num, batch in enumerate(process_in_batches(chunked_records), 1):
             # Extract text from this batch
-            batch_texts = [record["text"] for record in batch]
+            batch_texts = [record["text"] for _, record in batch]
             
             # Generate embeddings for this batch
+            # Texts are already final chunks, so skip re-chunking
             embedded_batch = process_documents(
                 batch_texts,
                 chunk_size=300,  # Match our chunking
-                overlap=50
+                overlap=50,
+                pre_chunked=True
             )
             
             if embedded_batch:
-                all_embedded_records.extend(embedded_batch)
-                print(f"✅ Batch {batch_num + 1} completed: {len(embedded_batch)} embeddings")
+                if len(embedded_batch) != len(batch):
+                    logger.warning(f"⚠️ Mismatch in batch {batch_num}: {len(embedded_batch)} embeddings vs {len(batch)} chunks")
+                for (index, chunked_record), embedded_record in zip(batch, embedded_batch):
+                    all_embedded_records.append((index, chunked_record, embedded_record))
+                logger.info(f"✅ Batch {batch_num} completed: {len(embedded_batch)} embeddings")
             else:
-                print(f"⚠️ Batch {batch_num + 1} failed to generate embeddings")
+                logger.warning(f"⚠️ Batch {batch_num} failed to generate embeddings")
             
             # Clear batch memory
             del batch_texts, embedded_batch
             gc.collect()
         
         if not all_embedded_records:
-            print("❌ No embeddings generated")
+            logger.error("❌ No embeddings generated")
             return
         
-        print(f"✅ Generated {len(all_embedded_records)} total embeddings")
+        logger.info(f"✅ Generated {len(all_embedded_records)} total embeddings")
         
     except Exception as e:
-        print(f"❌ Error generating embeddings: {e}")
+        logger.error(f"❌ Error generating embeddings: {e}")
         return
     
     # Step 3: Merge metadata from chunked records with embeddings
-    print(f"\n🔗 Step 3: Merging Metadata")
-    print("-" * 40)
+    logger.info("\n🔗 Step 3: Merging Metadata")
+    logger.info("-" * 40)
     
     try:
-        # Ensure we have the same number of records
         if len(all_embedded_records) != len(chunked_records):
-            print(f"⚠️ Mismatch: {len(all_embedded_records)} embeddings vs {len(chunked_records)} chunks")
-            # Use the smaller number to avoid index errors
-            min_count = min(len(all_embedded_records), len(chunked_records))
-            all_embedded_records = all_embedded_records[:min_count]
-            chunked_records = chunked_records[:min_count]
+            logger.warning(f"⚠️ Mismatch: {len(all_embedded_records)} embeddings vs {len(chunked_records)} chunks")
+        
+        # Restore document order before merging
+        all_embedded_records.sort(key=lambda item: item[0])
         
         # Merge metadata from chunked records into embedded records
         final_records = []
-        for i, (embedded_record, chunked_record) in enumerate(zip(all_embedded_records, chunked_records)):
+        for i, chunked_record, embedded_record in all_embedded_records:
             # Create final record with embedding + rich metadata
             final_record = {
                 "text": embedded_record["text"],
@@ -154,40 +185,40 @@ def main():
             }
             final_records.append(final_record)
         
-        print(f"✅ Merged metadata for {len(final_records)} records")
+        logger.info(f"✅ Merged metadata for {len(final_records)} records")
         
         # Show sample record
         if final_records:
             sample = final_records[0]
-            print(f"\n📝 Sample Record:")
-            print(f"  Service: {sample['metadata']['service_type']}")
-            print(f"  Title: {sample['metadata']['doc_title']}")
-            print(f"  Source: {sample['metadata']['filename']}")
-            print(f"  Tokens: {sample['metadata']['token_count']}")
-            print(f"  Embedding: {len(sample['embedding'])} dimensions")
+            logger.info("\n📝 Sample Record:")
+            logger.info(f"  Service: {sample['metadata']['service_type']}")
+            logger.info(f"  Title: {sample['metadata']['doc_title']}")
+            logger.info(f"  Source: {sample['metadata']['filename']}")
+            logger.info(f"  Tokens: {sample['metadata']['token_count']}")
+            logger.info(f"  Embedding: {len(sample['embedding'])} dimensions")
         
     except Exception as e:
-        print(f"❌ Error merging metadata: {e}")
+        logger.error(f"❌ Error merging metadata: {e}")
         return
     
     # Step 4: Initialize ChromaDB and store documents
-    print(f"\n🗄️ Step 4: Storing in ChromaDB")
-    print("-" * 40)
+    logger.info("\n🗄️ Step 4: Storing in ChromaDB")
+    logger.info("-" * 40)
     
     try:
         # Initialize vector store
-        print("🔧 Initializing ChromaDB vector store...")
+        logger.info("🔧 Initializing ChromaDB vector store...")
         vector_store = init_vector_store()
         
         if not vector_store:
-            print("❌ Failed to initialize vector store")
+            logger.error("❌ Failed to initialize vector store")
             return
         
         # Add documents to vector store in batches
-        print(f"📚 Adding {len(final_records)} records to ChromaDB...")
+        logger.info(f"📚 Adding {len(final_records)} records to ChromaDB...")
         
-        # Process in smaller batches for ChromaDB
-        chroma_batch_size = 20
+        # Large batches keep the number of ChromaDB/SQLite transactions low
+        chroma_batch_size = int(os.getenv("CHROMA_WRITE_BATCH", "500"))
         total_added = 0
         
         for i in range(0, len(final_records), chroma_batch_size):
@@ -195,14 +226,14 @@ def main():
             batch_num = (i // chroma_batch_size) + 1
             total_batches = (len(final_records) + chroma_batch_size - 1) // chroma_batch_size
             
-            print(f"📚 Adding batch {batch_num}/{total_batches} ({len(batch)} records)...")
+            logger.info(f"📚 Adding batch {batch_num}/{total_batches} ({len(batch)} records)...")
             
             success = add_documents(vector_store, batch)
             if success:
                 total_added += len(batch)
-                print(f"✅ Batch {batch_num} added successfully")
+                logger.info(f"✅ Batch {batch_num} added successfully")
             else:
-                print(f"❌ Failed to add batch {batch_num}")
+                logger.error(f"❌ Failed to add batch {batch_num}")
                 break
             
             # Clear batch memory
@@ -210,12 +241,12 @@ def main():
             gc.collect()
         
         if total_added > 0:
-            print(f"✅ Successfully added {total_added} records to ChromaDB")
-            print(f"📊 Total documents in collection: {vector_store.collection.count()}")
+            logger.info(f"✅ Successfully added {total_added} records to ChromaDB")
+            logger.info(f"📊 Total documents in collection: {vector_store.collection.count()}")
             
             # Show final service distribution in ChromaDB
-            print(f"\n🎯 Final ChromaDB Contents:")
-            print(f"  Total records: {vector_store.collection.count()}")
+            logger.info("\n🎯 Final ChromaDB Contents:")
+            logger.info(f"  Total records: {vector_store.collection.count()}")
             
             # Query to get service distribution
             try:
@@ -228,34 +259,39 @@ def main():
                             service = metadata['service_type']
                             service_counts[service] = service_counts.get(service, 0) + 1
                     
-                    print(f"  Service Distribution:")
+                    logger.info("  Service Distribution:")
                     for service, count in service_counts.items():
-                        print(f"    {service}: {count} records")
+                        logger.info(f"    {service}: {count} records")
             except Exception as e:
-                print(f"  ⚠️ Could not retrieve service distribution: {e}")
+                logger.warning(f"  ⚠️ Could not retrieve service distribution: {e}")
             
         else:
-            print("❌ Failed to add any documents to vector store")
+            logger.error("❌ Failed to add any documents to vector store")
             return
         
     except Exception as e:
-        print(f"❌ Error storing in ChromaDB: {e}")
+        logger.error(f"❌ Error storing in ChromaDB: {e}")
         return
     
     # Success!
-    print(f"\n🎉 PDF Processing Pipeline Complete!")
-    print("=" * 60)
-    print(f"✅ Processed PDFs: {len(chunked_records)} chunks")
-    print(f"✅ Generated embeddings: {len(all_embedded_records)}")
-    print(f"✅ Stored in ChromaDB: {total_added} records")
-    print(f"🎯 Your PDF documents are now searchable in the vector store!")
+    logger.info("\n🎉 PDF Processing Pipeline Complete!")
+    logger.info("=" * 60)
+    logger.info(f"✅ Processed PDFs: {len(chunked_records)} chunks")
+    logger.info(f"✅ Generated embeddings: {len(all_embedded_records)}")
+    logger.info(f"✅ Stored in ChromaDB: {total_added} records")
+    logger.info("🎯 Your PDF documents are now searchable in the vector store!")
     
     # Show next steps
-    print(f"\n📋 Next Steps:")
-    print(f"  1. Test retrieval with: python -c \"from src.retrieve.vector_store import *; vs = init_vector_store(); print('ChromaDB ready!')\"")
-    print(f"  2. Run evaluation: python src/tests/baseline_evaluation.py")
-    print(f"  3. Query your documents through the RAG pipeline")
+    logger.info("\n📋 Next Steps:")
+    logger.info("  1. Test retrieval with: python -c \"from src.retrieve.vector_store import *; vs = init_vector_store(); print('ChromaDB ready!')\"")
+    logger.info("  2. Run evaluation: python src/tests/baseline_evaluation.py")
+    logger.info("  3. Query your documents through the RAG pipeline")
 
 
 if __name__ == "__main__":
-    main()
+    # Log lines are written by a background thread; INGEST_LOG_LEVEL controls verbosity
+    listener = start_queue_logging()
+    try:
+        main()
+    finally:
+        listener.stop()
@@ -10,6 +10,34 @@ import sys
 import subprocess
 from pathlib import Path
 
+STREAMLIT_FLAGS = {
+    "server.port": 8501,
+    "server.address": "localhost"
+}
+
+
+def launch_streamlit(ui_path: Path, project_root: Path):
+    """
+    Run the Streamlit app in this interpreter.
+    
+    Calling Streamlit's bootstrap directly avoids starting a second Python
+    process and re-importing everything; the subprocess launch is only used
+    if Streamlit's internal API cannot be imported.
+    """
+    try:
+        from streamlit.web import bootstrap
+    except ImportError:
+        args = [sys.executable, "-m", "streamlit", "run", str(ui_path)]
+        for name, value in STREAMLIT_FLAGS.items():
+            args += [f"--{name}", str(value)]
+        subprocess.run(args, cwd=project_root)
+        return
+    
+    os.chdir(project_root)
+    bootstrap.load_config_options(flag_options=STREAMLIT_FLAGS)
+    bootstrap.run(str(ui_path), "", [], flag_options=STREAMLIT_FLAGS)
+
+
 def main():
     """Launch the Streamlit UI with proper configuration"""
     
@@ -17,10 +45,6 @@ def main():
     project_root = Path(__file__).parent
     src_path = project_root / "src"
     
-    # Add src to Python path
-    if str(src_path) not in sys.path:
-        sys.path.insert(0, str(src_path))
-    
     # Check if .env file exists
     env_file = project_root / ".env"
     if not env_file.exists():
@@ -51,16 +75,12 @@ def main():
     print("💡 Tips:")
     print("   - Use the sidebar to configure feature flags")
     print("   - Try example questions to test the system")
-    print("   - Monitor debug info for performance metrics")
+    print("   - Open http://localhost:8501/?mode=debug for per-answer performance metrics")
     print()
     
     # Launch Streamlit
     try:
-        subprocess.run([
-            sys.executable, "-m", "streamlit", "run", str(ui_path),
-            "--server.port", "8501",
-            "--server.address", "localhost"
-        ], cwd=project_root)
+        launch_streamlit(ui_path, project_root)
     except KeyboardInterrupt:
         print("\n👋 UI stopped by user")
     except Exception as e:
@@ -3,12 +3,6 @@
 Simple demonstration of automatic mock fallback when rate limits hit.
 """
 
-import sys
-from pathlib import Path
-
-# Add src to path
-sys.path.insert(0, str(Path(__file__).parent / "src"))
-
 from src.models.llm_client import LLMClient
 from src.ingest.data_processor import EmbeddingClient
 from src.models.mock_fallback import mock_fallback
@@ -49,7 +43,7 @@ def demo_automatic_fallback():
     try:
         embeddings = embed_client.get_embeddings(["Test query"])
         print(f"✅ Embeddings generated: {len(embeddings)}")
-        if embeddings:
+        if len(embeddings):
             print(f"   Dimensions: {len(embeddings[0])}")
         print()
         
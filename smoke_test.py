@@ -5,23 +5,47 @@ Verifies connectivity with OpenAI, Google Gemini, and ElevenLabs APIs
 """
 
 import sys
-import os
+import argparse
 import requests
-from openai import OpenAI
-from google.generativeai import GenerativeModel
-import google.generativeai as genai
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
-# Add src to path for config import
-sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+from src.config import config
 
-from config import config
+# Per-request timeout (seconds) so one slow vendor cannot stall the run
+CHECK_TIMEOUT = 5
+
+# Display names of the connectivity checks, selectable with --only
+PROVIDERS = {
+    "openai": "OpenAI API",
+    "gemini": "Google Gemini",
+    "elevenlabs": "ElevenLabs"
+}
+
+# Pooled session: repeated checks reuse connections instead of new TLS handshakes
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=8,
+    max_retries=Retry(total=2, backoff_factor=0.2)
+))
+
+
+@lru_cache(maxsize=1)
+def get_openai_client():
+    """Return the shared OpenAI client, created on first use."""
+    # Imported here so runs that skip OpenAI never load the SDK
+    from openai import OpenAI
+    return OpenAI(api_key=config.openai_api_key, timeout=CHECK_TIMEOUT)
 
 def test_openai_connectivity():
     """Test OpenAI API connectivity"""
     print("🔍 Testing OpenAI API connectivity...")
     
     try:
-        client = OpenAI(api_key=config.openai_api_key)
+        client = get_openai_client()
         
         # Test model listing
         models = client.models.list()
@@ -46,12 +70,18 @@ def test_gemini_connectivity():
     print("🔍 Testing Google Gemini API connectivity...")
     
     try:
+        # Imported here so runs that skip Gemini never load the SDK
+        import google.generativeai as genai
+        
         # Configure Gemini
         genai.configure(api_key=config.google_gemini_api_key)
         
         # Test model generation
-        model = GenerativeModel('gemini-1.5-pro')
-        response = model.generate_content("Hello, this is a connectivity test.")
+        model = genai.GenerativeModel('gemini-1.5-pro')
+        response = model.generate_content(
+            "Hello, this is a connectivity test.",
+            request_options={"timeout": CHECK_TIMEOUT}
+        )
         
         print(f"✅ Google Gemini: Successfully connected!")
         print(f"✅ Google Gemini: Response generated successfully!")
@@ -77,9 +107,10 @@ def test_elevenlabs_connectivity():
             "xi-api-key": config.elevenlabs_api_key
         }
         
-        response = requests.get(
+        response = _SESSION.get(
             "https://api.elevenlabs.io/v1/voices",
-            headers=headers
+            headers=headers,
+            timeout=CHECK_TIMEOUT
         )
         
         if response.status_code == 200:
@@ -110,28 +141,47 @@ def test_config_validation():
         print(f"❌ Configuration: Validation failed - {str(e)}")
         return False
 
-def main():
+def main(argv=None):
     """Run all connectivity tests"""
+    parser = argparse.ArgumentParser(description="NYC Services GPT connectivity smoke test")
+    parser.add_argument(
+        "--only",
+        default=",".join(PROVIDERS),
+        help=f"Comma-separated providers to check (default: {','.join(PROVIDERS)})"
+    )
+    args = parser.parse_args(argv)
+    
+    selected = [name.strip() for name in args.only.split(",") if name.strip()]
+    unknown = [name for name in selected if name not in PROVIDERS]
+    if unknown:
+        parser.error(f"unknown provider(s): {', '.join(unknown)}")
+    
     print("🚀 Starting NYC Services GPT RAG System Smoke Test")
     print("=" * 50)
     
     # Test configuration
     config_valid = test_config_validation()
     
-    # Test API connectivity
-    openai_ok = test_openai_connectivity()
-    gemini_ok = test_gemini_connectivity()
-    elevenlabs_ok = test_elevenlabs_connectivity()
+    # Test API connectivity; the checks are independent network round-trips,
+    # so they run concurrently and the total wait is the slowest one
+    all_checks = {
+        "openai": test_openai_connectivity,
+        "gemini": test_gemini_connectivity,
+        "elevenlabs": test_elevenlabs_connectivity
+    }
+    checks = {name: all_checks[name] for name in selected}
+    with ThreadPoolExecutor(max_workers=max(len(checks), 1)) as executor:
+        futures = {name: executor.submit(check) for name, check in checks.items()}
+    results = {name: future.result() for name, future in futures.items()}
     
     print("\n" + "=" * 50)
     print("📊 SMOKE TEST RESULTS:")
     print(f"Configuration: {'✅ PASS' if config_valid else '❌ FAIL'}")
-    print(f"OpenAI API: {'✅ PASS' if openai_ok else '❌ FAIL'}")
-    print(f"Google Gemini: {'✅ PASS' if gemini_ok else '❌ FAIL'}")
-    print(f"ElevenLabs: {'✅ PASS' if elevenlabs_ok else '❌ FAIL'}")
+    for name, ok in results.items():
+        print(f"{PROVIDERS[name]}: {'✅ PASS' if ok else '❌ FAIL'}")
     
     # Overall result
-    all_passed = config_valid and openai_ok and gemini_ok and elevenlabs_ok
+    all_passed = config_valid and all(results.values())
     
     if all_passed:
         print("\n🎉 ALL TESTS PASSED! System is ready for development.")
@@ -3,22 +3,167 @@ NYC Services GPT API Server
 TODO: implement API endpoints for user queries to achieve Self-Service Success Rate ≥ 90% as specified in PROJECT_SPEC.md
 """
 
+import os
+import shutil
+import hashlib
+import threading
+
 from flask import Flask, request, jsonify
 from ..config import config
+from ..models.fast_json import dumps
+from ..models.llm_client import warm_up_connections
+from ..models.router import answer_with_rag
+from ..models.single_flight import SingleFlight
+from ..models.ttl_cache import TTLCache
+from ..retrieve.vector_store import init_vector_store
+
+try:
+    from flask_compress import Compress
+except ImportError:
+    Compress = None
+
+# Seconds clients may reuse a /query response, then serve it stale while revalidating
+RESPONSE_MAX_AGE = 60
+RESPONSE_STALE_WHILE_REVALIDATE = 30
+
+# Seconds load balancers may reuse a /health response
+HEALTH_MAX_AGE = 10
+
+# Production server sizing; requests mostly wait on OpenAI, so threads >> cores
+API_WORKERS = int(os.getenv("API_WORKERS", "2"))
+API_THREADS = int(os.getenv("API_THREADS", "32"))
 
 app = Flask(__name__)
+app.json.sort_keys = False
+
+# gzip JSON responses when flask-compress is installed
+if Compress is not None:
+    Compress(app)
+
+# (answer, ETag) for repeated questions, keyed on the normalized request;
+# jittered expiry keeps answers cached together from all going cold at once
+_response_cache = TTLCache(maxsize=1024, ttl=3600, jitter=0.1)
+
+# Concurrent misses for the same question share one RAG call
+_inflight = SingleFlight(timeout=30)
+
+# Vector store shared by all requests (opened on first use)
+_vector_store = None
+_vector_store_lock = threading.Lock()
+
+
+# Connect to OpenAI while the worker boots so the first query skips the TLS handshake
+threading.Thread(target=warm_up_connections, name="openai-warmup", daemon=True).start()
+
+
+def _get_vector_store():
+    """Open the vector store once and reuse it across requests."""
+    global _vector_store
+    if _vector_store is None:
+        with _vector_store_lock:
+            if _vector_store is None:
+                _vector_store = init_vector_store()
+    return _vector_store
+
+
+def _query_key(question: str, top_k: int, filters, provider: str) -> tuple:
+    """Build the response cache key; case and whitespace differences share one entry."""
+    return (" ".join(question.lower().split()), top_k, dumps(filters or {}, sort_keys=True), provider)
+
+
+def _response_etag(response: dict) -> str:
+    """Hash the answer body, so the ETag changes whenever the cached answer does."""
+    return hashlib.blake2b(dumps(response, sort_keys=True).encode("utf-8"), digest_size=16).hexdigest()
+
 
 @app.route('/query', methods=['POST'])
 def handle_query():
     """Handle user queries and return RAG-powered responses"""
-    # TODO: implement query processing with RAG pipeline
-    pass
+    payload = request.get_json(silent=True) or {}
+    question = str(payload.get("question", "")).strip()
+    if not question:
+        return jsonify({"error": "Missing 'question'"}), 400
+
+    try:
+        top_k = int(payload.get("top_k", 5))
+    except (TypeError, ValueError):
+        return jsonify({"error": "'top_k' must be an integer"}), 400
+    filters = payload.get("filters")
+    provider = payload.get("provider", config.default_provider)
+
+    cache_key = _query_key(question, top_k, filters, provider)
+
+    entry = _response_cache.get(cache_key)
+    if entry is None:
+        def compute():
+            result = answer_with_rag(
+                question=question,
+                top_k=top_k,
+                filters=filters,
+                provider=provider,
+                vector_store=_get_vector_store()
+            )
+            computed = (result, _response_etag(result))
+            # Errors are retried on the next request rather than cached
+            if result["meta"]["provider"] != "error":
+                _response_cache.set(cache_key, computed)
+            return computed
+
+        entry = _inflight.do(cache_key, compute)
+        if entry[0]["meta"]["provider"] == "error":
+            return jsonify(entry[0]), 503
+
+    response, etag = entry
+    # A recomputed answer identical to the client's copy is still a 304
+    if request.if_none_match.contains(etag):
+        return "", 304, {"ETag": f'"{etag}"'}
+
+    http_response = jsonify(response)
+    http_response.set_etag(etag)
+    # Answers are per-question, so only the client (not shared caches) should keep them
+    http_response.headers["Cache-Control"] = (
+        f"private, max-age={RESPONSE_MAX_AGE}, stale-while-revalidate={RESPONSE_STALE_WHILE_REVALIDATE}"
+    )
+    return http_response
 
 @app.route('/health', methods=['GET'])
 def health_check():
     """Health check endpoint"""
-    return jsonify({"status": "healthy"})
+    response = jsonify({"status": "healthy"})
+    response.set_etag("healthy", weak=True)
+    response.headers["Cache-Control"] = f"public, max-age={HEALTH_MAX_AGE}"
+    # Turns into an empty 304 when the caller already holds this ETag
+    return response.make_conditional(request)
+
+def serve(host: str, port: int, debug: bool = False):
+    """
+    Run the API server.
+    
+    Debug mode keeps Flask's reloading dev server. Otherwise the app runs
+    under gunicorn's threaded workers so slow LLM and embedding calls
+    overlap instead of queueing, falling back to the threaded dev server
+    when gunicorn is not installed.
+    
+    Args:
+        host: Interface to bind
+        port: Port to bind
+        debug: Use the Flask debug server
+    """
+    if debug or shutil.which("gunicorn") is None:
+        app.run(debug=debug, host=host, port=port, threaded=True)
+        return
+    
+    os.execvp("gunicorn", [
+        "gunicorn",
+        "--bind", f"{host}:{port}",
+        "--worker-class", "gthread",
+        "--workers", str(API_WORKERS),
+        "--threads", str(API_THREADS),
+        "--timeout", "60",
+        "--chdir", os.path.join(os.path.dirname(__file__), "..", ".."),
+        "wsgi:application"
+    ])
 
 if __name__ == '__main__':
     api_config = config.get_api_config()
-    app.run(debug=api_config['debug'], host=api_config['host'], port=api_config['port']) 
\ No newline at end of file
+    serve(api_config['host'], api_config['port'], debug=api_config['debug'])
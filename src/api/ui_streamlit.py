@@ -6,17 +6,31 @@ Leverages existing infrastructure for optimal performance.
 """
 
 import streamlit as st
+import json
 import time
 import sys
 import os
+import threading
 
-# Add src to path for imports
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+# Make the project root importable for `streamlit run src/api/ui_streamlit.py`;
+# the script re-executes on every rerun, so only add it once
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
 
 from src.retrieve.vector_store import init_vector_store
-from src.models.router import answer_with_rag
+from src.models.router import answer_with_rag_stream, embed_questions
+from src.models.llm_client import warm_up_connections
+from src.models.single_flight import SingleFlight
+from src.models.ttl_cache import TTLCache
 from src.config import config
 
+# UI mode from the URL (?mode=debug); debug adds per-answer pipeline metadata
+UI_MODES = ("mvp", "debug")
+MODE = st.query_params.get("mode", "mvp")
+if MODE not in UI_MODES:
+    MODE = "mvp"
+
 # Page configuration
 st.set_page_config(
     page_title="NYC Services GPT",
@@ -25,8 +39,163 @@ st.set_page_config(
     initial_sidebar_state="collapsed"
 )
 
-# Custom CSS for better styling
-st.markdown("""
+@st.cache_resource(show_spinner=False)
+def _warm_up():
+    """Connect to OpenAI once per process, in the background, so the first question skips the TLS handshake."""
+    threading.Thread(target=warm_up_connections, name="openai-warmup", daemon=True).start()
+    return True
+
+
+_warm_up()
+
+
+@st.cache_resource(show_spinner=False)
+def _get_vs():
+    """Open the vector store once per process and reuse it across reruns."""
+    return init_vector_store()
+
+
+@st.cache_resource(show_spinner=False)
+def _answer_cache():
+    """Response cache shared by all sessions, keyed on the normalized question and settings."""
+    return TTLCache(maxsize=256, ttl=3600, jitter=0.1)
+
+
+@st.cache_resource(show_spinner=False)
+def _inflight():
+    """Sessions asking the same uncached question at once share one generated answer."""
+    return SingleFlight(timeout=30)
+
+
+def _answer_key(question: str, top_k: int, filters, provider: str):
+    """Build the response cache key; near-identical phrasings (case, whitespace) share one entry."""
+    question_key = " ".join(question.lower().split())
+    filters_key = json.dumps(filters, sort_keys=True) if filters else ""
+    return (question_key, top_k, filters_key, provider)
+
+
+def _answer_chunks(stream, final: dict):
+    """
+    Yield the text chunks of a streamed RAG answer.
+    
+    The spinner stays up only until the first chunk arrives; the response
+    dictionary that ends the stream is copied into final.
+    """
+    stream = iter(stream)
+    with st.spinner("🔍 Searching NYC services database..."):
+        chunk = next(stream, None)
+    
+    while chunk is not None:
+        if isinstance(chunk, dict):
+            final.update(chunk)
+        else:
+            yield chunk
+        chunk = next(stream, None)
+
+
+def _format_source(index: int, source) -> str:
+    """Format one retrieved source as markdown for the sources section."""
+    lines = [
+        f"**Source {index}: {source.get('service', 'Unknown Service')}**",
+        f"**Service:** {source.get('service', 'Unknown')}",
+        f"**Content:** {source.get('content', 'No content available')}"
+    ]
+    if source.get('metadata'):
+        lines.append(f"**Additional Info:** {source.get('metadata', {})}")
+    return "  \n".join(lines)
+
+
+def get_answer(question: str, top_k: int = 5, filters=None, provider: str = "openai", vector_store=None):
+    """
+    Render the answer to a question, streaming it as it is generated.
+    
+    Cached answers are rendered at once; on a miss the tokens are written
+    as they arrive and the completed response is cached. Sessions that miss
+    while another session is generating the same answer wait for it and
+    render it whole.
+    
+    Returns:
+        Tuple of (response, cache_status) where cache_status is "HIT" or "MISS"
+    """
+    cache = _answer_cache()
+    cache_key = _answer_key(question, top_k, filters, provider)
+    
+    response = cache.get(cache_key)
+    if response is not None:
+        st.markdown(response["answer"])
+        return response, "HIT"
+    
+    streamed = False
+    
+    def generate():
+        nonlocal streamed
+        streamed = True
+        result = {}
+        st.write_stream(_answer_chunks(
+            answer_with_rag_stream(question, top_k, filters, provider, vector_store=vector_store),
+            result
+        ))
+        if result.get("meta", {}).get("provider") != "error":
+            cache.set(cache_key, result)
+        return result
+    
+    response = _inflight().do(cache_key, generate)
+    if not streamed:
+        st.markdown(response.get("answer", ""))
+    return response, "MISS"
+
+
+EXAMPLE_QUESTIONS = (
+    "How do I apply for unemployment benefits in NYC?",
+    "What documents do I need for SNAP benefits?",
+    "How do I apply for Medicaid in New York?",
+    "What income qualifies for cash assistance?",
+    "How do I find child care subsidies?",
+    "How do I check my EBT balance?",
+    "What happens if my unemployment claim is denied?",
+    "How do I appeal a SNAP decision?"
+)
+
+
+# Confidence brackets as (answer longer than, at least N sources, score), best first
+CONFIDENCE_BUCKETS = (
+    (200, 2, 85),
+    (100, 1, 70),
+    (50, 0, 55)
+)
+DEFAULT_CONFIDENCE = 40
+
+
+@st.cache_data(show_spinner=False)
+def _example_buttons(questions: tuple) -> list:
+    """Precompute (label, question) pairs for the example buttons."""
+    # Wider columns fit longer labels
+    max_label = 40 if len(questions) <= 4 else 35
+    return [
+        (question[:max_label] + "..." if len(question) > max_label else question, question)
+        for question in questions
+    ]
+
+
+@st.cache_resource(show_spinner=False)
+def _prewarm_examples(questions: tuple):
+    """Embed all example questions in one request so clicking one skips the embedding call."""
+    try:
+        embed_questions(list(questions))
+    except Exception as e:
+        print(f"⚠️ Could not pre-embed example questions: {e}")
+
+
+def _ask(question: str):
+    """Submit an example question; runs as a callback before the rerun, so no extra st.rerun() is needed."""
+    st.session_state.question = question
+    st.session_state.submitted = True
+
+
+@st.cache_data(show_spinner=False)
+def _header_html() -> str:
+    """Custom CSS, title and tagline as one fragment, built once instead of on every rerun."""
+    return """
 <style>
     .main-header {
         text-align: center;
@@ -62,7 +231,23 @@ st.markdown("""
         margin: 1rem 0;
     }
 </style>
-""", unsafe_allow_html=True)
+<h1 class="main-header">🏙️ NYC Services GPT</h1>
+
+<p><strong>Your AI assistant for NYC government services and benefits</strong></p>
+"""
+
+
+FOOTER_HTML = """
+<hr>
+<div style="text-align: center; color: #666; font-size: 0.8em;">
+    <p>Powered by NYC Services GPT • Built for NYC residents and businesses</p>
+    <p>For official information, always verify with NYC government sources</p>
+</div>
+"""
+
+
+# Custom CSS and main header in a single element
+st.markdown(_header_html(), unsafe_allow_html=True)
 
 # Initialize session state
 if 'question' not in st.session_state:
@@ -70,203 +255,140 @@ if 'question' not in st.session_state:
 if 'submitted' not in st.session_state:
     st.session_state.submitted = False
 
-# Main header
-st.markdown('<h1 class="main-header">🏙️ NYC Services GPT</h1>', unsafe_allow_html=True)
-st.markdown("**Your AI assistant for NYC government services and benefits**")
-
 # Example questions
 st.markdown("### 💡 Example Questions")
-example_questions = [
-    "How do I apply for unemployment benefits in NYC?",
-    "What documents do I need for SNAP benefits?",
-    "How do I apply for Medicaid in New York?",
-    "What income qualifies for cash assistance?",
-    "How do I find child care subsidies?",
-    "How do I check my EBT balance?",
-    "What happens if my unemployment claim is denied?",
-    "How do I appeal a SNAP decision?"
-]
-
-# Create responsive columns for example questions
-if len(example_questions) <= 4:
-    cols = st.columns(len(example_questions))
-    for i, question in enumerate(example_questions):
-        with cols[i]:
-            if st.button(question[:40] + "..." if len(question) > 40 else question, key=f"ex_{i}"):
-                st.session_state.question = question
-                st.session_state.submitted = True
-                st.rerun()
-else:
-    # For more questions, use a grid layout
-    cols = st.columns(4)
-    for i, question in enumerate(example_questions):
-        with cols[i % 4]:
-            if st.button(question[:35] + "..." if len(question) > 35 else question, key=f"ex_{i}"):
-                st.session_state.question = question
-                st.session_state.submitted = True
-                st.rerun()
-
-# Question input with Enter key submission
+example_buttons = _example_buttons(EXAMPLE_QUESTIONS)
+_prewarm_examples(EXAMPLE_QUESTIONS)
+
+# Responsive columns: one per question, or a 4-wide grid for more questions
+cols = st.columns(min(len(example_buttons), 4))
+for i, (label, question) in enumerate(example_buttons):
+    with cols[i % len(cols)]:
+        st.button(label, key=f"ex_{i}", on_click=_ask, args=(question,))
+
+# Question input; the form only reruns the script on submit, not while typing
 st.markdown("### ❓ Ask Your Question")
 
-# Add JavaScript for Enter key submission
-st.markdown("""
-<script>
-    const textArea = document.querySelector('textarea[data-testid="stTextArea"]');
-    if (textArea) {
-        textArea.addEventListener('keydown', function(e) {
-            if (e.key === 'Enter' && !e.shiftKey) {
-                e.preventDefault();
-                const submitButton = document.querySelector('button[data-testid="baseButton-primary"]');
-                if (submitButton) {
-                    submitButton.click();
-                }
-            }
-        });
-    }
-</script>
-""", unsafe_allow_html=True)
-
-question = st.text_area(
-    "Ask about NYC services, benefits, or assistance programs:",
-    value=st.session_state.question,
-    height=100,
-    placeholder="e.g., How do I apply for food stamps in NYC? (Press Enter to submit)",
-    key="question_input",
-    help="Type your question and press Enter to submit, or click an example question above."
-)
+with st.form("ask", clear_on_submit=False):
+    question = st.text_area(
+        "Ask about NYC services, benefits, or assistance programs:",
+        value=st.session_state.question,
+        height=100,
+        placeholder="e.g., How do I apply for food stamps in NYC? (Press Ctrl+Enter to submit)",
+        key="question_input",
+        help="Type your question and press Ctrl+Enter to submit, or click an example question above."
+    )
+    ask_clicked = st.form_submit_button("🚀 Ask Question", type="primary")
 
-# Show character count
-if question:
-    char_count = len(question)
-    if char_count > 500:
-        st.warning(f"⚠️ Question is quite long ({char_count} characters). Consider breaking it into smaller questions for better results.")
-    elif char_count > 200:
-        st.info(f"📝 Question length: {char_count} characters")
-    else:
-        st.success(f"✅ Question length: {char_count} characters")
-
-# Handle submission (both button click and Enter key)
-if st.button("🚀 Ask Question", type="primary", key="submit_button"):
-    if question.strip():
-        st.session_state.question = question
-        st.session_state.submitted = True
-        st.rerun()
-
-# Also handle when question changes (for auto-submission from examples)
-if question and question != st.session_state.question and st.session_state.submitted:
+# Handle submission (button click or Ctrl+Enter)
+if ask_clicked and question.strip():
     st.session_state.question = question
+    st.session_state.submitted = True
+    
+    # Long questions still go through, with a hint to split them
+    if len(question) > 500:
+        st.warning(f"⚠️ Question is quite long ({len(question)} characters). Consider breaking it into smaller questions for better results.")
 
 # Process question when submitted
 if st.session_state.submitted and st.session_state.question:
-    # Show loading state
-    with st.spinner("🔍 Searching NYC services database..."):
-        try:
-            # Initialize vector store
-            vs = init_vector_store()
-            
-            # Get RAG response
-            response = answer_with_rag(
-                question=st.session_state.question,
-                top_k=5,  # Fixed top_k for simplicity
-                filters=None,  # No service filtering for MVP
-                provider="openai"  # Fixed provider for MVP
-            )
-            
-            # Display answer
-            st.markdown("### 💬 Answer")
-            st.markdown(response["answer"])
-            
-            # Success message
-            st.success("✅ Answer generated successfully! Check the confidence score below.")
-            
-            # Display sources
-            if response.get("sources"):
-                st.markdown("### 📚 Sources")
-                for i, source in enumerate(response["sources"], 1):
-                    with st.expander(f"Source {i}: {source.get('service', 'Unknown Service')}"):
-                        st.markdown(f"**Service:** {source.get('service', 'Unknown')}")
-                        st.markdown(f"**Content:** {source.get('content', 'No content available')}")
-                        if source.get('metadata'):
-                            st.markdown(f"**Additional Info:** {source.get('metadata', {})}")
-            
-            # Confidence scoring and human fallback
-            st.markdown("### 🎯 Confidence Assessment")
-            
-            # Calculate confidence based on response quality indicators
-            # In a real implementation, this would come from the LLM or response analysis
-            answer_length = len(response.get("answer", ""))
-            sources_count = len(response.get("sources", []))
-            
-            # Simple confidence calculation based on response quality
-            if answer_length > 200 and sources_count >= 2:
-                confidence_score = 85
-            elif answer_length > 100 and sources_count >= 1:
-                confidence_score = 70
-            elif answer_length > 50:
-                confidence_score = 55
-            else:
-                confidence_score = 40
-            
-            # Display confidence with appropriate styling
-            if confidence_score >= 80:
-                st.markdown(f'<p class="confidence-high">✅ High Confidence: {confidence_score}%</p>', unsafe_allow_html=True)
-                st.success("This answer should address your question completely.")
-            elif confidence_score >= 60:
-                st.markdown(f'<p class="confidence-medium">⚠️ Medium Confidence: {confidence_score}%</p>', unsafe_allow_html=True)
-                st.warning("This answer should help, but you may want to verify details with official sources.")
-            else:
-                st.markdown(f'<p class="confidence-low">❌ Low Confidence: {confidence_score}%</p>', unsafe_allow_html=True)
-                
-                # Human fallback message
-                st.markdown("""
-                <div class="human-fallback">
-                    <h4>🤝 Need Human Assistance</h4>
-                    <p>We're not confident enough in this answer to fully address your question. 
-                    Please contact NYC customer service for personalized assistance:</p>
-                    <ul>
-                        <li><strong>NYC 311:</strong> Dial 311 or visit <a href="https://www1.nyc.gov/311/" target="_blank">nyc.gov/311</a></li>
-                        <li><strong>NYC.gov:</strong> Visit <a href="https://www.nyc.gov/" target="_blank">nyc.gov</a> for official information</li>
-                        <li><strong>Department of Social Services:</strong> Visit your local office or call 718-557-1399</li>
-                    </ul>
-                </div>
-                """, unsafe_allow_html=True)
-            
-            # Reset submission state
-            st.session_state.submitted = False
-            
-            # Add option to ask a new question
-            st.markdown("---")
-            if st.button("🆕 Ask Another Question", type="secondary"):
-                st.session_state.question = ""
-                st.rerun()
-            
-        except Exception as e:
-            error_msg = str(e)
-            
-            # Handle specific error types
-            if "MockFallbackManager" in error_msg:
-                st.error("❌ System temporarily unavailable. Please try again in a moment.")
-                st.info("The AI system is experiencing high demand. This is normal and will resolve automatically.")
-            elif "rate_limit" in error_msg.lower():
-                st.error("⚠️ System is busy. Please wait a moment and try again.")
-                st.info("We're experiencing high demand. Your question will be processed shortly.")
-            else:
-                st.error(f"❌ Error processing your question: {error_msg}")
-                st.info("Please try rephrasing your question or contact NYC customer service for assistance.")
-            
-            # Add retry option
-            if st.button("🔄 Try Again", type="secondary"):
-                st.session_state.submitted = False
-                st.rerun()
+    try:
+        # Reuse the cached vector store; don't cache a failed initialization
+        vs = _get_vs()
+        if vs is None:
+            _get_vs.clear()
+        
+        # Stream the RAG answer (identical questions are served from cache)
+        st.markdown("### 💬 Answer")
+        response, cache_status = get_answer(
+            question=st.session_state.question,
+            top_k=5,  # Fixed top_k for simplicity
+            filters=None,  # No service filtering for MVP
+            provider="openai",  # Fixed provider for MVP
+            vector_store=vs
+        )
+        
+        # Success message
+        st.success("✅ Answer generated successfully! Check the confidence score below.")
+        st.caption(f"Response cache: {cache_status}")
+        
+        # Pipeline metadata (latency, provider, tokens, cost) in debug mode
+        if MODE == "debug":
+            with st.expander("🛠️ Debug", expanded=False):
+                st.json(response.get("meta", {}))
+        
+        # Display sources in one collapsed section, as a single markdown element
+        if response.get("sources"):
+            with st.expander(f"📚 Sources ({len(response['sources'])})", expanded=False):
+                st.markdown("\n\n---\n\n".join(_format_source(i, source) for i, source in enumerate(response["sources"], 1)))
+        
+        # Confidence scoring and human fallback
+        st.markdown("### 🎯 Confidence Assessment")
+        
+        # Calculate confidence based on response quality indicators
+        # In a real implementation, this would come from the LLM or response analysis
+        answer_length = len(response.get("answer", ""))
+        sources_count = len(response.get("sources", []))
+        
+        # Simple confidence calculation based on response quality
+        confidence_score = next(
+            (score for min_length, min_sources, score in CONFIDENCE_BUCKETS
+             if answer_length > min_length and sources_count >= min_sources),
+            DEFAULT_CONFIDENCE
+        )
+        
+        # Display confidence with appropriate styling
+        if confidence_score >= 80:
+            st.markdown(f'<p class="confidence-high">✅ High Confidence: {confidence_score}%</p>', unsafe_allow_html=True)
+            st.success("This answer should address your question completely.")
+        elif confidence_score >= 60:
+            st.markdown(f'<p class="confidence-medium">⚠️ Medium Confidence: {confidence_score}%</p>', unsafe_allow_html=True)
+            st.warning("This answer should help, but you may want to verify details with official sources.")
+        else:
+            st.markdown(f'<p class="confidence-low">❌ Low Confidence: {confidence_score}%</p>', unsafe_allow_html=True)
             
+            # Human fallback message
+            st.markdown("""
+            <div class="human-fallback">
+                <h4>🤝 Need Human Assistance</h4>
+                <p>We're not confident enough in this answer to fully address your question. 
+                Please contact NYC customer service for personalized assistance:</p>
+                <ul>
+                    <li><strong>NYC 311:</strong> Dial 311 or visit <a href="https://www1.nyc.gov/311/" target="_blank">nyc.gov/311</a></li>
+                    <li><strong>NYC.gov:</strong> Visit <a href="https://www.nyc.gov/" target="_blank">nyc.gov</a> for official information</li>
+                    <li><strong>Department of Social Services:</strong> Visit your local office or call 718-557-1399</li>
+                </ul>
+            </div>
+            """, unsafe_allow_html=True)
+        
+        # Reset submission state
+        st.session_state.submitted = False
+        
+        # Add option to ask a new question
+        st.markdown("---")
+        if st.button("🆕 Ask Another Question", type="secondary"):
+            st.session_state.question = ""
+            st.rerun()
+        
+    except Exception as e:
+        error_msg = str(e)
+        
+        # Handle specific error types
+        if "MockFallbackManager" in error_msg:
+            st.error("❌ System temporarily unavailable. Please try again in a moment.")
+            st.info("The AI system is experiencing high demand. This is normal and will resolve automatically.")
+        elif "rate_limit" in error_msg.lower():
+            st.error("⚠️ System is busy. Please wait a moment and try again.")
+            st.info("We're experiencing high demand. Your question will be processed shortly.")
+        else:
+            st.error(f"❌ Error processing your question: {error_msg}")
+            st.info("Please try rephrasing your question or contact NYC customer service for assistance.")
+        
+        # Add retry option
+        if st.button("🔄 Try Again", type="secondary"):
             st.session_state.submitted = False
+            st.rerun()
+        
+        st.session_state.submitted = False
 
 # Footer
-st.markdown("---")
-st.markdown("""
-<div style="text-align: center; color: #666; font-size: 0.8em;">
-    <p>Powered by NYC Services GPT • Built for NYC residents and businesses</p>
-    <p>For official information, always verify with NYC government sources</p>
-</div>
-""", unsafe_allow_html=True)
+st.markdown(FOOTER_HTML, unsafe_allow_html=True)
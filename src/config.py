@@ -4,48 +4,83 @@ TODO: implement configuration loading for API keys and settings as specified in
 """
 
 import os
-from typing import Optional
+from dataclasses import dataclass
+from functools import cached_property
+from types import MappingProxyType
+from typing import Final, Mapping, Optional, Tuple
 from dotenv import load_dotenv
 
 # Load environment variables from .env file
 load_dotenv()
 
+def _get_api_key(key_name: str) -> Optional[str]:
+    """Safely get API key from environment"""
+    api_key = os.getenv(key_name)
+    if not api_key:
+        print(f"Warning: {key_name} not found in environment variables")
+    return api_key
+
+
+@dataclass(frozen=True)
 class Config:
-    """Configuration class for NYC Services GPT RAG system"""
+    """
+    Configuration class for NYC Services GPT RAG system.
     
-    def __init__(self):
-        # API Keys
-        self.openai_api_key = self._get_api_key("OPENAI_API_KEY")
-        self.google_gemini_api_key = self._get_api_key("GOOGLE_GEMINI_API_KEY")
-        self.elevenlabs_api_key = self._get_api_key("ELEVENLABS_API_KEY")
-        
-        # RAG System Settings
-        self.vector_db_path = os.getenv("VECTOR_DB_PATH", "./data/vector_db")
-        self.embedding_model = os.getenv("EMBEDDING_MODEL", "text-embedding-ada-002")
-        self.llm_model = os.getenv("LLM_MODEL", "gpt-4")
-        
-        # Evaluation Settings
-        self.target_success_rate = float(os.getenv("TARGET_SUCCESS_RATE", "90.0"))
-        self.synthetic_query_count = int(os.getenv("SYNTHETIC_QUERY_COUNT", "100"))
-        
-        # API Settings
-        self.api_host = os.getenv("API_HOST", "0.0.0.0")
-        self.api_port = int(os.getenv("API_PORT", "5000"))
-        self.debug_mode = os.getenv("DEBUG_MODE", "True").lower() == "true"
-        
-        # Feature Flags for MVP UI
-        self.use_real_llm = os.getenv("USE_REAL_LLM", "true").lower() == "true"
-        self.default_provider = os.getenv("DEFAULT_PROVIDER", "openai")
-        self.rate_limit_enabled = os.getenv("RATE_LIMIT_ENABLED", "true").lower() == "true"
-        self.rate_limit_rps = int(os.getenv("RATE_LIMIT_RPS", "5"))
-        self.allowlist = os.getenv("ALLOWLIST", "127.0.0.1,::1").split(",")
-    
-    def _get_api_key(self, key_name: str) -> Optional[str]:
-        """Safely get API key from environment"""
-        api_key = os.getenv(key_name)
-        if not api_key:
-            print(f"Warning: {key_name} not found in environment variables")
-        return api_key
+    Settings are read from the environment once, by from_env(), and are
+    immutable afterwards, so the get_*_config() views are built once and
+    shared instead of rebuilt on every call.
+    """
+    
+    # API Keys
+    openai_api_key: Optional[str] = None
+    google_gemini_api_key: Optional[str] = None
+    elevenlabs_api_key: Optional[str] = None
+    
+    # RAG System Settings
+    vector_db_path: str = "./data/vector_db"
+    embedding_model: str = "text-embedding-ada-002"
+    # Truncated (Matryoshka) embedding size, e.g. 512; None keeps the model's native size
+    embedding_dimensions: Optional[int] = None
+    llm_model: str = "gpt-4"
+    
+    # Evaluation Settings
+    target_success_rate: float = 90.0
+    synthetic_query_count: int = 100
+    
+    # API Settings
+    api_host: str = "0.0.0.0"
+    api_port: int = 5000
+    debug_mode: bool = True
+    
+    # Feature Flags for MVP UI
+    use_real_llm: bool = True
+    default_provider: str = "openai"
+    rate_limit_enabled: bool = True
+    rate_limit_rps: int = 5
+    allowlist: Tuple[str, ...] = ("127.0.0.1", "::1")
+    
+    @classmethod
+    def from_env(cls) -> "Config":
+        """Build the configuration from environment variables"""
+        return cls(
+            openai_api_key=_get_api_key("OPENAI_API_KEY"),
+            google_gemini_api_key=_get_api_key("GOOGLE_GEMINI_API_KEY"),
+            elevenlabs_api_key=_get_api_key("ELEVENLABS_API_KEY"),
+            vector_db_path=os.getenv("VECTOR_DB_PATH", "./data/vector_db"),
+            embedding_model=os.getenv("EMBEDDING_MODEL", "text-embedding-ada-002"),
+            embedding_dimensions=int(os.getenv("EMBEDDING_DIMENSIONS", "0")) or None,
+            llm_model=os.getenv("LLM_MODEL", "gpt-4"),
+            target_success_rate=float(os.getenv("TARGET_SUCCESS_RATE", "90.0")),
+            synthetic_query_count=int(os.getenv("SYNTHETIC_QUERY_COUNT", "100")),
+            api_host=os.getenv("API_HOST", "0.0.0.0"),
+            api_port=int(os.getenv("API_PORT", "5000")),
+            debug_mode=os.getenv("DEBUG_MODE", "True").lower() == "true",
+            use_real_llm=os.getenv("USE_REAL_LLM", "true").lower() == "true",
+            default_provider=os.getenv("DEFAULT_PROVIDER", "openai"),
+            rate_limit_enabled=os.getenv("RATE_LIMIT_ENABLED", "true").lower() == "true",
+            rate_limit_rps=int(os.getenv("RATE_LIMIT_RPS", "5")),
+            allowlist=tuple(os.getenv("ALLOWLIST", "127.0.0.1,::1").split(","))
+        )
     
     def validate_api_keys(self) -> bool:
         """Validate that required API keys are present"""
@@ -58,56 +93,87 @@ class Config:
         
         return True
     
-    def get_openai_config(self) -> dict:
-        """Get OpenAI configuration"""
-        return {
+    @cached_property
+    def openai_config(self) -> Mapping:
+        """OpenAI configuration (read-only, built once)"""
+        return MappingProxyType({
             "api_key": self.openai_api_key,
             "model": self.llm_model,
             "embedding_model": self.embedding_model
-        }
+        })
     
-    def get_gemini_config(self) -> dict:
-        """Get Google Gemini configuration"""
-        return {
+    @cached_property
+    def gemini_config(self) -> Mapping:
+        """Google Gemini configuration (read-only, built once)"""
+        return MappingProxyType({
             "api_key": self.google_gemini_api_key,
             "model": "gemini-1.5-pro"
-        }
+        })
     
-    def get_elevenlabs_config(self) -> dict:
-        """Get ElevenLabs configuration"""
-        return {
+    @cached_property
+    def elevenlabs_config(self) -> Mapping:
+        """ElevenLabs configuration (read-only, built once)"""
+        return MappingProxyType({
             "api_key": self.elevenlabs_api_key
-        }
+        })
     
-    def get_rag_config(self) -> dict:
-        """Get RAG system configuration"""
-        return {
+    @cached_property
+    def rag_config(self) -> Mapping:
+        """RAG system configuration (read-only, built once)"""
+        return MappingProxyType({
             "vector_db_path": self.vector_db_path,
             "embedding_model": self.embedding_model,
+            "embedding_dimensions": self.embedding_dimensions,
             "llm_model": self.llm_model,
             "target_success_rate": self.target_success_rate
-        }
+        })
     
-    def get_api_config(self) -> dict:
-        """Get API server configuration"""
-        return {
+    @cached_property
+    def api_config(self) -> Mapping:
+        """API server configuration (read-only, built once)"""
+        return MappingProxyType({
             "host": self.api_host,
             "port": self.api_port,
             "debug": self.debug_mode
-        }
+        })
     
-    def get_ui_config(self) -> dict:
-        """Get UI configuration with feature flags"""
-        return {
+    @cached_property
+    def ui_config(self) -> Mapping:
+        """UI configuration with feature flags (read-only, built once)"""
+        return MappingProxyType({
             "use_real_llm": self.use_real_llm,
             "default_provider": self.default_provider,
             "rate_limit_enabled": self.rate_limit_enabled,
             "rate_limit_rps": self.rate_limit_rps,
             "allowlist": self.allowlist
-        }
+        })
+    
+    def get_openai_config(self) -> Mapping:
+        """Get OpenAI configuration"""
+        return self.openai_config
+    
+    def get_gemini_config(self) -> Mapping:
+        """Get Google Gemini configuration"""
+        return self.gemini_config
+    
+    def get_elevenlabs_config(self) -> Mapping:
+        """Get ElevenLabs configuration"""
+        return self.elevenlabs_config
+    
+    def get_rag_config(self) -> Mapping:
+        """Get RAG system configuration"""
+        return self.rag_config
+    
+    def get_api_config(self) -> Mapping:
+        """Get API server configuration"""
+        return self.api_config
+    
+    def get_ui_config(self) -> Mapping:
+        """Get UI configuration with feature flags"""
+        return self.ui_config
 
 # Global configuration instance
-config = Config()
+config: Final = Config.from_env()
 
 # Export commonly used settings
 OPENAI_API_KEY = config.openai_api_key
@@ -0,0 +1,107 @@
+# cython: language_level=3, boundscheck=False, wraparound=False
+"""
+Compiled chunking loops for NYC Services GPT RAG System
+
+C implementations of the chunker's hot loops. split_document mirrors
+chunker._split_document: one typed pass over the text records token offsets,
+then each overlapping window is sliced straight out of the original string.
+count_tokens counts whitespace-separated tokens without building the token
+list. Both give exactly the same results as the pure-Python versions, which
+chunker.py falls back to when this extension is not built.
+
+Build in place with:
+    cythonize -i src/ingest/_chunker.pyx
+"""
+
+from cpython.mem cimport PyMem_Malloc, PyMem_Free
+
+
+cdef extern from "Python.h":
+    bint Py_UNICODE_ISSPACE(Py_UCS4 ch)
+
+
+cpdef list split_document(str text, Py_ssize_t chunk_size, Py_ssize_t overlap):
+    """
+    Split one document's text into its overlapping chunks.
+
+    Args:
+        text: Document text
+        chunk_size: Maximum tokens per chunk
+        overlap: Number of overlapping tokens between chunks
+
+    Returns:
+        List of chunk strings
+    """
+    cdef Py_ssize_t length = len(text)
+    cdef Py_ssize_t *starts
+    cdef Py_ssize_t *ends
+    cdef Py_ssize_t n_tokens = 0
+    cdef Py_ssize_t i, start, end, step, n_windows
+    cdef bint in_token = False
+    cdef list chunks
+
+    # A text of length L has at most (L + 1) // 2 whitespace-separated tokens
+    starts = <Py_ssize_t *> PyMem_Malloc(((length + 1) // 2 + 1) * sizeof(Py_ssize_t))
+    ends = <Py_ssize_t *> PyMem_Malloc(((length + 1) // 2 + 1) * sizeof(Py_ssize_t))
+    if starts == NULL or ends == NULL:
+        PyMem_Free(starts)
+        PyMem_Free(ends)
+        raise MemoryError()
+
+    try:
+        for i in range(length):
+            if Py_UNICODE_ISSPACE(text[i]):
+                if in_token:
+                    ends[n_tokens] = i
+                    n_tokens += 1
+                    in_token = False
+            elif not in_token:
+                starts[n_tokens] = i
+                in_token = True
+        if in_token:
+            ends[n_tokens] = length
+            n_tokens += 1
+
+        if n_tokens <= chunk_size:
+            # Document fits in one chunk
+            return [text]
+
+        step = chunk_size - overlap
+        if step < 1:
+            step = 1
+        n_windows = (n_tokens - chunk_size + step - 1) // step + 1
+
+        chunks = [None] * n_windows
+        for i in range(n_windows):
+            start = i * step
+            end = start + chunk_size
+            if end > n_tokens:
+                end = n_tokens
+            chunks[i] = text[starts[start]:ends[end - 1]]
+        return chunks
+    finally:
+        PyMem_Free(starts)
+        PyMem_Free(ends)
+
+
+cpdef Py_ssize_t count_tokens(str text):
+    """
+    Count whitespace-separated tokens, i.e. len(text.split()) without the list.
+
+    Args:
+        text: Input text
+
+    Returns:
+        Number of tokens
+    """
+    cdef Py_ssize_t i
+    cdef Py_ssize_t count = 0
+    cdef bint in_token = False
+
+    for i in range(len(text)):
+        if Py_UNICODE_ISSPACE(text[i]):
+            in_token = False
+        elif not in_token:
+            count += 1
+            in_token = True
+    return count
@@ -6,10 +6,101 @@ This module handles chunking of NYC service documents for the RAG pipeline.
 Supports 100 synthetic queries across 5 NYC services (Unemployment, SNAP, Medicaid, Cash Assistance, Child Care).
 """
 
+import os
 import re
-from typing import List, Union, Iterator
+import mmap
+from array import array
+from bisect import bisect_left
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from typing import List, Tuple, Union, Iterator, Iterable
 from pathlib import Path
 
+import numpy as np
+
+try:
+    # Compiled chunking loops; build with `cythonize -i src/ingest/_chunker.pyx`
+    from ._chunker import split_document as _split_document_c, count_tokens as _count_tokens_c
+except ImportError:
+    _split_document_c = None
+    _count_tokens_c = None
+
+_TOKEN_PATTERN = re.compile(r'\S+')
+
+# Files at least this large are decoded from a memory map instead of read()
+MMAP_MIN_BYTES = 1 << 20
+
+# chunk_documents only fans out to worker processes above this much input text
+PARALLEL_MIN_CHARS = 1_000_000
+
+# compute_windows only loads numba for documents with at least this many
+# tokens; below it the pure-Python loop is faster than importing and
+# compiling the kernel
+JIT_MIN_TOKENS = 50_000_000
+
+# numba-compiled _compute_windows_kernel: None until first needed, False if numba is missing
+_compute_windows_jit = None
+
+def _compute_windows_py(n_tokens: int, chunk_size: int, overlap: int) -> List[Tuple[int, int]]:
+    """Pure-Python compute_windows, used below JIT_MIN_TOKENS or without numba."""
+    if n_tokens <= chunk_size:
+        return [(0, n_tokens)]
+    step = max(1, chunk_size - overlap)
+    n_windows = (n_tokens - chunk_size + step - 1) // step + 1
+    return [(start, min(start + chunk_size, n_tokens)) for start in range(0, n_windows * step, step)]
+
+def _compute_windows_kernel(n_tokens, chunk_size, overlap):
+    """compute_windows body compiled by numba; fills an int64 (n_windows, 2) array."""
+    if n_tokens <= chunk_size:
+        windows = np.empty((1, 2), dtype=np.int64)
+        windows[0, 0] = 0
+        windows[0, 1] = n_tokens
+        return windows
+    step = max(1, chunk_size - overlap)
+    n_windows = (n_tokens - chunk_size + step - 1) // step + 1
+    windows = np.empty((n_windows, 2), dtype=np.int64)
+    for i in range(n_windows):
+        start = i * step
+        windows[i, 0] = start
+        windows[i, 1] = min(start + chunk_size, n_tokens)
+    return windows
+
+def _get_compute_windows_jit():
+    """Import numba and compile the window kernel on first use, or None without numba."""
+    global _compute_windows_jit
+    if _compute_windows_jit is None:
+        try:
+            from numba import njit
+        except ImportError:
+            _compute_windows_jit = False
+        else:
+            # cache=True keeps the compiled kernel on disk, so worker processes skip the compile
+            _compute_windows_jit = njit(cache=True)(_compute_windows_kernel)
+    return _compute_windows_jit or None
+
+def compute_windows(n_tokens: int, chunk_size: int, overlap: int):
+    """
+    Compute the (start_token, end_token) bounds of every overlapping window.
+    
+    Windows advance by chunk_size - overlap tokens and the last one ends at
+    n_tokens. Documents of JIT_MIN_TOKENS or more use a numba-compiled kernel
+    when numba is installed (returning an int64 array of shape
+    (n_windows, 2)); otherwise returns a list of tuples.
+    
+    Args:
+        n_tokens: Number of tokens in the document
+        chunk_size: Maximum tokens per window
+        overlap: Number of tokens shared by consecutive windows
+        
+    Returns:
+        Sequence of (start, end) token index pairs, end exclusive
+    """
+    if n_tokens >= JIT_MIN_TOKENS:
+        kernel = _get_compute_windows_jit()
+        if kernel is not None:
+            return kernel(n_tokens, chunk_size, overlap)
+    return _compute_windows_py(n_tokens, chunk_size, overlap)
+
 def simple_tokenize(text: str) -> List[str]:
     """
     Simple tokenizer that splits text on whitespace.
@@ -23,16 +114,65 @@ def simple_tokenize(text: str) -> List[str]:
     """
     return text.split()
 
+def tokenize_with_offsets(text: str) -> Tuple[List[str], List[int], List[int]]:
+    """
+    Tokenize text on whitespace, recording where each token sits in the text.
+    
+    Lets chunkers slice windows straight out of the original string instead
+    of copying token sublists and re-joining them.
+    
+    Args:
+        text: Input text to tokenize
+        
+    Returns:
+        Tuple of (tokens, start offsets, end offsets)
+    """
+    tokens = []
+    starts = []
+    ends = []
+    for match in _TOKEN_PATTERN.finditer(text):
+        tokens.append(match.group())
+        starts.append(match.start())
+        ends.append(match.end())
+    return tokens, starts, ends
+
+def token_offsets(text: str) -> Tuple[array, array]:
+    """
+    Record where each whitespace token starts and ends, without the tokens.
+    
+    Offsets are packed into two array('q') buffers (8 bytes per token)
+    instead of a list of token strings, which is all chunking needs to
+    slice windows out of the original text.
+    
+    Args:
+        text: Input text
+        
+    Returns:
+        Tuple of (start offsets, end offsets)
+    """
+    starts = array('q')
+    ends = array('q')
+    for match in _TOKEN_PATTERN.finditer(text):
+        start, end = match.span()
+        starts.append(start)
+        ends.append(end)
+    return starts, ends
+
 def count_tokens(text: str) -> int:
     """
     Count tokens in text using simple whitespace splitting.
     
+    Runs in the compiled _chunker extension when it has been built, which
+    counts token starts in one pass without allocating the token list.
+    
     Args:
         text: Input text
         
     Returns:
         Number of tokens
     """
+    if _count_tokens_c is not None:
+        return _count_tokens_c(text)
     return len(simple_tokenize(text))
 
 def chunk_documents(docs: List[str], chunk_size: int = 1000, overlap: int = 200) -> List[str]:
@@ -50,44 +190,197 @@ def chunk_documents(docs: List[str], chunk_size: int = 1000, overlap: int = 200)
     Returns:
         List of text chunks, each containing up to chunk_size tokens
         
+    Each input is classified with is_file_path; callers that already know
+    what they hold should use chunk_texts or chunk_files instead, which
+    never touch the filesystem to guess. Inputs of at least one document per
+    CPU and more than PARALLEL_MIN_CHARS characters are chunked across a
+    process pool.
+        
     Example:
         >>> docs = ["How do I apply for unemployment benefits in NYC?", "What documents are required?"]
         >>> chunks = chunk_documents(docs, chunk_size=10, overlap=2)
         >>> len(chunks)  # Number of chunks
         >>> all(len(simple_tokenize(chunk)) <= 10 for chunk in chunks)  # No chunk exceeds limit
     """
-    all_chunks = []
+    workers = os.cpu_count() or 1
+    if workers > 1 and len(docs) >= workers and sum(len(doc) for doc in docs) > PARALLEL_MIN_CHARS:
+        # Large multi-document input: chunk contiguous shards in parallel, keeping order
+        shard_size = -(-len(docs) // workers)
+        shards = [docs[start:start + shard_size] for start in range(0, len(docs), shard_size)]
+        try:
+            with ProcessPoolExecutor(max_workers=len(shards)) as executor:
+                return [
+                    chunk
+                    for shard_chunks in executor.map(_chunk_shard, shards, repeat(chunk_size), repeat(overlap))
+                    for chunk in shard_chunks
+                ]
+        except Exception as e:
+            print(f"⚠️ Parallel chunking failed, chunking sequentially: {e}")
     
+    return _chunk_shard(docs, chunk_size, overlap)
+
+def _chunk_shard(docs: List[str], chunk_size: int, overlap: int) -> List[str]:
+    """Chunk documents serially in this process (one chunk_documents worker's share)."""
+    all_chunks = []
     for doc in docs:
-        # Handle file paths - only check if it looks like a reasonable file path
-        if isinstance(doc, str) and len(doc) < 255 and ('/' in doc or '.' in doc) and Path(doc).exists():
-            with open(doc, 'r', encoding='utf-8') as f:
-                text = f.read()
-        else:
-            text = str(doc)
-        
-        # Tokenize the document
-        tokens = simple_tokenize(text)
+        all_chunks.extend(_split_document(_read_document(doc), chunk_size, overlap))
+    return all_chunks
+
+def chunk_texts(texts: List[str], chunk_size: int = 1000, overlap: int = 200) -> List[str]:
+    """
+    Split raw text strings into overlapping chunks without probing the filesystem.
+    
+    Args:
+        texts: List of document texts
+        chunk_size: Maximum tokens per chunk (default: 1000)
+        overlap: Number of overlapping tokens between chunks (default: 200)
         
-        if len(tokens) <= chunk_size:
-            # Document fits in one chunk
-            all_chunks.append(text)
-        else:
-            # Split into overlapping chunks
-            start = 0
-            while start < len(tokens):
-                end = min(start + chunk_size, len(tokens))
-                chunk_tokens = tokens[start:end]
-                chunk_text = ' '.join(chunk_tokens)
-                all_chunks.append(chunk_text)
-                
-                # Move start position, accounting for overlap
-                start = end - overlap
-                if start >= len(tokens):
-                    break
+    Returns:
+        List of text chunks, each containing up to chunk_size tokens
+    """
+    all_chunks = []
+    for text in texts:
+        all_chunks.extend(_split_document(str(text), chunk_size, overlap))
+    return all_chunks
+
+def chunk_files(paths: List[Union[str, Path]], chunk_size: int = 1000, overlap: int = 200) -> List[str]:
+    """
+    Read UTF-8 text files and split them into overlapping chunks.
     
+    Args:
+        paths: List of file paths
+        chunk_size: Maximum tokens per chunk (default: 1000)
+        overlap: Number of overlapping tokens between chunks (default: 200)
+        
+    Returns:
+        List of text chunks, each containing up to chunk_size tokens
+    """
+    all_chunks = []
+    for path in paths:
+        all_chunks.extend(_split_document(read_text_file(path), chunk_size, overlap))
     return all_chunks
 
+def chunk_documents_with_index(docs: List[str], chunk_size: int = 1000, overlap: int = 200) -> List[Tuple[int, int, str]]:
+    """
+    Split documents into overlapping chunks, tagging each with its position.
+    
+    Same chunks as chunk_documents, in the same order, so callers that need
+    per-document metadata don't have to chunk each document a second time.
+    
+    Args:
+        docs: List of document strings or file paths to chunk
+        chunk_size: Maximum tokens per chunk (default: 1000)
+        overlap: Number of overlapping tokens between chunks (default: 200)
+        
+    Returns:
+        List of (doc_index, chunk_index, chunk_text) tuples
+    """
+    return list(iter_chunks_with_index(docs, chunk_size, overlap))
+
+def iter_chunks_with_index(docs: Iterable[str], chunk_size: int = 1000, overlap: int = 200) -> Iterator[Tuple[int, int, str]]:
+    """
+    Lazily split documents into overlapping chunks, tagging each with its position.
+    
+    Yields the same tuples as chunk_documents_with_index but only holds one
+    document at a time, so docs may itself be a generator.
+    
+    Args:
+        docs: Iterable of document strings or file paths to chunk
+        chunk_size: Maximum tokens per chunk (default: 1000)
+        overlap: Number of overlapping tokens between chunks (default: 200)
+        
+    Yields:
+        (doc_index, chunk_index, chunk_text) tuples
+    """
+    for doc_idx, doc in enumerate(docs):
+        for chunk_idx, chunk in enumerate(_split_document(_read_document(doc), chunk_size, overlap)):
+            yield (doc_idx, chunk_idx, chunk)
+
+def read_text_file(path: Union[str, Path]) -> str:
+    """
+    Read a UTF-8 text file.
+    
+    Files of MMAP_MIN_BYTES or more are decoded straight from a read-only
+    memory map, so the raw bytes live in the page cache rather than in a
+    second heap copy alongside the decoded string.
+    
+    Args:
+        path: File to read
+        
+    Returns:
+        File contents with newlines normalized to '\n', as in text mode
+    """
+    try:
+        large = os.path.getsize(path) >= MMAP_MIN_BYTES
+    except OSError:
+        # Let open() report the problem
+        large = False
+    
+    if not large:
+        with open(path, 'r', encoding='utf-8') as f:
+            return f.read()
+    
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        text = str(mapped, 'utf-8')
+    if '\r' in text:
+        text = text.replace('\r\n', '\n').replace('\r', '\n')
+    return text
+
+def is_file_path(doc: Union[str, Path]) -> bool:
+    """
+    Guess whether an input string names an existing file rather than holding text.
+    
+    Path objects are always treated as files, so callers can mark inputs
+    explicitly and skip the guess. For strings, cheap checks run first so
+    that multi-line or long text never costs a stat() call; only short,
+    path-like strings reach the filesystem.
+    """
+    if isinstance(doc, Path):
+        return True
+    return (
+        isinstance(doc, str)
+        and len(doc) < 255
+        and '\n' not in doc
+        and ('/' in doc or '.' in doc)
+        and Path(doc).exists()
+    )
+
+def _read_document(doc: str) -> str:
+    """Return a document's text, reading it from disk if doc is a file path."""
+    if is_file_path(doc):
+        return read_text_file(doc)
+    return str(doc)
+
+def _split_document(text: str, chunk_size: int, overlap: int) -> List[str]:
+    """
+    Split one document's text into its overlapping chunks.
+    
+    The window count is known before any text is sliced, so the result list
+    is allocated once at its final size and filled by index. Runs in the
+    compiled _chunker extension when it has been built.
+    """
+    if _split_document_c is not None:
+        return _split_document_c(text, chunk_size, overlap)
+    
+    # Locate every token once; windows are sliced from the text by offset
+    starts, ends = token_offsets(text)
+    n_tokens = len(starts)
+    
+    if n_tokens <= chunk_size:
+        # Document fits in one chunk
+        return [text]
+    
+    if overlap == 0:
+        # Non-overlapping windows: one comprehension, no window table needed
+        return [text[starts[start]:ends[min(start + chunk_size, n_tokens) - 1]] for start in range(0, n_tokens, chunk_size)]
+    
+    # Split into overlapping chunks, slicing each window out of the original text
+    windows = compute_windows(n_tokens, chunk_size, overlap)
+    chunks = [None] * len(windows)
+    for i, (start, end) in enumerate(windows):
+        chunks[i] = text[starts[start]:ends[end - 1]]
+    return chunks
+
 def chunk_text(text: str, chunk_size: int = 1000, overlap: int = 200) -> List[str]:
     """
     Split a single text string into chunks.
@@ -102,6 +395,37 @@ def chunk_text(text: str, chunk_size: int = 1000, overlap: int = 200) -> List[st
     """
     return chunk_documents([text], chunk_size, overlap)
 
+def chunk_text_stream(texts: Iterable[str], chunk_size: int = 1000, overlap: int = 200) -> Iterator[str]:
+    """
+    Chunk a stream of text pieces (e.g. PDF pages) with a sliding token window.
+    
+    Produces the same token windows as chunk_documents would for the
+    concatenated text, but only ever holds one window of tokens in memory,
+    so a document never has to be materialized as a single string.
+    
+    Args:
+        texts: Iterable of text pieces in document order
+        chunk_size: Maximum tokens per chunk (default: 1000)
+        overlap: Number of overlapping tokens between chunks (default: 200)
+        
+    Yields:
+        Text chunks one at a time
+    """
+    step = max(1, chunk_size - overlap)
+    window = []
+    
+    for text in texts:
+        for token in simple_tokenize(text):
+            window.append(token)
+            
+            # Only emit once a further token proves the window isn't the last chunk
+            if len(window) > chunk_size:
+                yield ' '.join(window[:chunk_size])
+                window = window[step:]
+    
+    if window:
+        yield ' '.join(window)
+
 def chunk_large_text_streaming(text: str, chunk_size: int = 500, overlap: int = 50) -> Iterator[str]:
     """
     Stream chunks from large text to avoid memory issues.
@@ -120,38 +444,38 @@ def chunk_large_text_streaming(text: str, chunk_size: int = 500, overlap: int =
     # Split text into lines first to preserve document structure
     lines = text.split('\n')
     current_chunk = []
-    current_tokens = 0
+    # cum_tokens[i] = tokens streamed through the end of current_chunk[i];
+    # base = tokens streamed before current_chunk[0]
+    cum_tokens = []
+    base = 0
+    total_tokens = 0
     
     for line in lines:
-        line_tokens = simple_tokenize(line)
-        line_token_count = len(line_tokens)
+        line_token_count = count_tokens(line)
         
         # If adding this line would exceed chunk size, yield current chunk
-        if current_tokens + line_token_count > chunk_size and current_chunk:
+        if total_tokens - base + line_token_count > chunk_size and current_chunk:
             chunk_text = '\n'.join(current_chunk)
             yield chunk_text
             
             # Start new chunk with overlap
-            if overlap > 0 and current_chunk:
-                # Keep last few lines for overlap
-                overlap_lines = []
-                overlap_tokens = 0
-                for line_back in reversed(current_chunk):
-                    line_back_tokens = simple_tokenize(line_back)
-                    if overlap_tokens + len(line_back_tokens) <= overlap:
-                        overlap_lines.insert(0, line_back)
-                        overlap_tokens += len(line_back_tokens)
-                    else:
-                        break
-                current_chunk = overlap_lines
-                current_tokens = overlap_tokens
+            if overlap > 0:
+                # Binary-search the shortest prefix to drop so the tail fits in the overlap
+                target = total_tokens - overlap
+                if target > base:
+                    drop = bisect_left(cum_tokens, target) + 1
+                    base = cum_tokens[drop - 1]
+                    del current_chunk[:drop]
+                    del cum_tokens[:drop]
             else:
-                current_chunk = []
-                current_tokens = 0
+                current_chunk.clear()
+                cum_tokens.clear()
+                base = total_tokens
         
         # Add current line to chunk
         current_chunk.append(line)
-        current_tokens += line_token_count
+        total_tokens += line_token_count
+        cum_tokens.append(total_tokens)
     
     # Yield final chunk if there's content
     if current_chunk:
@@ -9,32 +9,133 @@ with a target ≥ 90% success rate as specified in PROJECT_SPEC.md.
 import os
 import time
 import random
-from typing import List, Dict, Optional, Union
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
 from pathlib import Path
+from typing import Iterator, List, Dict, Optional, Tuple, Union
+import numpy as np
 import openai
 
-from .chunker import chunk_documents
+from .chunker import iter_chunks_with_index, is_file_path, read_text_file
+from .embedding_cache import EmbeddingCache
 from ..models.rate_limiter import rate_limiter
 from ..models.mock_fallback import mock_fallback
+from ..models.async_utils import run_blocking
+from ..models.circuit_breaker import openai_breaker
 from ..config import config
 
 
+NATIVE_EMBEDDING_DIM = 1536
+
+# OpenAI caps a single embeddings request at 2048 inputs and ~300K tokens
+MAX_BATCH_ITEMS = 2048
+MAX_BATCH_TOKENS = 250_000
+
+
+def _breaker_fallback(client, texts: List[str], *args, **kwargs) -> np.ndarray:
+    """Serve mock embeddings while the OpenAI circuit is open."""
+    return client.fit_dimensions(np.asarray(mock_fallback.get_mock_embeddings(texts), dtype=np.float32))
+
+
+def truncate_embeddings(embeddings: np.ndarray, dimensions: int) -> np.ndarray:
+    """
+    Truncate embeddings to their first dimensions components and renormalize.
+    
+    Matryoshka-trained models front-load information into the leading
+    components, so the shortened vectors keep most of their retrieval quality.
+    
+    Args:
+        embeddings: float32 array of shape (n, d)
+        dimensions: Target size, at most d
+        
+    Returns:
+        Unit-length float32 array of shape (n, dimensions)
+    """
+    truncated = np.array(embeddings[:, :dimensions], dtype=np.float32)
+    norms = np.linalg.norm(truncated, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    truncated /= norms
+    return truncated
+
+
+def quantize_embeddings(embeddings: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Quantize embeddings to int8 with a symmetric per-vector scale.
+    
+    Each row is divided by max(|row|) / 127 and rounded, so a 1536-d vector
+    takes 1.5KB instead of 6KB; dequantize_embeddings reverses it.
+    
+    Args:
+        embeddings: Array of shape (n, d)
+        
+    Returns:
+        Tuple of (int8 array of shape (n, d), float32 scales of shape (n,))
+    """
+    embeddings = np.asarray(embeddings, dtype=np.float32)
+    scales = np.abs(embeddings).max(axis=1) / 127.0
+    scales[scales == 0] = 1.0
+    quantized = np.round(embeddings / scales[:, None]).astype(np.int8)
+    return quantized, scales.astype(np.float32)
+
+
+def dequantize_embeddings(quantized: np.ndarray, scales: np.ndarray) -> np.ndarray:
+    """
+    Rebuild float32 embeddings from quantize_embeddings output.
+    
+    Args:
+        quantized: int8 array of shape (n, d)
+        scales: Per-vector scales of shape (n,)
+        
+    Returns:
+        float32 array of shape (n, d)
+    """
+    return np.asarray(quantized, dtype=np.float32) * np.asarray(scales, dtype=np.float32)[:, None]
+
+
 class EmbeddingClient:
     """
     OpenAI embedding client for generating vector embeddings.
     Uses OpenAI's text-embedding-ada-002 model for high-quality semantic embeddings.
     """
     
-    def __init__(self, api_key: Optional[str] = None, model: str = "text-embedding-ada-002"):
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        model: str = "text-embedding-ada-002",
+        max_concurrency: int = 5,
+        cache_enabled: bool = True,
+        dimensions: Optional[int] = None,
+        max_batch_items: int = MAX_BATCH_ITEMS,
+        max_batch_tokens: int = MAX_BATCH_TOKENS
+    ):
         """
         Initialize the embedding client.
         
         Args:
             api_key: OpenAI API key (defaults to config)
             model: Embedding model to use (default: text-embedding-ada-002)
+            max_concurrency: Maximum in-flight embedding requests for aget_embeddings
+            cache_enabled: Reuse embeddings of previously seen chunks from disk
+            dimensions: Truncated embedding size (defaults to config; None keeps the native 1536)
+            max_batch_items: Maximum texts sent in one embeddings request
+            max_batch_tokens: Maximum estimated tokens sent in one embeddings request
         """
         self.api_key = api_key or config.openai_api_key
         self.model = model
+        self.dimensions = dimensions or config.embedding_dimensions
+        # text-embedding-3 models truncate server-side; others are truncated here
+        self._api_dimensions = self.dimensions if self.model.startswith("text-embedding-3") else None
+        self._cache_namespace = f"{self.model}@{self.dimensions}" if self.dimensions else self.model
+        self.max_concurrency = max_concurrency
+        self.max_batch_items = max_batch_items
+        self.max_batch_tokens = max_batch_tokens
+        self.cache = EmbeddingCache() if cache_enabled else None
+        # Every mock embedding is this one vector, built once
+        self._mock_embedding = self.fit_dimensions(np.full((1, NATIVE_EMBEDDING_DIM), 0.1, dtype=np.float32))[0]
+        self._mock_embedding.flags.writeable = False
+        self._semaphore = None
+        self._semaphore_loop = None
         
         if self.api_key:
             openai.api_key = self.api_key
@@ -42,42 +143,193 @@ class EmbeddingClient:
         else:
             print("⚠️ No OpenAI API key found. Using mock embeddings for testing.")
     
-    def get_embeddings(self, texts: List[str]) -> List[List[float]]:
+    @openai_breaker.protect(fallback=_breaker_fallback)
+    def get_embeddings(self, texts: List[str]) -> np.ndarray:
         """
         Generate embeddings for a list of texts using OpenAI's embedding model.
         
+        Embeddings are returned as one float32 array so they take ~6KB per
+        vector instead of a Python list of floats; rows can be sliced as views
+        and passed straight to ChromaDB.
+        
         Args:
             texts: List of text strings to embed
             
         Returns:
-            List of embedding vectors (1536 dimensions for text-embedding-ada-002)
+            float32 array of shape (len(texts), embedding_dim); mock embeddings
+            (no API key) are a read-only view repeating one shared vector
         """
         if not self.api_key:
             # Return mock embeddings for testing/demo purposes
             print("⚠️ Using mock embeddings (no API key configured)")
-            return [[0.1] * 1536 for _ in texts]
+            return np.broadcast_to(self._mock_embedding, (len(texts), self.embedding_dim))
+        
+        if self.cache is None:
+            return self.fit_dimensions(self._get_embeddings_batched(texts))
         
-        return self._get_embeddings_with_retry(texts)
+        return self.fit_dimensions(self._get_embeddings_cached(texts))
+    
+    @property
+    def embedding_dim(self) -> int:
+        """Size of the vectors this client returns."""
+        return self.dimensions or NATIVE_EMBEDDING_DIM
+    
+    def fit_dimensions(self, embeddings: np.ndarray) -> np.ndarray:
+        """Truncate embeddings to the configured dimensions if they are longer."""
+        if self.dimensions and embeddings.ndim == 2 and embeddings.shape[1] > self.dimensions:
+            return truncate_embeddings(embeddings, self.dimensions)
+        return embeddings
     
-    def _get_embeddings_with_retry(self, texts: List[str]) -> List[List[float]]:
+    async def aget_embeddings(self, texts: List[str], batch_size: Optional[int] = None) -> np.ndarray:
+        """
+        Generate embeddings concurrently, one API call per batch of texts.
+        
+        Each batch runs get_embeddings in the shared blocking-I/O thread pool,
+        so the event loop is never stalled and rate limiting, caching, retries
+        and mock fallback behave exactly as in the sync path.
+        At most max_concurrency batches are in flight at once, shared across
+        every concurrent caller on the same event loop.
+        
+        Args:
+            texts: List of text strings to embed
+            batch_size: Number of texts sent per API call (defaults to
+                request-sized batches bounded by max_batch_items/max_batch_tokens)
+            
+        Returns:
+            float32 array of embeddings, one row per text in input order
+        """
+        if not texts:
+            return np.empty((0, self.embedding_dim), dtype=np.float32)
+        
+        semaphore = self._get_semaphore()
+        
+        async def embed_batch(batch: List[str]) -> np.ndarray:
+            async with semaphore:
+                return await run_blocking(self.get_embeddings, batch)
+        
+        if batch_size is None:
+            batches = [batch for batch, _ in self._split_batches(texts)]
+        else:
+            batches = [texts[i:i + batch_size] for i in range(0, len(texts), batch_size)]
+        results = await asyncio.gather(*[embed_batch(batch) for batch in batches])
+        
+        return np.vstack(results).astype(np.float32, copy=False)
+    
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        """Return the concurrency semaphore bound to the running event loop."""
+        loop = asyncio.get_running_loop()
+        if self._semaphore is None or self._semaphore_loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._semaphore_loop = loop
+        return self._semaphore
+    
+    def _get_embeddings_cached(self, texts: List[str]) -> np.ndarray:
+        """
+        Generate embeddings, only calling the API for chunks not already on disk.
+        
+        Args:
+            texts: List of text strings to embed
+            
+        Returns:
+            float32 array of embedding vectors in input order
+        """
+        cached = self.cache.get_many(self._cache_namespace, texts)
+        misses = [i for i in range(len(texts)) if i not in cached]
+        
+        if not misses:
+            print(f"✅ Retrieved {len(texts)} embeddings from embedding cache")
+            return np.vstack([cached[i] for i in range(len(texts))])
+        
+        miss_texts = [texts[i] for i in misses]
+        fresh = self._get_embeddings_batched(miss_texts)
+        
+        # Never persist mock vectors served while the API was failing
+        if not mock_fallback.fallback_active:
+            self.cache.set_many(self._cache_namespace, miss_texts, fresh)
+        
+        if not cached:
+            return fresh
+        
+        print(f"✅ Reused {len(cached)}/{len(texts)} embeddings from embedding cache")
+        embeddings = np.empty((len(texts), fresh.shape[1]), dtype=np.float32)
+        for i, embedding in cached.items():
+            embeddings[i] = embedding
+        embeddings[misses] = fresh
+        return embeddings
+    
+    def _split_batches(self, texts: List[str]) -> List[Tuple[List[str], int]]:
+        """
+        Partition texts into request-sized sub-batches.
+        
+        A sub-batch is closed once adding the next text would exceed
+        max_batch_tokens or it already holds max_batch_items texts.
+        
+        Args:
+            texts: List of text strings to embed
+            
+        Returns:
+            List of (texts, estimated_tokens) pairs in input order
+        """
+        batches = []
+        batch = []
+        batch_tokens = 0
+        
+        for text, tokens in zip(texts, rate_limiter.estimate_tokens_batch(texts, self.model)):
+            if batch and (batch_tokens + tokens > self.max_batch_tokens or len(batch) >= self.max_batch_items):
+                batches.append((batch, batch_tokens))
+                batch = []
+                batch_tokens = 0
+            batch.append(text)
+            batch_tokens += tokens
+        
+        if batch:
+            batches.append((batch, batch_tokens))
+        return batches
+    
+    def _get_embeddings_batched(self, texts: List[str]) -> np.ndarray:
+        """
+        Generate embeddings in request-sized sub-batches, sent concurrently.
+        
+        Inputs that fit in one request go straight through; larger ones are
+        split by _split_batches and up to max_concurrency requests run at once.
+        
+        Args:
+            texts: List of text strings to embed
+            
+        Returns:
+            float32 array of embedding vectors in input order
+        """
+        batches = self._split_batches(texts)
+        if len(batches) <= 1:
+            return self._get_embeddings_with_retry(texts, batches[0][1] if batches else 0)
+        
+        print(f"🔧 Embedding {len(texts)} texts in {len(batches)} sub-batches")
+        with ThreadPoolExecutor(max_workers=min(self.max_concurrency, len(batches))) as executor:
+            results = list(executor.map(lambda batch: self._get_embeddings_with_retry(*batch), batches))
+        
+        return np.vstack(results).astype(np.float32, copy=False)
+    
+    def _get_embeddings_with_retry(self, texts: List[str], estimated_tokens: Optional[int] = None) -> np.ndarray:
         """
         Generate embeddings with comprehensive rate limiting and caching.
         
         Args:
             texts: List of text strings to embed
+            estimated_tokens: Precomputed token estimate for texts, if known
             
         Returns:
-            List of embedding vectors
+            float32 array of embedding vectors
         """
         # Check cache first (development only)
-        cache_key = rate_limiter.get_cache_key(self.model, texts)
+        cache_key = rate_limiter.get_cache_key(self._cache_namespace, texts)
         cached_response = rate_limiter.get_cached_response(cache_key)
         if cached_response and "embeddings" in cached_response:
             print(f"✅ Retrieved {len(texts)} embeddings from cache")
             return cached_response["embeddings"]
         
         # Estimate token usage for rate limiting
-        estimated_tokens = sum(rate_limiter.estimate_tokens(text) for text in texts)
+        if estimated_tokens is None:
+            estimated_tokens = sum(rate_limiter.estimate_tokens_batch(texts, self.model))
         
         # Wait for capacity if needed
         rate_limiter.wait_for_capacity(self.model, estimated_tokens)
@@ -85,12 +337,13 @@ class EmbeddingClient:
         # Attempt API call with exponential backoff
         for attempt in range(rate_limiter.max_retries + 1):
             try:
-                response = openai.embeddings.create(
-                    input=texts,
-                    model=self.model
-                )
+                request = {"input": texts, "model": self.model}
+                if self._api_dimensions:
+                    request["dimensions"] = self._api_dimensions
+                response = openai.embeddings.create(**request)
+                openai_breaker.record_success()
                 
-                embeddings = [embedding.embedding for embedding in response.data]
+                embeddings = np.asarray([embedding.embedding for embedding in response.data], dtype=np.float32)
                 
                 # Record usage for rate limiting
                 input_tokens = response.usage.total_tokens if response.usage else estimated_tokens
@@ -105,7 +358,8 @@ class EmbeddingClient:
                 return embeddings
                 
             except openai.RateLimitError as e:
-                if attempt < rate_limiter.max_retries:
+                openai_breaker.record_failure()
+                if attempt < rate_limiter.max_retries and not openai_breaker.is_open:
                     # Use rate limiter's exponential backoff
                     wait_time = rate_limiter.exponential_backoff(attempt + 1)
                     print(f"⚠️ Rate limit hit, retrying in {wait_time:.1f}s (attempt {attempt + 1}/{rate_limiter.max_retries})")
@@ -114,24 +368,26 @@ class EmbeddingClient:
                 else:
                     print(f"❌ Rate limit exceeded after {rate_limiter.max_retries} retries")
                     mock_fallback.activate_fallback("rate_limit_exceeded")
-                    return mock_fallback.get_mock_embeddings(texts)
+                    return np.asarray(mock_fallback.get_mock_embeddings(texts), dtype=np.float32)
                     
             except Exception as e:
                 print(f"❌ Failed to generate embeddings: {e}")
-                if attempt < rate_limiter.max_retries:
+                if isinstance(e, openai.APITimeoutError):
+                    openai_breaker.record_failure()
+                if attempt < rate_limiter.max_retries and not openai_breaker.is_open:
                     wait_time = rate_limiter.exponential_backoff(attempt + 1)
                     print(f"⚠️ Retrying in {wait_time:.1f}s (attempt {attempt + 1}/{rate_limiter.max_retries})")
                     time.sleep(wait_time)
                     continue
                 else:
                     mock_fallback.activate_fallback("api_error")
-                    return mock_fallback.get_mock_embeddings(texts)
+                    return np.asarray(mock_fallback.get_mock_embeddings(texts), dtype=np.float32)
         
         # Final fallback
         mock_fallback.activate_fallback("unknown_error")
-        return mock_fallback.get_mock_embeddings(texts)
+        return np.asarray(mock_fallback.get_mock_embeddings(texts), dtype=np.float32)
     
-    def get_embedding(self, text: str) -> List[float]:
+    def get_embedding(self, text: str) -> np.ndarray:
         """
         Generate embedding for a single text.
         
@@ -139,12 +395,12 @@ class EmbeddingClient:
             text: Text string to embed
             
         Returns:
-            Embedding vector (1536 dimensions)
+            float32 embedding vector (embedding_dim dimensions)
         """
         embeddings = self.get_embeddings([text])
-        return embeddings[0] if embeddings else [0.1] * 1536
+        return embeddings[0] if len(embeddings) else np.full(self.embedding_dim, 0.1, dtype=np.float32)
     
-    def validate_embedding(self, embedding: List[float]) -> bool:
+    def validate_embedding(self, embedding: Union[np.ndarray, List[float]]) -> bool:
         """
         Validate that an embedding has the correct format.
         
@@ -154,11 +410,14 @@ class EmbeddingClient:
         Returns:
             True if embedding is valid, False otherwise
         """
+        if isinstance(embedding, np.ndarray):
+            return embedding.shape == (self.embedding_dim,) and np.issubdtype(embedding.dtype, np.floating)
+        
         if not isinstance(embedding, list):
             return False
         
-        # Check for correct dimensions (1536 for text-embedding-ada-002)
-        if len(embedding) != 1536:
+        # Check for correct dimensions (1536 for text-embedding-ada-002 unless truncated)
+        if len(embedding) != self.embedding_dim:
             return False
         
         # Check that all values are floats
@@ -166,13 +425,167 @@ class EmbeddingClient:
             return False
         
         return True
+    
+    def validate_embeddings(self, embeddings: np.ndarray) -> np.ndarray:
+        """
+        Validate a matrix of embeddings in one vectorized pass.
+        
+        Args:
+            embeddings: Array of shape (n, embedding_dim)
+            
+        Returns:
+            Boolean mask, True for each row that is a valid embedding
+        """
+        if embeddings.ndim != 2 or embeddings.shape[1] != self.embedding_dim or not np.issubdtype(embeddings.dtype, np.floating):
+            return np.zeros(len(embeddings), dtype=bool)
+        return np.isfinite(embeddings).all(axis=1)
+
+
+def iter_records(
+    paths: List[str],
+    chunk_size: int = 1000,
+    overlap: int = 200,
+    embedding_client: Optional[EmbeddingClient] = None,
+    pre_chunked: bool = False,
+    batch_size: int = 256,
+    embedding_dtype: Optional[str] = None,
+    inputs: str = "auto"
+) -> Iterator[Dict]:
+    """
+    Stream vector-store records for documents, one embedding batch at a time.
+    
+    Files are read, chunked and embedded lazily: only batch_size chunks and
+    their embeddings are held at once, so peak memory no longer grows with
+    the size of the corpus. Records are the same as process_documents returns.
+    
+    Args:
+        paths: List of file paths or raw text strings to process
+        chunk_size: Maximum tokens per chunk (default: 1000)
+        overlap: Overlapping tokens between chunks (default: 200)
+        embedding_client: Optional embedding client (defaults to OpenAI)
+        pre_chunked: Inputs are already final chunk texts; skip file reading and re-chunking
+        batch_size: Chunks embedded per request (default: 256)
+        embedding_dtype: Store record embeddings as "float16", or as "int8" with
+            a per-record "embedding_scale" (default: float32 as returned)
+        inputs: "texts" or "files" to declare what paths holds; "auto" (default)
+            treats Path objects as files and guesses for strings with
+            is_file_path, which may stat() each one
+        
+    Yields:
+        Records with text, embedding and metadata, in document order
+    """
+    if embedding_dtype not in (None, "float16", "int8"):
+        raise ValueError(f"Unsupported embedding_dtype: {embedding_dtype}")
+    if inputs not in ("auto", "texts", "files"):
+        raise ValueError(f"Unsupported inputs: {inputs}")
+    
+    if embedding_client is None:
+        embedding_client = EmbeddingClient()
+    
+    # Step 1: Classify each input as a file path or raw text; doc_idx indexes sources
+    if pre_chunked or inputs == "texts":
+        file_flags = [False] * len(paths)
+    elif inputs == "files":
+        file_flags = [True] * len(paths)
+    else:
+        file_flags = [is_file_path(path) for path in paths]
+    sources = [str(path) if is_file else "raw_text" for path, is_file in zip(paths, file_flags)]
+    
+    def read_documents() -> Iterator[str]:
+        """Read each file lazily; unreadable files become empty documents."""
+        for path, is_file in zip(paths, file_flags):
+            if not is_file:
+                yield str(path)
+                continue
+            try:
+                content = read_text_file(path)
+            except Exception as e:
+                print(f"Warning: Failed to read file {path}: {e}")
+                content = ""
+            yield content
+    
+    # Step 2: Chunk every document once, keeping each chunk's (doc_idx, chunk_idx) position
+    if pre_chunked:
+        indexed_chunks = ((doc_idx, 0, document) for doc_idx, document in enumerate(read_documents()))
+    else:
+        indexed_chunks = iter_chunks_with_index(read_documents(), chunk_size=chunk_size, overlap=overlap)
+    indexed_chunks = (entry for entry in indexed_chunks if entry[2].strip())
+    
+    total_chunks = 0
+    total_records = 0
+    
+    while True:
+        batch = list(islice(indexed_chunks, batch_size))
+        if not batch:
+            break
+        
+        # Step 3: Generate embeddings for this batch, once per distinct chunk text
+        unique = {}
+        indices = [unique.setdefault(chunk, len(unique)) for _, _, chunk in batch]
+        print(f"🔧 Generating embeddings for {len(unique)} chunks ({len(batch) - len(unique)} duplicates reused)...")
+        embeddings = embedding_client.get_embeddings(list(unique))
+        if len(unique) < len(batch):
+            embeddings = embeddings[indices] if isinstance(embeddings, np.ndarray) else [embeddings[j] for j in indices]
+        total_chunks += len(batch)
+        
+        if isinstance(embeddings, np.ndarray) and embeddings.ndim == 2:
+            valid_mask = embedding_client.validate_embeddings(embeddings)
+        else:
+            valid_mask = [embedding_client.validate_embedding(embedding) for embedding in embeddings]
+        valid = []
+        for i, ((doc_idx, chunk_idx, _), is_valid) in enumerate(zip(batch, valid_mask)):
+            if is_valid:
+                valid.append(i)
+            else:
+                print(f"⚠️ Invalid embedding for chunk {chunk_idx} of {sources[doc_idx]}, skipping")
+        
+        # Optionally shrink the stored vectors (validated at full precision above)
+        scales = None
+        if valid and embedding_dtype == "float16":
+            embeddings = np.asarray([embeddings[i] for i in valid], dtype=np.float16)
+        elif valid and embedding_dtype == "int8":
+            embeddings, scales = quantize_embeddings([embeddings[i] for i in valid])
+        elif isinstance(embeddings, np.ndarray):
+            embeddings = embeddings[valid]
+        else:
+            embeddings = [embeddings[i] for i in valid]
+        
+        # Step 4: Create structured records; embeddings line up with chunks by construction
+        for embedding_idx, i in enumerate(valid):
+            doc_idx, chunk_idx, chunk = batch[i]
+            record = {
+                "text": chunk,
+                "embedding": embeddings[embedding_idx],
+                "metadata": {
+                    "source": sources[doc_idx],
+                    "chunk_index": chunk_idx,
+                    "token_count": len(chunk.split()),
+                    "chunk_size": chunk_size,
+                    "overlap": overlap
+                }
+            }
+            if scales is not None:
+                record["embedding_scale"] = float(scales[embedding_idx])
+            
+            total_records += 1
+            yield record
+    
+    if total_records != total_chunks:
+        print(f"⚠️ Only {total_records}/{total_chunks} embeddings are valid")
+    
+    if total_chunks:
+        print(f"✅ Processed {total_records} documents with real embeddings")
 
 
 def process_documents(
     paths: List[str], 
     chunk_size: int = 1000, 
     overlap: int = 200,
-    embedding_client: Optional[EmbeddingClient] = None
+    embedding_client: Optional[EmbeddingClient] = None,
+    pre_chunked: bool = False,
+    batch_size: int = 256,
+    embedding_dtype: Optional[str] = None,
+    inputs: str = "auto"
 ) -> List[Dict]:
     """
     Process documents for the NYC Services GPT RAG system.
@@ -191,12 +604,16 @@ def process_documents(
         chunk_size: Maximum tokens per chunk (default: 1000)
         overlap: Overlapping tokens between chunks (default: 200)
         embedding_client: Optional embedding client (defaults to OpenAI)
+        pre_chunked: Inputs are already final chunk texts; skip file reading and re-chunking
+        batch_size: Chunks embedded per request while streaming (see iter_records)
+        embedding_dtype: Store embeddings as "float16" or "int8" (see iter_records)
+        inputs: Declare paths as "texts" or "files" to skip per-input filesystem probes
         
     Returns:
         List of records with structure:
         {
             "text": str,           # The chunk text content
-            "embedding": List[float],  # Vector embedding (1536 dimensions)
+            "embedding": np.ndarray,  # float32 vector embedding (1536 dimensions)
             "metadata": {         # Additional metadata
                 "source": str,    # Original file path or "raw_text"
                 "chunk_index": int,  # Position in document
@@ -213,94 +630,100 @@ def process_documents(
         >>> all("text" in record and "embedding" in record for record in records)
         True
     """
-    if embedding_client is None:
-        embedding_client = EmbeddingClient()
-    
-    # Step 1: Read each file path or use raw text input
-    documents = []
-    source_mapping = {}
-    
-    for i, path in enumerate(paths):
-        if isinstance(path, str) and len(path) < 255 and ('/' in path or '.' in path) and Path(path).exists():
-            # It's a file path
-            try:
-                with open(path, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                documents.append(content)
-                source_mapping[i] = str(path)
-            except Exception as e:
-                print(f"Warning: Failed to read file {path}: {e}")
-                continue
-        else:
-            # It's raw text
-            documents.append(str(path))
-            source_mapping[i] = "raw_text"
-    
-    # Step 2: Call chunk_documents for tokenized splitting
-    chunks = chunk_documents(documents, chunk_size=chunk_size, overlap=overlap)
+    return list(iter_records(
+        paths,
+        chunk_size=chunk_size,
+        overlap=overlap,
+        embedding_client=embedding_client,
+        pre_chunked=pre_chunked,
+        batch_size=batch_size,
+        embedding_dtype=embedding_dtype,
+        inputs=inputs
+    ))
+
+
+def process_documents_to_matrix(
+    paths: List[str],
+    chunk_size: int = 1000,
+    overlap: int = 200,
+    embedding_client: Optional[EmbeddingClient] = None,
+    memmap_path: Optional[Union[str, Path]] = None,
+    **kwargs
+) -> Tuple[List[Dict], np.ndarray]:
+    """
+    Process documents into embedding-free records plus one embedding matrix.
     
-    if not chunks:
-        return []
+    Row i of the matrix is the embedding of records[i]. Rows are written in
+    place as each batch comes back from the API and L2-normalized once at
+    the end, so cosine similarity against the corpus is a single
+    matrix @ query product. With memmap_path the matrix is an np.memmap on
+    disk, so a large corpus doesn't have to fit in RAM.
     
-    # Step 3: Generate embeddings for all chunks
-    chunk_texts = [chunk for chunk in chunks if chunk.strip()]
-    if not chunk_texts:
-        return []
+    Args:
+        paths: List of file paths or raw text strings to process
+        chunk_size: Maximum tokens per chunk (default: 1000)
+        overlap: Overlapping tokens between chunks (default: 200)
+        embedding_client: Optional embedding client (defaults to OpenAI)
+        memmap_path: File backing the matrix (default: in-memory array)
+        **kwargs: Further iter_records options (pre_chunked, batch_size, inputs)
+        
+    Returns:
+        Tuple of (records without "embedding", float32 matrix of shape (n, d))
+    """
+    records = []
+    matrix = None
     
-    print(f"🔧 Generating embeddings for {len(chunk_texts)} chunks...")
-    embeddings = embedding_client.get_embeddings(chunk_texts)
+    def allocate(rows: int, dim: int) -> np.ndarray:
+        """Allocate (or grow) the matrix to hold rows vectors."""
+        if memmap_path is None:
+            grown = np.empty((rows, dim), dtype=np.float32)
+            if matrix is not None:
+                grown[:len(records)] = matrix[:len(records)]
+            return grown
+        if matrix is None:
+            return np.memmap(memmap_path, dtype=np.float32, mode="w+", shape=(rows, dim))
+        matrix.flush()
+        with open(memmap_path, "r+b") as f:
+            f.truncate(rows * dim * 4)
+        return np.memmap(memmap_path, dtype=np.float32, mode="r+", shape=(rows, dim))
     
-    # Validate embeddings
-    valid_embeddings = []
-    for i, embedding in enumerate(embeddings):
-        if embedding_client.validate_embedding(embedding):
-            valid_embeddings.append(embedding)
-        else:
-            print(f"⚠️ Invalid embedding for chunk {i}, skipping")
+    for record in iter_records(paths, chunk_size, overlap, embedding_client, **kwargs):
+        embedding = record.pop("embedding")
+        if matrix is None or len(records) == len(matrix):
+            matrix = allocate(max(1024, 2 * len(records)), len(embedding))
+        matrix[len(records)] = embedding
+        records.append(record)
     
-    if len(valid_embeddings) != len(chunk_texts):
-        print(f"⚠️ Only {len(valid_embeddings)}/{len(chunk_texts)} embeddings are valid")
+    if matrix is None:
+        return records, np.empty((0, NATIVE_EMBEDDING_DIM), dtype=np.float32)
     
-    # Step 4: Create structured records
-    records = []
-    chunk_counter = 0
+    # Trim the spare capacity left by doubling
+    if memmap_path is None:
+        matrix.resize((len(records), matrix.shape[1]), refcheck=False)
+    else:
+        matrix = allocate(len(records), matrix.shape[1])
     
-    for doc_idx, document in enumerate(documents):
-        doc_chunks = chunk_documents([document], chunk_size=chunk_size, overlap=overlap)
-        
-        for chunk_idx, chunk in enumerate(doc_chunks):
-            if chunk.strip() and chunk_counter < len(valid_embeddings):
-                # Count tokens in chunk
-                token_count = len(chunk.split())
-                
-                record = {
-                    "text": chunk,
-                    "embedding": valid_embeddings[chunk_counter],
-                    "metadata": {
-                        "source": source_mapping.get(doc_idx, "unknown"),
-                        "chunk_index": chunk_idx,
-                        "token_count": token_count,
-                        "chunk_size": chunk_size,
-                        "overlap": overlap
-                    }
-                }
-                records.append(record)
-                chunk_counter += 1
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    matrix /= norms
+    if memmap_path is not None:
+        matrix.flush()
     
-    print(f"✅ Processed {len(records)} documents with real embeddings")
-    return records
+    return records, matrix
 
 
-def validate_records(records: List[Dict]) -> bool:
+def validate_records(records: List[Dict], dimensions: Optional[int] = None) -> bool:
     """
     Validate that all records have the required structure for the RAG system.
     
     Args:
         records: List of document records to validate
+        dimensions: Expected embedding size (defaults to config, else 1536)
         
     Returns:
         True if all records are valid, False otherwise
     """
+    dimensions = dimensions or config.embedding_dimensions or NATIVE_EMBEDDING_DIM
     required_fields = ["text", "embedding", "metadata"]
     required_metadata_fields = ["source", "chunk_index", "token_count"]
     
@@ -316,13 +739,13 @@ def validate_records(records: List[Dict]) -> bool:
         # Check data types
         if not isinstance(record["text"], str):
             return False
-        if not isinstance(record["embedding"], list):
+        if not isinstance(record["embedding"], (list, np.ndarray)):
             return False
         if not isinstance(record["metadata"], dict):
             return False
         
         # Validate embedding dimensions
-        if len(record["embedding"]) != 1536:
+        if len(record["embedding"]) != dimensions:
             return False
     
     return True
@@ -0,0 +1,130 @@
+"""
+Disk Cache for Chunk Embeddings in NYC Services GPT
+
+Persists embedding vectors keyed by a hash of the model and chunk text, so
+re-running ingestion after adding a PDF only embeds chunks that are new.
+Boilerplate repeated across NYC service forms (headers, footers, office
+addresses) is embedded once and reused everywhere.
+
+Vectors are stored as float16, half the size of float32, which is well
+within the precision needed for cosine similarity retrieval. The cache is
+bounded: once it holds more than max_entries vectors, the least recently
+used ones are evicted.
+"""
+
+import os
+import sqlite3
+import hashlib
+import time
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+
+
+class EmbeddingCache:
+    """
+    SQLite-backed content-hash -> embedding LRU cache.
+    
+    Safe to share across threads; all access goes through a single
+    connection guarded by a lock.
+    """
+    
+    def __init__(self, cache_dir: Optional[str] = None, max_entries: Optional[int] = None):
+        """
+        Initialize the embedding cache.
+        
+        Args:
+            cache_dir: Directory for the cache database (defaults to EMBEDDING_CACHE_DIR or .cache/embeddings)
+            max_entries: Vectors kept before LRU eviction (defaults to EMBEDDING_CACHE_MAX_ENTRIES or 500000)
+        """
+        self.cache_dir = Path(cache_dir or os.getenv("EMBEDDING_CACHE_DIR", ".cache/embeddings"))
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_entries = max_entries or int(os.getenv("EMBEDDING_CACHE_MAX_ENTRIES", "500000"))
+        
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.cache_dir / "embeddings.sqlite"), check_same_thread=False)
+        self._conn.execute("CREATE TABLE IF NOT EXISTS cache (h TEXT PRIMARY KEY, v BLOB NOT NULL, t REAL NOT NULL DEFAULT 0)")
+        # Caches created before LRU eviction have no last-used column
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(cache)")}
+        if "t" not in columns:
+            self._conn.execute("ALTER TABLE cache ADD COLUMN t REAL NOT NULL DEFAULT 0")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS cache_t ON cache (t)")
+        self._conn.commit()
+    
+    @staticmethod
+    def make_key(model: str, text: str) -> str:
+        """Build the content-hash key for a chunk embedded with model."""
+        return hashlib.blake2b(f"{model}\0{text}".encode("utf-8"), digest_size=16).hexdigest()
+    
+    def get_many(self, model: str, texts: List[str]) -> Dict[int, np.ndarray]:
+        """
+        Look up cached embeddings for texts.
+        
+        Args:
+            model: Embedding model name
+            texts: Chunk texts
+        
+        Returns:
+            Dictionary mapping the index of each cached text to its float32 vector
+        """
+        keys = [self.make_key(model, text) for text in texts]
+        found = {}
+        
+        with self._lock:
+            # Stay under SQLite's bound-parameter limit
+            for start in range(0, len(keys), 500):
+                batch = keys[start:start + 500]
+                rows = self._conn.execute(
+                    f"SELECT h, v FROM cache WHERE h IN ({','.join('?' * len(batch))})", batch
+                ).fetchall()
+                found.update(rows)
+            
+            if found:
+                # Mark hits as recently used so eviction spares them
+                now = time.time()
+                self._conn.executemany("UPDATE cache SET t = ? WHERE h = ?", [(now, key) for key in found])
+                self._conn.commit()
+        
+        return {
+            i: np.frombuffer(found[key], dtype=np.float16).astype(np.float32)
+            for i, key in enumerate(keys)
+            if key in found
+        }
+    
+    def set_many(self, model: str, texts: List[str], embeddings: np.ndarray):
+        """
+        Store embeddings for texts.
+        
+        Args:
+            model: Embedding model name
+            texts: Chunk texts
+            embeddings: Vectors aligned with texts
+        """
+        now = time.time()
+        rows = [
+            (self.make_key(model, text), np.asarray(embedding, dtype=np.float16).tobytes(), now)
+            for text, embedding in zip(texts, embeddings)
+        ]
+        
+        with self._lock:
+            self._conn.executemany("INSERT OR REPLACE INTO cache (h, v, t) VALUES (?, ?, ?)", rows)
+            
+            # Evict the least recently used vectors beyond max_entries
+            excess = self._conn.execute("SELECT COUNT(*) FROM cache").fetchone()[0] - self.max_entries
+            if excess > 0:
+                self._conn.execute(
+                    "DELETE FROM cache WHERE h IN (SELECT h FROM cache ORDER BY t LIMIT ?)", (excess,)
+                )
+            self._conn.commit()
+    
+    def clear(self):
+        """Remove all cached embeddings."""
+        with self._lock:
+            self._conn.execute("DELETE FROM cache")
+            self._conn.commit()
+    
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM cache").fetchone()[0]
@@ -0,0 +1,147 @@
+"""
+Ingestion Manifest for NYC Services GPT RAG System
+
+Tracks which PDFs have already been embedded into ChromaDB so reruns of the
+ingestion pipeline only pay extraction and embedding costs for new or
+changed files.
+
+The manifest is a JSON file keyed by each PDF's SHA-256 digest:
+    {sha256: {"path", "size", "mtime", "chunk_ids", "ingested_at"}}
+"""
+
+import os
+import json
+import hashlib
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+
+def file_sha256(path: Union[str, Path], block_size: int = 1 << 20) -> str:
+    """
+    Compute the SHA-256 digest of a file without reading it into memory at once.
+    
+    Args:
+        path: File to hash
+        block_size: Bytes read per step
+    
+    Returns:
+        Hex digest string
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        while block := file.read(block_size):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class IngestManifest:
+    """
+    Persistent record of ingested PDFs and the chunk ids they produced.
+    """
+    
+    def __init__(self, manifest_path: Union[str, Path]):
+        """
+        Load the manifest, starting empty if it does not exist or is unreadable.
+        
+        Args:
+            manifest_path: Location of the JSON manifest file
+        """
+        self.manifest_path = Path(manifest_path)
+        self.entries: Dict[str, Dict] = {}
+        
+        if self.manifest_path.exists():
+            try:
+                with open(self.manifest_path, "r", encoding="utf-8") as f:
+                    self.entries = json.load(f)
+            except (OSError, ValueError) as e:
+                print(f"⚠️ Ignoring unreadable ingest manifest {self.manifest_path}: {e}")
+    
+    def _entry_for_path(self, path: Path) -> Optional[tuple]:
+        """Find the (sha256, entry) last recorded for path, if any."""
+        for sha, entry in self.entries.items():
+            if entry.get("path") == str(path):
+                return sha, entry
+        return None
+    
+    def check(self, path: Union[str, Path]) -> tuple:
+        """
+        Decide whether a PDF needs to be (re)ingested.
+        
+        Files whose size and mtime match their manifest entry are treated as
+        unchanged without being hashed; otherwise the file is hashed and
+        compared against every recorded digest, so renamed or touched but
+        identical files are still skipped.
+        
+        Args:
+            path: PDF file to check
+        
+        Returns:
+            Tuple of (is_current, sha256); for unchanged files the recorded digest is returned
+        """
+        path = Path(path)
+        stat = path.stat()
+        
+        found = self._entry_for_path(path)
+        if found:
+            sha, entry = found
+            if entry.get("size") == stat.st_size and entry.get("mtime") == stat.st_mtime:
+                return True, sha
+        
+        sha = file_sha256(path)
+        if sha in self.entries:
+            entry = self.entries[sha]
+            entry.update({"path": str(path), "size": stat.st_size, "mtime": stat.st_mtime})
+            return True, sha
+        
+        return False, sha
+    
+    def stale_chunk_ids(self, path: Union[str, Path]) -> List[str]:
+        """
+        Chunk ids ingested from an earlier version of path.
+        
+        Args:
+            path: PDF file that is about to be re-ingested
+        
+        Returns:
+            List of chunk ids to delete from the vector store
+        """
+        found = self._entry_for_path(Path(path))
+        return list(found[1].get("chunk_ids", [])) if found else []
+    
+    def record(self, path: Union[str, Path], sha256: str, chunk_ids: List[str]):
+        """
+        Record a successfully ingested PDF, replacing any entry for its previous version.
+        
+        Args:
+            path: Ingested PDF file
+            sha256: Digest of the ingested file contents
+            chunk_ids: Ids of the chunks written to the vector store
+        """
+        path = Path(path)
+        found = self._entry_for_path(path)
+        if found:
+            del self.entries[found[0]]
+        
+        stat = path.stat()
+        self.entries[sha256] = {
+            "path": str(path),
+            "size": stat.st_size,
+            "mtime": stat.st_mtime,
+            "chunk_ids": list(chunk_ids),
+            "ingested_at": datetime.now().isoformat()
+        }
+    
+    def clear(self):
+        """Forget all entries (e.g. when the vector store was reset)."""
+        self.entries = {}
+    
+    def save(self):
+        """Write the manifest atomically so an interrupted run never corrupts it."""
+        tmp_path = self.manifest_path.with_name(self.manifest_path.name + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.entries, f, indent=2)
+        os.replace(tmp_path, self.manifest_path)
+    
+    def __len__(self) -> int:
+        return len(self.entries)
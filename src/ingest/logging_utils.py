@@ -0,0 +1,40 @@
+"""
+Background Logging for NYC Services GPT Ingestion Scripts
+
+Ingestion runs emit thousands of progress lines. Routing them through a
+QueueHandler means the chunking and embedding loops only enqueue records;
+a QueueListener thread does the actual writes to stdout.
+"""
+
+import os
+import sys
+import logging
+from logging.handlers import QueueHandler, QueueListener
+from queue import SimpleQueue
+
+
+def start_queue_logging(level_env: str = "INGEST_LOG_LEVEL", default_level: str = "INFO") -> QueueListener:
+    """
+    Configure root logging to write through a background thread.
+    
+    Args:
+        level_env: Environment variable holding the log level
+        default_level: Level used when level_env is unset
+    
+    Returns:
+        The started QueueListener; call stop() before exiting to flush it
+    """
+    queue = SimpleQueue()
+    
+    stream_handler = logging.StreamHandler(sys.stdout)
+    stream_handler.setFormatter(logging.Formatter("%(message)s"))
+    
+    logging.basicConfig(
+        level=os.getenv(level_env, default_level).upper(),
+        handlers=[QueueHandler(queue)],
+        force=True
+    )
+    
+    listener = QueueListener(queue, stream_handler)
+    listener.start()
+    return listener
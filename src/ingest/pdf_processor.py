@@ -8,17 +8,72 @@ and embedding into ChromaDB.
 
 import os
 import re
-from typing import List, Dict, Optional, Tuple
+import mmap
+import hashlib
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import List, Dict, Optional, Tuple, Iterator, Iterable, Set
 from pathlib import Path
 from datetime import datetime
 import PyPDF2
 import fitz  # PyMuPDF for better text extraction
 
-from .chunker import chunk_documents
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+from .chunker import chunk_documents, chunk_text_stream
 from ..models.rate_limiter import rate_limiter
 from ..models.mock_fallback import mock_fallback
+from ..models.tokenizer import count_tokens
 from ..config import config
 
+# Service classification keywords
+SERVICE_KEYWORDS = {
+    "unemployment": [
+        "unemployment", "job loss", "department of labor", "weekly certification",
+        "benefit amount", "claim", "appeal", "workers", "employment"
+    ],
+    "snap": [
+        "snap", "food stamps", "ebt", "food assistance", "income limits",
+        "household size", "benefits", "nutrition", "food"
+    ],
+    "medicaid": [
+        "medicaid", "health insurance", "healthcare", "medical coverage",
+        "provider", "coverage", "health", "medical"
+    ],
+    "cash_assistance": [
+        "cash assistance", "family assistance", "safety net", "financial aid",
+        "cash benefits", "temporary assistance", "welfare"
+    ],
+    "childcare": [
+        "childcare", "daycare", "child care", "subsidy", "provider",
+        "co-payment", "children", "day care"
+    ]
+}
+
+# Every distinct keyword, scanned once per document even if shared by services
+ALL_KEYWORDS = tuple(dict.fromkeys(kw for keywords in SERVICE_KEYWORDS.values() for kw in keywords))
+
+# With pyahocorasick installed, all keywords are matched in one pass over the text
+if ahocorasick is not None:
+    KEYWORD_AUTOMATON = ahocorasick.Automaton()
+    for _keyword in ALL_KEYWORDS:
+        KEYWORD_AUTOMATON.add_word(_keyword, _keyword)
+    KEYWORD_AUTOMATON.make_automaton()
+else:
+    KEYWORD_AUTOMATON = None
+
+# Date patterns in priority order, compiled once at import
+DATE_PATTERNS = [
+    re.compile(r'\b\d{1,2}/\d{1,2}/\d{4}\b'),  # MM/DD/YYYY
+    re.compile(r'\b\d{4}-\d{1,2}-\d{1,2}\b'),  # YYYY-MM-DD
+    re.compile(r'\b(?:January|February|March|April|May|June|July|August|September|October|November|December)\s+\d{4}\b'),  # Month YYYY
+]
+
+# Characters stripped from candidate title lines
+TITLE_CLEANUP_PATTERN = re.compile(r'[^\w\s\-\(\)]')
+
 
 class PDFProcessor:
     """
@@ -36,60 +91,131 @@ class PDFProcessor:
             docs_folder: Path to folder containing PDF documents
         """
         self.docs_folder = Path(docs_folder)
-        self.service_keywords = {
-            "unemployment": [
-                "unemployment", "job loss", "department of labor", "weekly certification",
-                "benefit amount", "claim", "appeal", "workers", "employment"
-            ],
-            "snap": [
-                "snap", "food stamps", "ebt", "food assistance", "income limits",
-                "household size", "benefits", "nutrition", "food"
-            ],
-            "medicaid": [
-                "medicaid", "health insurance", "healthcare", "medical coverage",
-                "provider", "coverage", "health", "medical"
-            ],
-            "cash_assistance": [
-                "cash assistance", "family assistance", "safety net", "financial aid",
-                "cash benefits", "temporary assistance", "welfare"
-            ],
-            "childcare": [
-                "childcare", "daycare", "child care", "subsidy", "provider",
-                "co-payment", "children", "day care"
-            ]
-        }
+        self.service_keywords = SERVICE_KEYWORDS
+        # (path, mtime_ns, size) -> (service_type, doc_title, date)
+        self._descriptions: Dict[Tuple[str, int, int], Tuple[str, str, str]] = {}
     
-    def extract_text_from_pdf(self, pdf_path: Path) -> str:
+    def iter_pages(self, pdf_path: Path) -> Iterator[str]:
         """
-        Extract text from PDF using PyMuPDF for better quality.
+        Yield the text of a PDF one page at a time.
+        
+        Uses PyMuPDF for better quality, falling back to PyPDF2 if the
+        document cannot be opened. Only one page is held in memory at a time.
         
         Args:
             pdf_path: Path to PDF file
             
-        Returns:
-            Extracted text content
+        Yields:
+            Text content of each page
         """
         try:
             # Try PyMuPDF first (better text extraction)
-            doc = fitz.open(pdf_path)
-            text = ""
-            for page in doc:
-                text += page.get_text()
-            doc.close()
-            return text.strip()
+            doc = open_pdf(pdf_path)
         except Exception as e:
             print(f"⚠️ PyMuPDF failed for {pdf_path.name}, trying PyPDF2: {e}")
-            try:
-                # Fallback to PyPDF2
-                with open(pdf_path, 'rb') as file:
-                    reader = PyPDF2.PdfReader(file)
-                    text = ""
-                    for page in reader.pages:
-                        text += page.extract_text()
+            yield from self._iter_pages_pypdf2(pdf_path)
+            return
+        
+        pages_read = 0
+        try:
+            for page in doc:
+                text = page.get_text()
+                pages_read += 1
+                yield text
+        except Exception as e:
+            if pages_read:
+                print(f"⚠️ PyMuPDF stopped after {pages_read} pages of {pdf_path.name}: {e}")
+            else:
+                print(f"⚠️ PyMuPDF failed for {pdf_path.name}, trying PyPDF2: {e}")
+                yield from self._iter_pages_pypdf2(pdf_path)
+        finally:
+            doc.close()
+    
+    def _iter_pages_pypdf2(self, pdf_path: Path) -> Iterator[str]:
+        """
+        Yield page text using PyPDF2 (fallback extractor).
+        
+        The file is memory-mapped so the kernel pages in only what the parser
+        touches, and workers reading the same PDF share physical pages.
+        """
+        try:
+            with open(pdf_path, 'rb') as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                reader = PyPDF2.PdfReader(mapped)
+                for page in reader.pages:
+                    yield page.extract_text() or ""
+        except Exception as e2:
+            print(f"❌ Failed to extract text from {pdf_path.name}: {e2}")
+    
+    def extract_text_from_pdf(self, pdf_path: Path, num_workers: int = 1) -> str:
+        """
+        Extract text from PDF using PyMuPDF for better quality.
+        
+        With num_workers > 1 the page range is split into contiguous shards
+        that are extracted in worker processes, each opening its own
+        fitz.Document (PyMuPDF documents cannot be shared across processes).
+        Shards are joined in page order. Meant for single large PDFs; leave it
+        at 1 when PDFs are already being extracted in parallel.
+        
+        Args:
+            pdf_path: Path to PDF file
+            num_workers: Worker processes used to extract page shards
+            
+        Returns:
+            Extracted text content
+        """
+        if num_workers > 1:
+            text = self._extract_text_parallel(pdf_path, num_workers)
+            if text is not None:
                 return text.strip()
-            except Exception as e2:
-                print(f"❌ Failed to extract text from {pdf_path.name}: {e2}")
-                return ""
+        
+        return "".join(self.iter_pages(pdf_path)).strip()
+    
+    def _extract_text_parallel(self, pdf_path: Path, num_workers: int, min_pages_per_shard: int = 8) -> Optional[str]:
+        """
+        Extract page shards of one PDF in parallel worker processes.
+        
+        Returns:
+            Extracted text, or None if the PDF is too short to be worth
+            splitting or PyMuPDF failed (the caller falls back to iter_pages)
+        """
+        try:
+            with open_pdf(pdf_path) as doc:
+                page_count = doc.page_count
+        except Exception:
+            return None
+        
+        num_workers = min(num_workers, page_count // min_pages_per_shard)
+        if num_workers < 2:
+            return None
+        
+        shard_size = -(-page_count // num_workers)
+        shards = [(start, min(start + shard_size, page_count)) for start in range(0, page_count, shard_size)]
+        
+        try:
+            with ProcessPoolExecutor(max_workers=len(shards)) as executor:
+                futures = [executor.submit(_extract_page_range, pdf_path, start, stop) for start, stop in shards]
+                return "".join(future.result() for future in futures)
+        except Exception as e:
+            print(f"⚠️ Parallel extraction failed for {pdf_path.name}, extracting sequentially: {e}")
+            return None
+    
+    def summarize_pdf(self, pdf_path: Path, preview_chars: int = 200) -> Dict:
+        """
+        Stream a PDF page by page and collect its summary and metadata.
+        
+        Never holds the full document text in memory.
+        
+        Args:
+            pdf_path: Path to PDF file
+            preview_chars: Number of leading characters kept for the preview
+            
+        Returns:
+            Summary dictionary (see PageSummary.result)
+        """
+        summary = PageSummary(self, preview_chars)
+        for _ in summary.scan(self.iter_pages(pdf_path)):
+            pass
+        return summary.result(pdf_path.name)
     
     def classify_service_type(self, text: str, filename: str) -> str:
         """
@@ -102,7 +228,36 @@ class PDFProcessor:
         Returns:
             Classified service type
         """
-        text_lower = text.lower()
+        return self.classify_from_keywords(self.find_keywords(text.lower()), filename)
+    
+    def find_keywords(self, text_lower: str) -> Set[str]:
+        """
+        Find which service keywords occur in lowercased text.
+        
+        Uses a single Aho-Corasick scan when pyahocorasick is installed,
+        otherwise one substring search per keyword.
+        
+        Args:
+            text_lower: Lowercased text content
+            
+        Returns:
+            Set of keywords present in the text
+        """
+        if KEYWORD_AUTOMATON is not None:
+            return {keyword for _, keyword in KEYWORD_AUTOMATON.iter(text_lower)}
+        return {keyword for keyword in ALL_KEYWORDS if keyword in text_lower}
+    
+    def classify_from_keywords(self, found_keywords: Set[str], filename: str) -> str:
+        """
+        Classify a document from the keywords found in its text.
+        
+        Args:
+            found_keywords: Keywords present in the document text
+            filename: PDF filename for additional context
+            
+        Returns:
+            Classified service type
+        """
         filename_lower = filename.lower()
         
         # Score each service based on keyword matches
@@ -113,7 +268,7 @@ class PDFProcessor:
             
             # Check text content
             for keyword in keywords:
-                if keyword in text_lower:
+                if keyword in found_keywords:
                     score += 1
             
             # Check filename for additional context
@@ -157,12 +312,12 @@ class PDFProcessor:
             Document title
         """
         # Try to extract title from first few lines
-        lines = text.split('\n')[:10]
+        lines = text.split('\n', 10)[:10]
         for line in lines:
             line = line.strip()
             if line and len(line) > 10 and len(line) < 200:
                 # Clean up the line
-                title = re.sub(r'[^\w\s\-\(\)]', '', line)
+                title = TITLE_CLEANUP_PATTERN.sub('', line)
                 if title and not title.isdigit():
                     return title[:100]  # Limit length
         
@@ -181,19 +336,24 @@ class PDFProcessor:
         Returns:
             Date string
         """
-        # Try to find date patterns in text
-        date_patterns = [
-            r'\b\d{1,2}/\d{1,2}/\d{4}\b',  # MM/DD/YYYY
-            r'\b\d{4}-\d{1,2}-\d{1,2}\b',  # YYYY-MM-DD
-            r'\b(?:January|February|March|April|May|June|July|August|September|October|November|December)\s+\d{4}\b',  # Month YYYY
-        ]
+        # Try to find date patterns in text; search stops at the first match
+        for pattern in DATE_PATTERNS:
+            match = pattern.search(text)
+            if match:
+                return match.group(0)
         
-        for pattern in date_patterns:
-            matches = re.findall(pattern, text)
-            if matches:
-                return matches[0]
+        return self.file_date(filename)
+    
+    def file_date(self, filename: str) -> str:
+        """
+        Get the file modification date as a fallback document date.
         
-        # Fallback to file modification date
+        Args:
+            filename: PDF filename
+            
+        Returns:
+            Date string
+        """
         try:
             pdf_path = Path(self.docs_folder) / filename
             if pdf_path.exists():
@@ -204,10 +364,79 @@ class PDFProcessor:
         
         return "Unknown"
     
-    def process_pdf_documents(self) -> List[Dict]:
+    def describe_document(self, pdf_path: Path, text: str, stat: Optional[os.stat_result] = None) -> Tuple[str, str, str]:
+        """
+        Classify a PDF and extract its title and date, memoized per file.
+        
+        The keyword and date scans cover the whole document text, so results
+        are cached by path and invalidated when the file's mtime or size
+        changes.
+        
+        Args:
+            pdf_path: Path to the PDF file
+            text: Extracted text content
+            stat: Result of pdf_path.stat(), if the caller already has it
+            
+        Returns:
+            Tuple of (service_type, doc_title, date)
+        """
+        stat = stat or pdf_path.stat()
+        key = (str(pdf_path), stat.st_mtime_ns, stat.st_size)
+        
+        description = self._descriptions.get(key)
+        if description is None:
+            description = (
+                self.classify_service_type(text, pdf_path.name),
+                self.extract_document_title(text, pdf_path.name),
+                self.extract_date(text, pdf_path.name)
+            )
+            self._descriptions[key] = description
+        
+        return description
+    
+    def extract_document(self, pdf_path: Path, num_workers: int = 1) -> Optional[Dict]:
+        """
+        Extract, classify, and describe a single PDF.
+        
+        Args:
+            pdf_path: Path to the PDF file
+            num_workers: Worker processes for page extraction (see extract_text_from_pdf)
+            
+        Returns:
+            Document record with text and metadata, or None if no text was extracted
+        """
+        # Extract text
+        text = self.extract_text_from_pdf(pdf_path, num_workers=num_workers)
+        if not text:
+            return None
+        
+        stat = pdf_path.stat()
+        service_type, doc_title, doc_date = self.describe_document(pdf_path, text, stat)
+        
+        return {
+            "text": text,
+            "metadata": {
+                "source": str(pdf_path),
+                "service_type": service_type,
+                "doc_title": doc_title,
+                "date": doc_date,
+                "filename": pdf_path.name,
+                "file_size": stat.st_size,
+                "processing_date": datetime.now().isoformat()
+            }
+        }
+    
+    def process_pdf_documents(self, max_workers: Optional[int] = None) -> List[Dict]:
         """
         Process all PDF documents in the docs folder.
         
+        PDFs are parsed in parallel worker processes since extraction is
+        CPU-bound; results are returned in file order regardless of which
+        worker finishes first.
+        
+        Args:
+            max_workers: Worker processes (defaults to one less than the CPU count)
+        
         Returns:
             List of processed document dictionaries with metadata
         """
@@ -222,40 +451,18 @@ class PDFProcessor:
         
         print(f"🔍 Found {len(pdf_files)} PDF files to process")
         
-        processed_docs = []
+        doc_records = {}
         
-        for pdf_path in pdf_files:
-            print(f"📄 Processing: {pdf_path.name}")
-            
-            # Extract text
-            text = self.extract_text_from_pdf(pdf_path)
-            if not text:
+        for pdf_path, doc_record in iter_extracted_documents(pdf_files, max_workers):
+            if isinstance(doc_record, Exception):
+                print(f"❌ Error processing {pdf_path.name}: {doc_record}")
+            elif doc_record is None:
                 print(f"⚠️ Skipping {pdf_path.name} - no text extracted")
-                continue
-            
-            # Classify service type
-            service_type = self.classify_service_type(text, pdf_path.name)
-            
-            # Extract metadata
-            doc_title = self.extract_document_title(text, pdf_path.name)
-            doc_date = self.extract_date(text, pdf_path.name)
-            
-            # Create document record
-            doc_record = {
-                "text": text,
-                "metadata": {
-                    "source": str(pdf_path),
-                    "service_type": service_type,
-                    "doc_title": doc_title,
-                    "date": doc_date,
-                    "filename": pdf_path.name,
-                    "file_size": pdf_path.stat().st_size,
-                    "processing_date": datetime.now().isoformat()
-                }
-            }
-            
-            processed_docs.append(doc_record)
-            print(f"✅ Processed {pdf_path.name} -> {service_type} service")
+            else:
+                doc_records[pdf_path] = doc_record
+                print(f"✅ Processed {pdf_path.name} -> {doc_record['metadata']['service_type']} service")
+        
+        processed_docs = [doc_records[pdf_path] for pdf_path in pdf_files if pdf_path in doc_records]
         
         print(f"🎯 Successfully processed {len(processed_docs)} documents")
         return processed_docs
@@ -283,27 +490,220 @@ class PDFProcessor:
             text = doc["text"]
             metadata = doc["metadata"]
             
-            # Chunk the document
-            chunks = chunk_documents([text], chunk_size=chunk_size, overlap=overlap)
+            # Chunk the document; page iterators are streamed through a sliding window
+            if isinstance(text, str):
+                chunks = chunk_documents([text], chunk_size=chunk_size, overlap=overlap)
+            else:
+                chunks = list(chunk_text_stream(text, chunk_size=chunk_size, overlap=overlap))
             
-            # Create records for each chunk
-            for i, chunk in enumerate(chunks):
-                if chunk.strip():
-                    chunk_record = {
-                        "text": chunk,
-                        "metadata": {
-                            **metadata,  # Include all original metadata
-                            "chunk_index": i,
-                            "total_chunks": len(chunks),
-                            "chunk_size": chunk_size,
-                            "overlap": overlap,
-                            "token_count": len(chunk.split())
-                        }
-                    }
-                    chunked_records.append(chunk_record)
+            chunked_records.extend(self.build_chunk_records(chunks, metadata, chunk_size, overlap))
         
         print(f"✅ Created {len(chunked_records)} chunks from {len(documents)} documents")
         return chunked_records
+    
+    def build_chunk_records(self, chunks: List[str], metadata: Dict, chunk_size: int, overlap: int) -> List[Dict]:
+        """
+        Create embedding-ready records for the chunks of one document.
+        
+        Args:
+            chunks: Text chunks in document order
+            metadata: Document-level metadata copied into every record
+            chunk_size: Maximum tokens per chunk
+            overlap: Overlapping tokens between chunks
+            
+        Returns:
+            List of chunk records
+        """
+        chunk_records = []
+        
+        for i, chunk in enumerate(chunks):
+            if chunk.strip():
+                chunk_record = {
+                    "text": chunk,
+                    "metadata": {
+                        **metadata,  # Include all original metadata
+                        "chunk_hash": chunk_hash(chunk),
+                        "chunk_index": i,
+                        "total_chunks": len(chunks),
+                        "chunk_size": chunk_size,
+                        "overlap": overlap,
+                        "token_count": len(chunk.split())
+                    }
+                }
+                chunk_records.append(chunk_record)
+        
+        return chunk_records
+
+
+def open_pdf(pdf_path: Path) -> fitz.Document:
+    """
+    Open a PDF with PyMuPDF from a read-only memory map of the file.
+    
+    PyMuPDF parses the mapping in place, so the kernel pages in only the
+    parts of the file it touches (cross-reference table, page objects) with
+    no copy into a user-space buffer; page-range workers each fault in only
+    their own pages. The mapping is released when the returned document is.
+    
+    Args:
+        pdf_path: Path to PDF file
+        
+    Returns:
+        Open fitz.Document
+    """
+    with open(pdf_path, 'rb') as file:
+        try:
+            mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # Empty files cannot be mapped; let PyMuPDF report them
+            return fitz.open(pdf_path)
+    return fitz.open(stream=memoryview(mapped), filetype="pdf")
+
+
+def _extract_page_range(pdf_path: Path, start: int, stop: int) -> str:
+    """
+    Worker-process entry point extracting pages [start, stop) of a PDF.
+    
+    Each worker opens its own document handle.
+    """
+    with open_pdf(pdf_path) as doc:
+        return "".join(doc[page_number].get_text() for page_number in range(start, stop))
+
+
+def _extract_document(pdf_path: Path) -> Optional[Dict]:
+    """
+    Worker-process entry point for PDFProcessor.extract_document.
+    
+    A fresh PDFProcessor is created per call so the processor instance never
+    has to be pickled across the process boundary.
+    """
+    return PDFProcessor(str(pdf_path.parent)).extract_document(pdf_path)
+
+
+def iter_extracted_documents(pdf_files: List[Path], max_workers: Optional[int] = None) -> Iterator[Tuple[Path, object]]:
+    """
+    Extract PDFs in parallel worker processes, yielding each as it completes.
+    
+    Args:
+        pdf_files: PDFs to extract
+        max_workers: Worker processes (defaults to one less than the CPU count)
+        
+    Yields:
+        (pdf_path, result) pairs in completion order, where result is the
+        document record, None if no text was extracted, or the exception raised
+    """
+    if not pdf_files:
+        return
+    
+    max_workers = max_workers or max(1, (os.cpu_count() or 2) - 1)
+    
+    with ProcessPoolExecutor(max_workers=min(max_workers, len(pdf_files))) as executor:
+        futures = {executor.submit(_extract_document, pdf_path): pdf_path for pdf_path in pdf_files}
+        
+        for future in as_completed(futures):
+            pdf_path = futures[future]
+            try:
+                yield pdf_path, future.result()
+            except Exception as e:
+                yield pdf_path, e
+
+
+def chunk_hash(text: str) -> str:
+    """
+    Content key for a chunk, used to find identical chunks across documents.
+    
+    BLAKE2b from the standard library is used with a 64-bit digest: dedup
+    keys need speed, not cryptographic strength.
+    
+    Args:
+        text: Chunk text
+        
+    Returns:
+        16-character hex digest
+    """
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=8).hexdigest()
+
+
+class PageSummary:
+    """
+    Incrementally collects statistics and metadata signals from streamed pages.
+    
+    Lets callers classify and describe a PDF in the same pass that chunks it,
+    without ever concatenating the pages into one string.
+    """
+    
+    def __init__(self, processor: PDFProcessor, preview_chars: int = 200, title_lines: int = 10):
+        """
+        Initialize an empty summary.
+        
+        Args:
+            processor: PDFProcessor providing keyword and date rules
+            preview_chars: Number of leading characters kept for the preview
+            title_lines: Number of leading lines searched for a title
+        """
+        self.processor = processor
+        self.preview_chars = preview_chars
+        self.title_lines = title_lines
+        self.char_count = 0
+        self.token_count = 0
+        self.preview = ""
+        self.head = ""
+        self.found_keywords = set()
+        self.dates = [None] * len(DATE_PATTERNS)
+    
+    def scan(self, pages: Iterable[str]) -> Iterator[str]:
+        """Pass pages through unchanged while updating the summary."""
+        for page in pages:
+            self.update(page)
+            yield page
+    
+    def update(self, page: str):
+        """Fold one page into the summary."""
+        self.char_count += len(page)
+        self.token_count += count_tokens(page)
+        
+        if len(self.preview) < self.preview_chars:
+            self.preview += page[:self.preview_chars - len(self.preview)]
+        
+        # Keep leading text only until it holds enough lines for the title
+        if self.head.lstrip().count('\n') < self.title_lines:
+            self.head += page
+        
+        page_lower = page.lower()
+        if KEYWORD_AUTOMATON is not None:
+            self.found_keywords.update(self.processor.find_keywords(page_lower))
+        else:
+            # Keywords already seen on earlier pages are not rescanned
+            self.found_keywords.update(
+                keyword for keyword in ALL_KEYWORDS
+                if keyword not in self.found_keywords and keyword in page_lower
+            )
+        
+        for i, pattern in enumerate(DATE_PATTERNS):
+            if self.dates[i] is None:
+                match = pattern.search(page)
+                if match:
+                    self.dates[i] = match.group(0)
+    
+    def result(self, filename: str) -> Dict:
+        """
+        Build the final summary for a document.
+        
+        Args:
+            filename: PDF filename
+            
+        Returns:
+            Dictionary with text_length, token_count, preview, service_type,
+            doc_title and date
+        """
+        date = next((d for d in self.dates if d is not None), None)
+        return {
+            "text_length": self.char_count,
+            "token_count": self.token_count,
+            "preview": self.preview,
+            "service_type": self.processor.classify_from_keywords(self.found_keywords, filename),
+            "doc_title": self.processor.extract_document_title(self.head.strip(), filename),
+            "date": date or self.processor.file_date(filename)
+        }
 
 
 def process_pdfs_to_chunks(docs_folder: str = "data/Docs", chunk_size: int = 1000, overlap: int = 200) -> List[Dict]:
@@ -0,0 +1,36 @@
+"""
+Async Helpers for NYC Services GPT RAG System
+
+Provides a long-lived thread pool for running blocking provider calls
+(OpenAI embeddings and chat completions) from async code, so callers
+driven by an event loop (Streamlit, async web handlers, ingestion
+pipelines) stay responsive while network I/O is in flight.
+"""
+
+import os
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable
+
+# Shared pool for blocking I/O; sized for network-bound work, not CPU cores
+_blocking_executor = ThreadPoolExecutor(
+    max_workers=int(os.getenv("BLOCKING_IO_WORKERS", "16")),
+    thread_name_prefix="nyc-gpt-io"
+)
+
+
+async def run_blocking(func: Callable, *args, **kwargs) -> Any:
+    """
+    Run a blocking callable in the shared thread pool without blocking the event loop.
+    
+    Args:
+        func: Blocking callable to run
+        *args: Positional arguments for func
+        **kwargs: Keyword arguments for func
+        
+    Returns:
+        The callable's return value
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_blocking_executor, functools.partial(func, *args, **kwargs))
@@ -0,0 +1,162 @@
+"""
+Circuit Breaker for OpenAI Calls in NYC Services GPT
+
+Implements a Closed/Open/Half-Open state machine around provider calls:
+- CLOSED: calls go through; failures are counted in a sliding window
+- OPEN: after too many failures, calls route straight to the mock fallback
+- HALF_OPEN: after the cooldown, a single probe call is allowed through
+
+This saves the full socket timeout every call would otherwise pay while
+the provider is unavailable.
+"""
+
+import time
+import threading
+from collections import deque
+from functools import wraps
+from typing import Callable, Dict, Tuple, Type
+
+import openai
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """
+    Thread-safe circuit breaker with a sliding failure window.
+    """
+
+    states = {CLOSED, OPEN, HALF_OPEN}
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        window_seconds: float = 60.0,
+        cooldown_seconds: float = 30.0,
+        failure_exceptions: Tuple[Type[BaseException], ...] = ()
+    ):
+        """
+        Initialize the circuit breaker.
+
+        Args:
+            failure_threshold: Failures within the window that open the circuit
+            window_seconds: Sliding window for counting failures
+            cooldown_seconds: Time the circuit stays open before a half-open probe
+            failure_exceptions: Exceptions escaping a protected call that count as failures
+        """
+        self.failure_threshold = failure_threshold
+        self.window_seconds = window_seconds
+        self.cooldown_seconds = cooldown_seconds
+        self.failure_exceptions = failure_exceptions
+
+        self.state = CLOSED
+        self.failures = deque()
+        self.last_opened_at = None
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+
+    def allow_request(self) -> bool:
+        """
+        Check whether a real provider call may be made right now.
+
+        Moves OPEN to HALF_OPEN once the cooldown has elapsed and lets a
+        single probe through; all other callers are rejected until it resolves.
+        """
+        with self._lock:
+            if self.state == CLOSED:
+                return True
+
+            if self.state == OPEN:
+                if time.time() - self.last_opened_at < self.cooldown_seconds:
+                    return False
+                self.state = HALF_OPEN
+                self._probe_in_flight = False
+
+            if self._probe_in_flight:
+                return False
+            self._probe_in_flight = True
+            return True
+
+    def record_success(self):
+        """Record a successful call, closing the circuit."""
+        with self._lock:
+            if self.state != CLOSED:
+                print("✅ Circuit breaker closed - provider calls restored")
+            self.state = CLOSED
+            self.failures.clear()
+            self._probe_in_flight = False
+
+    def record_failure(self):
+        """Record a failed call, opening the circuit if the threshold is reached."""
+        with self._lock:
+            now = time.time()
+            self.failures.append(now)
+            while self.failures and now - self.failures[0] > self.window_seconds:
+                self.failures.popleft()
+
+            if self.state == HALF_OPEN or len(self.failures) >= self.failure_threshold:
+                if self.state != OPEN:
+                    print(f"🚨 Circuit breaker opened - routing to fallback for {self.cooldown_seconds:.0f}s")
+                self.state = OPEN
+                self.last_opened_at = now
+                self._probe_in_flight = False
+
+    def release_probe(self):
+        """Clear the half-open probe slot once a protected call has finished."""
+        # A probe that never reached the provider must not block the circuit
+        with self._lock:
+            self._probe_in_flight = False
+
+    def reset(self):
+        """Return to CLOSED with no recorded failures, e.g. between tests."""
+        with self._lock:
+            self.state = CLOSED
+            self.failures.clear()
+            self.last_opened_at = None
+            self._probe_in_flight = False
+
+    @property
+    def is_open(self) -> bool:
+        """Whether calls are currently being short-circuited."""
+        return self.state == OPEN
+
+    def protect(self, fallback: Callable) -> Callable:
+        """
+        Decorator routing calls to fallback while the circuit is open.
+
+        The fallback receives the same arguments as the protected function.
+
+        Args:
+            fallback: Callable used instead of the protected function
+        """
+        def decorator(func: Callable) -> Callable:
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self.allow_request():
+                    return fallback(*args, **kwargs)
+
+                try:
+                    return func(*args, **kwargs)
+                except self.failure_exceptions:
+                    self.record_failure()
+                    return fallback(*args, **kwargs)
+                finally:
+                    self.release_probe()
+
+            return wrapper
+        return decorator
+
+    def get_status_info(self) -> Dict:
+        """Get current circuit breaker status."""
+        return {
+            "state": self.state,
+            "recent_failures": len(self.failures),
+            "last_opened_at": self.last_opened_at
+        }
+
+# Global circuit breaker shared by all OpenAI calls
+openai_breaker = CircuitBreaker(
+    failure_exceptions=(openai.RateLimitError, openai.APITimeoutError)
+)
@@ -0,0 +1,54 @@
+"""
+JSON Encoding Helpers for NYC Services GPT
+
+Serializes cache payloads and Chroma metadata with orjson when it is
+installed, falling back to the standard library json module otherwise.
+Both paths produce the same compact text, so keys and stored values stay
+interchangeable between environments with and without orjson.
+"""
+
+import json
+from typing import Any
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def dumps(obj: Any, sort_keys: bool = False) -> str:
+    """
+    Serialize obj to a compact JSON string.
+    
+    Args:
+        obj: JSON-serializable object
+        sort_keys: Sort dictionary keys (use for hashing/cache keys)
+    
+    Returns:
+        JSON text without insignificant whitespace
+    """
+    if orjson is not None:
+        option = orjson.OPT_SORT_KEYS if sort_keys else 0
+        try:
+            return orjson.dumps(obj, option=option).decode("utf-8")
+        except TypeError:
+            # orjson is stricter (e.g. non-str dict keys); let json handle the rest
+            pass
+    
+    return json.dumps(obj, sort_keys=sort_keys, separators=(",", ":"), ensure_ascii=False)
+
+
+def loads(data: Any) -> Any:
+    """
+    Deserialize JSON text or bytes.
+    
+    Args:
+        data: JSON str or bytes
+    
+    Returns:
+        Decoded Python object
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    
+    return json.loads(data)
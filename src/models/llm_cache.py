@@ -0,0 +1,90 @@
+"""
+Disk Cache for LLM Responses in NYC Services GPT
+
+Persists deterministic LLM responses across runs so repeated demo and
+evaluation queries don't spend tokens on answers we already have.
+Responses are keyed by a SHA256 of the full request (model, messages,
+temperature, and any extra generation parameters).
+"""
+
+import os
+import time
+import sqlite3
+import hashlib
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from . import fast_json
+
+
+class DiskLLMCache:
+    """
+    SQLite-backed response cache with per-entry expiry.
+    
+    Safe to share across threads; all access goes through a single
+    connection guarded by a lock.
+    """
+    
+    def __init__(self, cache_dir: Optional[str] = None, ttl: int = 86400):
+        """
+        Initialize the disk cache.
+        
+        Args:
+            cache_dir: Directory for the cache database (defaults to LLM_CACHE_DIR or .cache/llm)
+            ttl: Default time-to-live for entries in seconds (default: 24 hours)
+        """
+        self.cache_dir = Path(cache_dir or os.getenv("LLM_CACHE_DIR", ".cache/llm"))
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.ttl = ttl
+        
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.cache_dir / "responses.sqlite"), check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, response TEXT NOT NULL, expires REAL NOT NULL)"
+        )
+        self._conn.commit()
+    
+    @staticmethod
+    def make_key(model: str, messages: List[Dict], temperature: float, **kwargs) -> str:
+        """Build a deterministic SHA256 key for a chat completion request."""
+        payload = {
+            "model": model,
+            "messages": messages,
+            "temperature": temperature,
+            **kwargs
+        }
+        return hashlib.sha256(fast_json.dumps(payload, sort_keys=True).encode()).hexdigest()
+    
+    def get(self, key: str) -> Optional[Dict]:
+        """Return the cached response for key, or None if missing or expired."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT response, expires FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            
+            if row is None:
+                return None
+            
+            if time.time() > row[1]:
+                self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._conn.commit()
+                return None
+        
+        return fast_json.loads(row[0])
+    
+    def set(self, key: str, response: Dict, expire: Optional[int] = None):
+        """Store a response under key for expire seconds (defaults to the cache TTL)."""
+        expires = time.time() + (expire if expire is not None else self.ttl)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, response, expires) VALUES (?, ?, ?)",
+                (key, fast_json.dumps(response), expires)
+            )
+            self._conn.commit()
+    
+    def clear(self):
+        """Remove all cached responses."""
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+            self._conn.commit()
@@ -7,12 +7,74 @@ Supports the Self-Service Success Rate KPI by providing complete answers without
 """
 
 import openai
+import httpx
 import time
 import random
-from typing import List, Dict, Optional
+import threading
+from typing import Iterator, List, Dict, Optional, Union
 from ..config import config
 from .rate_limiter import rate_limiter
 from .mock_fallback import mock_fallback
+from .async_utils import run_blocking
+from .llm_cache import DiskLLMCache
+from .semantic_cache import semantic_cache
+from .circuit_breaker import openai_breaker
+
+# Keep-alive pool for the module-level OpenAI client (chat and embeddings), so
+# requests after the first reuse open TLS connections instead of reconnecting
+WARM_KEEPALIVE_CONNECTIONS = 32
+WARM_KEEPALIVE_EXPIRY = 120
+
+if openai.http_client is None:
+    openai.http_client = httpx.Client(limits=httpx.Limits(
+        max_keepalive_connections=WARM_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry=WARM_KEEPALIVE_EXPIRY
+    ))
+
+# Disk response cache shared by every temperature-0 client (opened on first use)
+_disk_cache = None
+_disk_cache_lock = threading.Lock()
+
+
+def _get_disk_cache() -> DiskLLMCache:
+    """Open the disk response cache once and reuse it across clients."""
+    global _disk_cache
+    if _disk_cache is None:
+        with _disk_cache_lock:
+            if _disk_cache is None:
+                _disk_cache = DiskLLMCache()
+    return _disk_cache
+
+
+def warm_up_connections(timeout: float = 5.0) -> bool:
+    """
+    Open a connection to the OpenAI API before the first user query.
+    
+    Lists models (no tokens billed) so DNS, TCP and TLS setup is paid at
+    startup rather than on top of the first answer's latency. Failures are
+    ignored; the first real request simply connects as usual.
+    
+    Args:
+        timeout: Seconds to wait for the API
+        
+    Returns:
+        True if the API was reached
+    """
+    if not config.openai_api_key:
+        return False
+    
+    openai.api_key = openai.api_key or config.openai_api_key
+    try:
+        openai.models.list(timeout=timeout)
+        return True
+    except Exception as e:
+        print(f"⚠️ Could not pre-warm OpenAI connection: {e}")
+        return False
+
+
+def _breaker_fallback(client, query: str, retrieved_documents: List[Dict], *args, **kwargs) -> Dict:
+    """Serve the mock fallback response while the OpenAI circuit is open."""
+    return mock_fallback.generate_response(query, retrieved_documents)
 
 
 class LLMClient:
@@ -23,16 +85,34 @@ class LLMClient:
     accurate, helpful responses to NYC service queries without human intervention.
     """
     
-    def __init__(self, api_key: Optional[str] = None, default_model: str = "gpt-4o-mini"):
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        default_model: str = "gpt-4o-mini",
+        temperature: float = 0.3,
+        cache_enabled: bool = True,
+        ttl: int = 86400,
+        semantic_cache_enabled: bool = True
+    ):
         """
         Initialize the LLM client with rate limiting.
         
         Args:
             api_key: OpenAI API key (defaults to config)
             default_model: Default model to use (gpt-4o-mini for MVP)
+            temperature: Sampling temperature for completions
+            cache_enabled: Persist responses to the disk cache (only used when temperature == 0)
+            ttl: Disk cache time-to-live in seconds (default: 24 hours)
+            semantic_cache_enabled: Serve answers to semantically equivalent queries from the semantic cache
         """
         self.api_key = api_key or config.openai_api_key
         self.default_model = default_model
+        self.temperature = temperature
+        self.ttl = ttl
+        # Only deterministic (temperature 0) responses are worth caching
+        self.cache = _get_disk_cache() if cache_enabled and temperature == 0 else None
+        self.semantic_cache = semantic_cache if semantic_cache_enabled else None
+        self.stats = {"hits": 0, "misses": 0}
         
         if self.api_key:
             openai.api_key = self.api_key
@@ -40,13 +120,15 @@ class LLMClient:
         else:
             print("⚠️ No OpenAI API key found. Using mock responses for testing.")
     
+    @openai_breaker.protect(fallback=_breaker_fallback)
     def generate_response(
         self, 
         query: str, 
         retrieved_documents: List[Dict],
         max_tokens: int = 300,
         task_hint: str = "",
-        allow_premium: bool = False
+        allow_premium: bool = False,
+        query_embedding=None
     ) -> Dict:
         """
         Generate a response to a user query based on retrieved documents.
@@ -59,6 +141,8 @@ class LLMClient:
             max_tokens: Maximum tokens for response (reduced for MVP)
             task_hint: Hint for model selection (e.g., "complex analysis")
             allow_premium: Allow premium model usage
+            query_embedding: Embedding of query already computed for retrieval,
+                reused by the semantic cache instead of embedding the query again
             
         Returns:
             Dictionary with response and metadata:
@@ -74,12 +158,63 @@ class LLMClient:
         if not self.api_key:
             return self._generate_mock_response(query, retrieved_documents)
         
+        # Near-duplicate queries are answered from the semantic cache
+        if self.semantic_cache is not None:
+            cached_response = self.semantic_cache.lookup(query, embedding=query_embedding)
+            if cached_response is not None:
+                return cached_response
+        
         # Choose appropriate model based on task complexity
         model = rate_limiter.choose_model(task_hint, allow_premium)
         
-        return self._generate_response_with_rate_limiting(
+        result = self._generate_response_with_rate_limiting(
             query, retrieved_documents, max_tokens, model
         )
+        
+        if self.semantic_cache is not None and not result.get("from_cache"):
+            self.semantic_cache.store(query, result, embedding=query_embedding)
+        
+        return result
+    
+    def record_feedback(self, response: Dict, high_quality: bool):
+        """
+        Record user feedback on a response.
+        
+        Feedback on semantic cache hits adapts the semantic similarity
+        threshold towards the target quality rate.
+        
+        Args:
+            response: Response dictionary returned by generate_response
+            high_quality: Whether the user found the response helpful
+        """
+        if self.semantic_cache is not None and response.get("semantic_cache"):
+            self.semantic_cache.record_feedback(high_quality)
+    
+    async def agenerate_response(
+        self, 
+        query: str, 
+        retrieved_documents: List[Dict],
+        max_tokens: int = 300,
+        task_hint: str = "",
+        allow_premium: bool = False
+    ) -> Dict:
+        """
+        Async variant of generate_response for callers running an event loop.
+        
+        The blocking OpenAI call runs in the shared thread pool so the loop
+        stays responsive while the completion is generated.
+        
+        Returns:
+            Same response dictionary as generate_response
+        """
+        return await run_blocking(
+            self.generate_response,
+            query,
+            retrieved_documents,
+            max_tokens=max_tokens,
+            task_hint=task_hint,
+            allow_premium=allow_premium
+        )
     
     def _generate_response_with_rate_limiting(
         self, 
@@ -100,25 +235,26 @@ class LLMClient:
         Returns:
             Response dictionary with rate limiting metadata
         """
-        # Prepare context and prompts
-        context = self._prepare_context(retrieved_documents)
-        system_prompt = self._create_system_prompt()
-        user_prompt = self._create_user_prompt(query, context)
-        
-        # Create messages for API call
-        messages = [
-            {"role": "system", "content": system_prompt[:2000]},  # Limit system prompt
-            {"role": "user", "content": user_prompt}
-        ]
-        
-        # Check cache first (development only)
+        messages = self._build_messages(query, retrieved_documents)
+        
+        # Check the disk cache first; only deterministic (temperature 0) responses are cached
+        disk_key = None
+        if self.cache is not None and self.temperature == 0:
+            disk_key = DiskLLMCache.make_key(model, messages, self.temperature, max_tokens=max_tokens)
+            disk_response = self.cache.get(disk_key)
+            if disk_response is not None:
+                self.stats["hits"] += 1
+                return {**disk_response, "from_cache": True}
+            self.stats["misses"] += 1
+        
+        # Check in-memory cache (development only)
         cache_key = rate_limiter.get_cache_key(model, messages, max_tokens=max_tokens)
         cached_response = rate_limiter.get_cached_response(cache_key)
         if cached_response:
             return cached_response
         
         # Estimate token usage
-        estimated_tokens = sum(rate_limiter.estimate_tokens(msg["content"]) for msg in messages)
+        estimated_tokens = sum(rate_limiter.estimate_tokens(msg["content"], model) for msg in messages)
         estimated_tokens += max_tokens  # Add expected output tokens
         
         # Wait for capacity if needed
@@ -131,15 +267,16 @@ class LLMClient:
                     model=model,
                     messages=messages,
                     max_tokens=max_tokens,
-                    temperature=0.3,
+                    temperature=self.temperature,
                     top_p=0.9
                 )
+                openai_breaker.record_success()
                 
                 # Extract response data
                 generated_response = response.choices[0].message.content
                 usage = response.usage
                 input_tokens = usage.prompt_tokens if usage else estimated_tokens - max_tokens
-                output_tokens = usage.completion_tokens if usage else rate_limiter.estimate_tokens(generated_response)
+                output_tokens = usage.completion_tokens if usage else rate_limiter.estimate_tokens(generated_response, model)
                 
                 # Record usage for rate limiting
                 rate_limiter.record_usage(model, input_tokens, output_tokens)
@@ -160,11 +297,14 @@ class LLMClient:
                 
                 # Cache the response (development only)
                 rate_limiter.cache_response(cache_key, result)
+                if disk_key is not None:
+                    self.cache.set(disk_key, result, expire=self.ttl)
                 
                 return result
                 
             except openai.RateLimitError as e:
-                if attempt < rate_limiter.max_retries:
+                openai_breaker.record_failure()
+                if attempt < rate_limiter.max_retries and not openai_breaker.is_open:
                     # Use rate limiter's exponential backoff
                     wait_time = rate_limiter.exponential_backoff(attempt + 1)
                     print(f"⚠️ Rate limit hit, retrying in {wait_time:.1f}s (attempt {attempt + 1}/{rate_limiter.max_retries})")
@@ -177,7 +317,9 @@ class LLMClient:
                     
             except Exception as e:
                 print(f"❌ Failed to generate response: {e}")
-                if attempt < rate_limiter.max_retries:
+                if isinstance(e, openai.APITimeoutError):
+                    openai_breaker.record_failure()
+                if attempt < rate_limiter.max_retries and not openai_breaker.is_open:
                     wait_time = rate_limiter.exponential_backoff(attempt + 1)
                     print(f"⚠️ Retrying in {wait_time:.1f}s (attempt {attempt + 1}/{rate_limiter.max_retries})")
                     time.sleep(wait_time)
@@ -190,6 +332,146 @@ class LLMClient:
         mock_fallback.activate_fallback("unknown_error")
         return mock_fallback.get_mock_llm_response(query, retrieved_documents)
     
+    def stream_response(
+        self,
+        query: str,
+        retrieved_documents: List[Dict],
+        max_tokens: int = 300,
+        task_hint: str = "",
+        allow_premium: bool = False,
+        query_embedding=None
+    ) -> Iterator[Union[str, Dict]]:
+        """
+        Stream a response token by token as it is generated.
+        
+        Lets the UI render the first tokens while the rest of the answer is
+        still being decoded. Cached, mock and fallback answers are yielded
+        as a single chunk.
+        
+        Args:
+            query: User's original query
+            retrieved_documents: List of relevant documents from vector store
+            max_tokens: Maximum tokens for response
+            task_hint: Hint for model selection
+            allow_premium: Allow premium model usage
+            query_embedding: Embedding of query already computed for retrieval
+            
+        Yields:
+            Text chunks of the response, then the full response dictionary
+            (same shape as generate_response) as the last item
+        """
+        if not self.api_key:
+            result = self._generate_mock_response(query, retrieved_documents)
+            yield result["response"]
+            yield result
+            return
+        
+        if self.semantic_cache is not None:
+            cached_response = self.semantic_cache.lookup(query, embedding=query_embedding)
+            if cached_response is not None:
+                yield cached_response["response"]
+                yield cached_response
+                return
+        
+        model = rate_limiter.choose_model(task_hint, allow_premium)
+        messages = self._build_messages(query, retrieved_documents)
+        
+        cache_key = rate_limiter.get_cache_key(model, messages, max_tokens=max_tokens)
+        cached_response = rate_limiter.get_cached_response(cache_key)
+        if cached_response:
+            yield cached_response["response"]
+            yield cached_response
+            return
+        
+        if not openai_breaker.allow_request():
+            result = mock_fallback.generate_response(query, retrieved_documents)
+            yield result["response"]
+            yield result
+            return
+        
+        estimated_tokens = sum(rate_limiter.estimate_tokens(msg["content"], model) for msg in messages)
+        rate_limiter.wait_for_capacity(model, estimated_tokens + max_tokens)
+        
+        parts = []
+        usage = None
+        failed = False
+        try:
+            stream = openai.chat.completions.create(
+                model=model,
+                messages=messages,
+                max_tokens=max_tokens,
+                temperature=self.temperature,
+                top_p=0.9,
+                stream=True,
+                stream_options={"include_usage": True}
+            )
+            for chunk in stream:
+                # The final chunk carries only usage and has no choices
+                if chunk.usage:
+                    usage = chunk.usage
+                if chunk.choices and chunk.choices[0].delta.content:
+                    parts.append(chunk.choices[0].delta.content)
+                    yield parts[-1]
+            openai_breaker.record_success()
+        except Exception as e:
+            print(f"❌ Failed to stream response: {e}")
+            if isinstance(e, (openai.RateLimitError, openai.APITimeoutError)):
+                openai_breaker.record_failure()
+            failed = True
+        finally:
+            openai_breaker.release_probe()
+        
+        if failed and not parts:
+            # Nothing shown yet, so the retrying non-streaming path can still answer
+            result = self.generate_response(
+                query, retrieved_documents, max_tokens, task_hint, allow_premium, query_embedding
+            )
+            yield result["response"]
+            yield result
+            return
+        
+        generated_response = "".join(parts)
+        input_tokens = usage.prompt_tokens if usage else estimated_tokens
+        output_tokens = usage.completion_tokens if usage else rate_limiter.estimate_tokens(generated_response, model)
+        rate_limiter.record_usage(model, input_tokens, output_tokens)
+        
+        result = {
+            "response": generated_response,
+            "confidence": self._calculate_confidence(retrieved_documents),
+            "sources_used": [doc.get("metadata", {}).get("source", "unknown") for doc in retrieved_documents],
+            "tokens_used": input_tokens + output_tokens,
+            "model": model,
+            "from_cache": False
+        }
+        
+        # Only complete answers are cached; a stream cut off mid-way is not
+        if usage is not None:
+            rate_limiter.cache_response(cache_key, result)
+            if self.semantic_cache is not None:
+                self.semantic_cache.store(query, result, embedding=query_embedding)
+        
+        yield result
+    
+    def _build_messages(self, query: str, retrieved_documents: List[Dict]) -> List[Dict]:
+        """
+        Build the chat messages for a query and its retrieved documents.
+        
+        Args:
+            query: User query
+            retrieved_documents: Retrieved documents
+            
+        Returns:
+            List of chat message dictionaries
+        """
+        context = self._prepare_context(retrieved_documents)
+        system_prompt = self._create_system_prompt()
+        user_prompt = self._create_user_prompt(query, context)
+        
+        return [
+            {"role": "system", "content": system_prompt[:2000]},  # Limit system prompt
+            {"role": "user", "content": user_prompt}
+        ]
+    
     def _create_system_prompt(self) -> str:
         """
         Create system prompt for NYC services assistant.
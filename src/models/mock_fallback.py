@@ -9,6 +9,17 @@ import random
 from typing import List, Dict, Optional
 from datetime import datetime
 
+from .circuit_breaker import openai_breaker
+from .ttl_cache import TTLCache
+
+# Query-specific lead-ins, checked in order; the first matching keyword wins
+RESPONSE_PREFIXES = (
+    (("apply",), "To answer your question about applying: "),
+    (("documents", "paperwork"), "Regarding required documentation: "),
+    (("status", "check"), "To check your status: "),
+    (("renew",), "For renewal information: "),
+)
+
 class MockFallbackManager:
     """
     Manages intelligent mock responses when API limits are exceeded.
@@ -20,11 +31,14 @@ class MockFallbackManager:
     - Zero API costs
     """
     
-    def __init__(self):
+    def __init__(self, cache_maxsize: int = 1024, cache_ttl: float = 600):
         self.fallback_active = False
         self.fallback_reason = None
         self.fallback_count = 0
         
+        # Memoized response text keyed on (service, normalized query)
+        self.response_cache = TTLCache(maxsize=cache_maxsize, ttl=cache_ttl)
+        
         # Service-specific mock responses
         self.service_responses = {
             "unemployment": [
@@ -60,6 +74,14 @@ class MockFallbackManager:
             "Many NYC services can be accessed online through the ACCESS NYC website, which provides applications and information for various benefit programs.",
             "For specific questions about eligibility and application processes, contact the relevant NYC agency directly or visit a local service center for in-person assistance."
         ]
+        
+        # Pre-render every (service, lead-in) combination once, so serving a
+        # mock response is a dict lookup and a random choice with no formatting
+        self._rendered_responses = {}
+        for service, responses in [*self.service_responses.items(), ("general", self.generic_responses)]:
+            self._rendered_responses[(service, "")] = tuple(responses)
+            for _, prefix in RESPONSE_PREFIXES:
+                self._rendered_responses[(service, prefix)] = tuple(prefix + response for response in responses)
     
     def activate_fallback(self, reason: str = "rate_limit"):
         """
@@ -83,6 +105,7 @@ class MockFallbackManager:
         self.fallback_active = False
         self.fallback_reason = None
         self.fallback_count = 0
+        self.response_cache.prune()
     
     def get_mock_llm_response(self, query: str, retrieved_documents: List[Dict]) -> Dict:
         """
@@ -100,15 +123,16 @@ class MockFallbackManager:
         # Detect service from query or documents
         service = self._detect_service(query, retrieved_documents)
         
-        # Get appropriate mock response
-        if service in self.service_responses:
-            responses = self.service_responses[service]
-            response_text = random.choice(responses)
-        else:
-            response_text = random.choice(self.generic_responses)
+        # Repeated queries reuse the same templated response
+        cache_key = (service, query.lower().strip())
+        response_text = self.response_cache.get(cache_key)
         
-        # Add query-specific context
-        response_text = self._customize_response(response_text, query)
+        if response_text is None:
+            # Get appropriate mock response with query-specific context
+            service_key = service if service in self.service_responses else "general"
+            responses = self._rendered_responses[(service_key, self._response_prefix(query))]
+            response_text = random.choice(responses)
+            self.response_cache.set(cache_key, response_text)
         
         # Extract sources from documents
         sources_used = []
@@ -131,6 +155,19 @@ class MockFallbackManager:
             "fallback_count": self.fallback_count
         }
     
+    def generate_response(self, query: str, retrieved_documents: List[Dict], **kwargs) -> Dict:
+        """
+        Drop-in replacement for LLMClient.generate_response.
+        
+        Args:
+            query: User query
+            retrieved_documents: Retrieved documents
+            
+        Returns:
+            Mock response dictionary compatible with real LLM responses
+        """
+        return self.get_mock_llm_response(query, retrieved_documents)
+    
     def get_mock_embeddings(self, texts: List[str]) -> List[List[float]]:
         """
         Generate mock embeddings that maintain system compatibility.
@@ -194,21 +231,19 @@ class MockFallbackManager:
         
         return "general"
     
-    def _customize_response(self, response: str, query: str) -> str:
-        """Customize the response based on the specific query."""
+    def _response_prefix(self, query: str) -> str:
+        """Pick the query-specific lead-in for a response ("" if none applies)."""
         query_lower = query.lower()
         
-        # Add query-specific details
-        if "apply" in query_lower:
-            response = f"To answer your question about applying: {response}"
-        elif "documents" in query_lower or "paperwork" in query_lower:
-            response = f"Regarding required documentation: {response}"
-        elif "status" in query_lower or "check" in query_lower:
-            response = f"To check your status: {response}"
-        elif "renew" in query_lower:
-            response = f"For renewal information: {response}"
-        
-        return response
+        for keywords, prefix in RESPONSE_PREFIXES:
+            if any(keyword in query_lower for keyword in keywords):
+                return prefix
+        
+        return ""
+    
+    def _customize_response(self, response: str, query: str) -> str:
+        """Customize the response based on the specific query."""
+        return self._response_prefix(query) + response
     
     def get_status_info(self) -> Dict:
         """Get current fallback status information."""
@@ -216,6 +251,8 @@ class MockFallbackManager:
             "fallback_active": self.fallback_active,
             "fallback_reason": self.fallback_reason,
             "fallback_count": self.fallback_count,
+            "circuit_state": openai_breaker.state,
+            "cache_info": self.response_cache.cache_info(),
             "timestamp": datetime.now().isoformat()
         }
 
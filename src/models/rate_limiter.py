@@ -4,22 +4,23 @@ Rate Limiting System for NYC Services GPT MVP
 Implements comprehensive rate limiting for OpenAI APIs with:
 - Leaky bucket queue for RPM/TPM limits
 - Exponential backoff with jitter
-- Token budget tracking
+- Token budget tracking (optionally shared across processes via Redis)
 - Model selection logic
 - Request caching for development
 """
 
 import os
 import time
-import math
-import json
 import random
 import hashlib
 from typing import Dict, Optional, Any, List
-from datetime import datetime, date
+from datetime import datetime, date, timedelta
 from dataclasses import dataclass
 from pathlib import Path
 
+from . import fast_json
+from .tokenizer import count_tokens, count_tokens_batch
+
 @dataclass
 class ModelConfig:
     rpm: int  # Requests per minute
@@ -58,6 +59,18 @@ class RateLimiter:
                 tpm=int(os.getenv("TPM_EMBED", "1000000")),
                 input_cost=0.10,
                 output_cost=0.0
+            ),
+            "text-embedding-3-small": ModelConfig(
+                rpm=int(os.getenv("RPM_EMBED", "3000")),
+                tpm=int(os.getenv("TPM_EMBED", "1000000")),
+                input_cost=0.02,
+                output_cost=0.0
+            ),
+            "text-embedding-3-large": ModelConfig(
+                rpm=int(os.getenv("RPM_EMBED", "3000")),
+                tpm=int(os.getenv("TPM_EMBED", "1000000")),
+                input_cost=0.13,
+                output_cost=0.0
             )
         }
         
@@ -67,11 +80,14 @@ class RateLimiter:
         # Budget tracking
         self.daily_budget = int(os.getenv("DAILY_TOKEN_BUDGET", "200000"))
         self.monthly_budget = int(os.getenv("MONTHLY_TOKEN_BUDGET", "2000000"))
-        self.daily_usage = 0
-        self.monthly_usage = 0
+        self._daily_usage = 0
+        self._monthly_usage = 0
         self.current_day = str(date.today())
         self.current_month = datetime.now().strftime("%Y-%m")
         
+        # Shared budget counters so concurrent scripts draw from one envelope
+        self.redis = self._connect_redis(os.getenv("REDIS_URL"))
+        
         # Caching for development
         self.cache = {}
         self.cache_ttl = int(os.getenv("DEV_CACHE_TTL_MS", "600000")) / 1000
@@ -85,9 +101,83 @@ class RateLimiter:
         
         print(f"🔧 Rate limiter initialized - Premium: {self.allow_premium}, Dev mode: {self.is_dev}")
     
-    def estimate_tokens(self, text: str) -> int:
-        """Estimate token count for text (rough approximation)."""
-        return math.ceil(len(text) / 4)
+    def _connect_redis(self, url: Optional[str]):
+        """Connect to Redis for shared budget tracking, or return None to stay in-memory."""
+        if not url:
+            return None
+        
+        try:
+            import redis
+            client = redis.Redis.from_url(url, socket_timeout=0.5, socket_connect_timeout=0.5)
+            client.ping()
+            print("🔧 Token budget shared via Redis")
+            return client
+        except Exception as e:
+            print(f"⚠️ Redis unavailable ({e}), tracking token budget in memory")
+            return None
+    
+    def _budget_keys(self):
+        """Redis keys and expiry timestamps for the current day and month."""
+        today = date.today()
+        next_month = (today.replace(day=1) + timedelta(days=32)).replace(day=1)
+        end_of_day = datetime.combine(today + timedelta(days=1), datetime.min.time())
+        end_of_month = datetime.combine(next_month, datetime.min.time())
+        return (
+            (f"llm:tokens:daily:{today.isoformat()}", int(end_of_day.timestamp())),
+            (f"llm:tokens:monthly:{today.strftime('%Y-%m')}", int(end_of_month.timestamp()))
+        )
+    
+    def _redis_failed(self, e: Exception):
+        """Drop back to in-memory budget tracking after a Redis error."""
+        print(f"⚠️ Redis error ({e}), tracking token budget in memory")
+        self.redis = None
+    
+    @property
+    def daily_usage(self) -> int:
+        """Tokens used today (shared across processes when Redis is configured)."""
+        if self.redis is not None:
+            try:
+                (daily_key, _), _ = self._budget_keys()
+                return int(self.redis.get(daily_key) or 0)
+            except Exception as e:
+                self._redis_failed(e)
+        return self._daily_usage
+    
+    @property
+    def monthly_usage(self) -> int:
+        """Tokens used this month (shared across processes when Redis is configured)."""
+        if self.redis is not None:
+            try:
+                _, (monthly_key, _) = self._budget_keys()
+                return int(self.redis.get(monthly_key) or 0)
+            except Exception as e:
+                self._redis_failed(e)
+        return self._monthly_usage
+    
+    def _add_budget_usage(self, tokens: int):
+        """Add tokens to the daily and monthly budget counters."""
+        self._daily_usage += tokens
+        self._monthly_usage += tokens
+        
+        if self.redis is not None:
+            try:
+                (daily_key, daily_expiry), (monthly_key, monthly_expiry) = self._budget_keys()
+                pipe = self.redis.pipeline()
+                pipe.incrby(daily_key, tokens)
+                pipe.expireat(daily_key, daily_expiry)
+                pipe.incrby(monthly_key, tokens)
+                pipe.expireat(monthly_key, monthly_expiry)
+                pipe.execute()
+            except Exception as e:
+                self._redis_failed(e)
+    
+    def estimate_tokens(self, text: str, model: Optional[str] = None) -> int:
+        """Count the tokens text costs for model (BPE-exact when tiktoken is installed)."""
+        return count_tokens(text, model)
+    
+    def estimate_tokens_batch(self, texts: List[str], model: Optional[str] = None) -> List[int]:
+        """Count the tokens each text costs for model with one batched tokenizer call."""
+        return count_tokens_batch(texts, model)
     
     def choose_model(self, task_hint: str = "", allow_premium: bool = None) -> str:
         """
@@ -132,12 +222,12 @@ class RateLimiter:
         # Reset daily usage if new day
         if today != self.current_day:
             self.current_day = today
-            self.daily_usage = 0
+            self._daily_usage = 0
         
         # Reset monthly usage if new month
         if this_month != self.current_month:
             self.current_month = this_month
-            self.monthly_usage = 0
+            self._monthly_usage = 0
     
     def can_make_request(self, model: str, estimated_tokens: int) -> bool:
         """
@@ -168,14 +258,17 @@ class RateLimiter:
             return False
         
         # Check budget limits
-        if self.daily_usage + estimated_tokens > self.daily_budget:
+        daily_usage = self.daily_usage
+        monthly_usage = self.monthly_usage
+        
+        if daily_usage + estimated_tokens > self.daily_budget:
             print(f"⚠️ Daily token budget ({self.daily_budget}) would be exceeded")
             # Activate mock fallback for budget protection
             from .mock_fallback import mock_fallback
             mock_fallback.activate_fallback("daily_budget_exceeded")
             return False
         
-        if self.monthly_usage + estimated_tokens > self.monthly_budget:
+        if monthly_usage + estimated_tokens > self.monthly_budget:
             print(f"⚠️ Monthly token budget ({self.monthly_budget}) would be exceeded")
             # Activate mock fallback for budget protection
             from .mock_fallback import mock_fallback
@@ -192,7 +285,14 @@ class RateLimiter:
             model: Model to wait for
             estimated_tokens: Estimated token usage
             max_wait: Maximum time to wait in seconds
+            
+        Raises:
+            ValueError: If model has no rate limit configuration
         """
+        # Unknown models can never get capacity; don't wait max_wait to find out
+        if model not in self.models:
+            raise ValueError(f"No rate limit configuration for model: {model}")
+        
         start_time = time.time()
         
         while not self.can_make_request(model, estimated_tokens):
@@ -219,8 +319,7 @@ class RateLimiter:
         self.usage[model]["tokens"].append((now, total_tokens))
         
         # Update budget tracking
-        self.daily_usage += total_tokens
-        self.monthly_usage += total_tokens
+        self._add_budget_usage(total_tokens)
         
         # Calculate cost
         config = self.models[model]
@@ -235,7 +334,7 @@ class RateLimiter:
             "messages": messages,
             **kwargs
         }
-        return hashlib.md5(json.dumps(cache_data, sort_keys=True).encode()).hexdigest()
+        return hashlib.md5(fast_json.dumps(cache_data, sort_keys=True).encode()).hexdigest()
     
     def get_cached_response(self, cache_key: str) -> Optional[Dict]:
         """Get cached response if available and not expired."""
@@ -6,28 +6,42 @@ leveraging existing LLMClient infrastructure for optimal performance.
 """
 
 import time
-from typing import List, Dict, Optional
+import asyncio
+from typing import Iterator, List, Dict, Optional, Tuple, Union
 from .llm_client import LLMClient
+from .async_utils import run_blocking
 from .mock_fallback import mock_fallback
-from ..retrieve.vector_store import init_vector_store
+from .ttl_cache import TTLCache
+from ..retrieve.vector_store import VectorStore, init_vector_store
 from ..ingest.data_processor import EmbeddingClient
 from ..config import config
 
+# Embeddings of recently asked questions, keyed on the normalized question text
+_question_embeddings = TTLCache(maxsize=4096, ttl=86400)
+
+# Embedding client shared by all questions (created on first use)
+_embedding_client = None
+
 
 def answer_with_rag(
     question: str, 
     top_k: int = 5, 
     filters: Optional[Dict] = None,
-    provider: str = "openai"
+    provider: str = "openai",
+    vector_store: Optional[VectorStore] = None
 ) -> Dict:
     """
     Main RAG function that routes queries through the appropriate provider.
     
+    Blocking wrapper around aanswer_with_rag; call that directly from code
+    that already runs an event loop.
+    
     Args:
         question: User's question about NYC services
         top_k: Number of document chunks to retrieve
         filters: Optional metadata filters (e.g., {"service_type": "SNAP"})
         provider: Provider to use ("openai", "gemini", "mock")
+        vector_store: Already-initialized vector store to reuse (opened per call if omitted)
         
     Returns:
         Dictionary with answer, sources, and metadata:
@@ -44,104 +58,269 @@ def answer_with_rag(
             }
         }
     """
+    return asyncio.run(aanswer_with_rag(question, top_k, filters, provider, vector_store))
+
+
+async def aanswer_with_rag(
+    question: str, 
+    top_k: int = 5, 
+    filters: Optional[Dict] = None,
+    provider: str = "openai",
+    vector_store: Optional[VectorStore] = None
+) -> Dict:
+    """
+    Async variant of answer_with_rag.
+    
+    The question is embedded while the vector store opens, so the first
+    request pays the slower of the two instead of their sum. Blocking
+    provider and Chroma calls run in the shared I/O thread pool.
+    
+    Args:
+        question: User's question about NYC services
+        top_k: Number of document chunks to retrieve
+        filters: Optional metadata filters (e.g., {"service_type": "SNAP"})
+        provider: Provider to use ("openai", "gemini", "mock")
+        vector_store: Already-initialized vector store to reuse (opened per call if omitted)
+        
+    Returns:
+        Same dictionary as answer_with_rag
+    """
     start_time = time.time()
     
-    # Initialize vector store
-    vs = init_vector_store()
+    try:
+        question_embedding, vs = await _prepare_query(question, vector_store)
+    except Exception as e:
+        return _build_response(f"❌ An error occurred: {str(e)}. Please try again.", [], start_time, "error", top_k)
+    
     if not vs:
-        return {
-            "answer": "❌ Failed to initialize vector store. Please try again.",
-            "sources": [],
-            "meta": {
-                "latency_ms": int((time.time() - start_time) * 1000),
-                "provider": "error",
-                "top_k": top_k,
-                "re_ranked": False,
-                "tokens_used": 0,
-                "cost_estimate": 0.0
-            }
-        }
+        return _build_response("❌ Failed to initialize vector store. Please try again.", [], start_time, "error", top_k)
     
     try:
-        # Generate embedding for the question
-        embedding_client = EmbeddingClient()
-        question_embedding = embedding_client.get_embedding(question)
-        
         # Retrieve relevant documents
-        retrieved_docs = vs.query_vector_store(
+        retrieved_docs = await run_blocking(
+            vs.query_vector_store,
             query_embedding=question_embedding,
             top_k=top_k,
             filter_metadata=filters
         )
         
         if not retrieved_docs:
-            return {
-                "answer": "I couldn't find specific information about that. Please try rephrasing your question about NYC services.",
-                "sources": [],
-                "meta": {
-                    "latency_ms": int((time.time() - start_time) * 1000),
-                    "provider": "no_results",
-                    "top_k": top_k,
-                    "re_ranked": False,
-                    "tokens_used": 0,
-                    "cost_estimate": 0.0
-                }
-            }
+            return _build_response(
+                "I couldn't find specific information about that. Please try rephrasing your question about NYC services.",
+                [], start_time, "no_results", top_k
+            )
         
-        # Route to appropriate provider
-        if provider == "mock" or not config.use_real_llm:
-            response = _generate_mock_response(question, retrieved_docs)
-            provider_used = "mock"
-        elif provider == "openai":
-            response = _generate_openai_response(question, retrieved_docs)
-            provider_used = "openai"
-        elif provider == "gemini":
-            response = _generate_gemini_response(question, retrieved_docs)
-            provider_used = "gemini"
-        else:
-            # Fallback to OpenAI
-            response = _generate_openai_response(question, retrieved_docs)
-            provider_used = "openai"
+        response, provider_used = await run_blocking(
+            _route_to_provider, provider, question, retrieved_docs, question_embedding
+        )
         
-        # Calculate metadata
-        latency_ms = int((time.time() - start_time) * 1000)
+        return _build_response(
+            response.get("response", "No response generated"),
+            _format_sources(retrieved_docs),
+            start_time,
+            provider_used,
+            top_k,
+            response.get("tokens_used", 0)
+        )
         
-        return {
-            "answer": response.get("response", "No response generated"),
-            "sources": _format_sources(retrieved_docs),
-            "meta": {
-                "latency_ms": latency_ms,
-                "provider": provider_used,
-                "top_k": top_k,
-                "re_ranked": False,  # TODO: implement re-ranking in future
-                "tokens_used": response.get("tokens_used", 0),
-                "cost_estimate": _estimate_cost(response.get("tokens_used", 0), provider_used)
-            }
-        }
+    except Exception as e:
+        return _build_response(f"❌ An error occurred: {str(e)}. Please try again.", [], start_time, "error", top_k)
+
+
+def embed_question(question: str):
+    """
+    Embed a question, reusing the vector of an earlier identical question.
+    
+    Questions are normalized (case, whitespace) before embedding, so repeated
+    and example questions skip the embedding round-trip entirely. Misses go
+    through the shared EmbeddingClient, whose disk cache survives restarts.
+    
+    Args:
+        question: User's question
+        
+    Returns:
+        Question embedding vector
+    """
+    return embed_questions([question])[0]
+
+
+def embed_questions(questions: List[str]) -> List:
+    """
+    Embed several questions, sending all uncached ones in a single request.
+    
+    Args:
+        questions: User questions
         
+    Returns:
+        Embedding vectors aligned with questions
+    """
+    global _embedding_client
+    text_keys = [" ".join(question.lower().split()) for question in questions]
+    embeddings = [_question_embeddings.get(text_key) for text_key in text_keys]
+    
+    missing = sorted({text_key for text_key, embedding in zip(text_keys, embeddings) if embedding is None})
+    if missing:
+        if _embedding_client is None:
+            _embedding_client = EmbeddingClient()
+        fresh = dict(zip(missing, _embedding_client.get_embeddings(missing)))
+        
+        # Mock embeddings are placeholders; don't let them outlive the fallback
+        if not mock_fallback.fallback_active:
+            for text_key, embedding in fresh.items():
+                _question_embeddings.set(text_key, embedding)
+        embeddings = [fresh[text_key] if embedding is None else embedding for text_key, embedding in zip(text_keys, embeddings)]
+    
+    return embeddings
+
+
+async def _prepare_query(question: str, vector_store: Optional[VectorStore]) -> Tuple[List[float], Optional[VectorStore]]:
+    """
+    Embed the question and open the vector store concurrently.
+    
+    Returns:
+        Tuple of (question_embedding, vector_store); vector_store is None if it failed to open
+    """
+    if vector_store is not None:
+        return await run_blocking(embed_question, question), vector_store
+    
+    question_embedding, vs = await asyncio.gather(
+        run_blocking(embed_question, question),
+        run_blocking(init_vector_store)
+    )
+    return question_embedding, vs
+
+
+def _route_to_provider(provider: str, question: str, retrieved_docs: List[Dict], question_embedding) -> Tuple[Dict, str]:
+    """Generate the answer with the requested provider; returns (response, provider_used)"""
+    if provider == "mock" or not config.use_real_llm:
+        return _generate_mock_response(question, retrieved_docs), "mock"
+    elif provider == "gemini":
+        return _generate_gemini_response(question, retrieved_docs), "gemini"
+    else:
+        # OpenAI, also the fallback for unknown providers
+        return _generate_openai_response(question, retrieved_docs, question_embedding), "openai"
+
+
+def answer_with_rag_stream(
+    question: str,
+    top_k: int = 5,
+    filters: Optional[Dict] = None,
+    provider: str = "openai",
+    vector_store: Optional[VectorStore] = None
+) -> Iterator[Union[str, Dict]]:
+    """
+    Streaming variant of answer_with_rag.
+    
+    OpenAI answers are yielded token by token so the UI can render the first
+    words while the rest is still generating. Other providers, and requests
+    that end early (no vector store, no results, errors), yield their whole
+    answer as one chunk.
+    
+    Args:
+        question: User's question about NYC services
+        top_k: Number of document chunks to retrieve
+        filters: Optional metadata filters (e.g., {"service_type": "SNAP"})
+        provider: Provider to use ("openai", "gemini", "mock")
+        vector_store: Already-initialized vector store to reuse (opened per call if omitted)
+        
+    Yields:
+        Answer text chunks, then the full response dictionary (same shape as
+        answer_with_rag) as the last item
+    """
+    if provider in ("mock", "gemini") or not config.use_real_llm:
+        response = answer_with_rag(question, top_k, filters, provider, vector_store=vector_store)
+        yield response["answer"]
+        yield response
+        return
+    
+    start_time = time.time()
+    try:
+        question_embedding, vs = asyncio.run(_prepare_query(question, vector_store))
+        if not vs:
+            response = _build_response("❌ Failed to initialize vector store. Please try again.", [], start_time, "error", top_k)
+            yield response["answer"]
+            yield response
+            return
+        
+        retrieved_docs = vs.query_vector_store(
+            query_embedding=question_embedding,
+            top_k=top_k,
+            filter_metadata=filters
+        )
     except Exception as e:
-        return {
-            "answer": f"❌ An error occurred: {str(e)}. Please try again.",
-            "sources": [],
-            "meta": {
-                "latency_ms": int((time.time() - start_time) * 1000),
-                "provider": "error",
-                "top_k": top_k,
-                "re_ranked": False,
-                "tokens_used": 0,
-                "cost_estimate": 0.0
-            }
+        response = _build_response(f"❌ An error occurred: {str(e)}. Please try again.", [], start_time, "error", top_k)
+        yield response["answer"]
+        yield response
+        return
+    
+    if not retrieved_docs:
+        response = _build_response(
+            "I couldn't find specific information about that. Please try rephrasing your question about NYC services.",
+            [], start_time, "no_results", top_k
+        )
+        yield response["answer"]
+        yield response
+        return
+    
+    result = {}
+    try:
+        for chunk in LLMClient().stream_response(
+            query=question,
+            retrieved_documents=retrieved_docs,
+            max_tokens=300,
+            query_embedding=question_embedding
+        ):
+            if isinstance(chunk, dict):
+                result = chunk
+            else:
+                yield chunk
+    except Exception as e:
+        print(f"OpenAI error: {e}")
+        result = _generate_mock_response(question, retrieved_docs)
+        yield result["response"]
+    
+    yield _build_response(
+        result.get("response", "No response generated"),
+        _format_sources(retrieved_docs),
+        start_time,
+        "openai",
+        top_k,
+        result.get("tokens_used", 0)
+    )
+
+
+def _build_response(
+    answer: str,
+    sources: List[Dict],
+    start_time: float,
+    provider: str,
+    top_k: int,
+    tokens_used: int = 0
+) -> Dict:
+    """Assemble the answer/sources/meta dictionary returned to the UI"""
+    return {
+        "answer": answer,
+        "sources": sources,
+        "meta": {
+            "latency_ms": int((time.time() - start_time) * 1000),
+            "provider": provider,
+            "top_k": top_k,
+            "re_ranked": False,  # TODO: implement re-ranking in future
+            "tokens_used": tokens_used,
+            "cost_estimate": _estimate_cost(tokens_used, provider)
         }
+    }
 
 
-def _generate_openai_response(question: str, retrieved_docs: List[Dict]) -> Dict:
-    """Generate response using OpenAI LLM"""
+def _generate_openai_response(question: str, retrieved_docs: List[Dict], question_embedding=None) -> Dict:
+    """Generate response using OpenAI LLM (paraphrased questions hit the semantic cache)"""
     try:
         llm_client = LLMClient()
         return llm_client.generate_response(
             query=question,
             retrieved_documents=retrieved_docs,
-            max_tokens=300
+            max_tokens=300,
+            query_embedding=question_embedding
         )
     except Exception as e:
         print(f"OpenAI error: {e}")
@@ -0,0 +1,260 @@
+"""
+Semantic Cache for LLM Responses in NYC Services GPT
+
+Returns a previously generated answer when a new query is semantically
+equivalent to one already answered (e.g. "How do I apply for unemployment
+benefits in NYC?" vs "How do I apply for unemployment benefits?").
+Query embeddings and responses persist in a small Chroma collection that
+reuses the existing vector store infrastructure; lookups run against an
+in-memory matrix of L2-normalized embeddings, so finding the nearest cached
+query is a single BLAS matrix-vector product.
+
+The similarity threshold adapts to user feedback: when too many semantic
+hits are rated low quality the threshold tightens, and when quality is
+comfortably above target it relaxes to serve more hits.
+"""
+
+import uuid
+import threading
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from ..retrieve.vector_store import VectorStore
+from .mock_fallback import mock_fallback
+from . import fast_json
+
+
+class SemanticCache:
+    """
+    Embedding-similarity cache in front of LLMClient.generate_response.
+    
+    The Chroma collection is created lazily on first use so constructing
+    the cache (or an LLMClient) stays cheap.
+    """
+    
+    def __init__(
+        self,
+        threshold: float = 0.92,
+        target_quality: float = 0.85,
+        step: float = 0.01,
+        min_threshold: float = 0.80,
+        max_threshold: float = 0.99,
+        db_path: Optional[str] = None,
+        collection_name: str = "llm_semantic_cache",
+        growth_rows: int = 1024
+    ):
+        """
+        Initialize the semantic cache.
+        
+        Args:
+            threshold: Initial cosine similarity required for a hit (t_s)
+            target_quality: Target share of semantic hits rated high quality
+            step: Amount t_s moves after each feedback signal
+            min_threshold: Lower bound for t_s
+            max_threshold: Upper bound for t_s
+            db_path: Path to vector database (defaults to config)
+            collection_name: Name of the cache collection
+            growth_rows: Rows added to the in-memory matrix each time it fills up
+        """
+        self.threshold = threshold
+        self.target_quality = target_quality
+        self.step = step
+        self.min_threshold = min_threshold
+        self.max_threshold = max_threshold
+        
+        self.vector_store = VectorStore(db_path=db_path, collection_name=collection_name)
+        self.collection = None
+        self._embedding_client = None
+        self._init_failed = False
+        
+        # Normalized query embeddings (first _size rows are valid) and the
+        # JSON-encoded responses aligned with them
+        self.growth_rows = growth_rows
+        self._matrix = None
+        self._size = 0
+        self._responses: List[str] = []
+        self._lock = threading.Lock()
+        
+        self.stats = {"hits": 0, "misses": 0, "high_quality": 0, "low_quality": 0}
+    
+    def _get_collection(self):
+        """Create the cache collection on first use and load it into memory."""
+        if self.collection is None and not self._init_failed:
+            if self.vector_store.init_vector_store():
+                self.collection = self.vector_store.client.get_or_create_collection(
+                    name=self.vector_store.collection_name,
+                    metadata={"hnsw:space": "cosine"}
+                )
+                self._load_matrix()
+            else:
+                self._init_failed = True
+        return self.collection
+    
+    def _load_matrix(self):
+        """Mirror the persisted cache entries into the in-memory matrix."""
+        try:
+            entries = self.collection.get(include=["embeddings", "metadatas"])
+        except Exception as e:
+            print(f"⚠️ Could not load semantic cache entries: {e}")
+            return
+        
+        if len(entries["ids"]):
+            self._append_rows(
+                entries["embeddings"],
+                [metadata["response"] for metadata in entries["metadatas"]]
+            )
+    
+    def _append_rows(self, embeddings, responses: List[str]):
+        """
+        Normalize embeddings and append them to the matrix.
+        
+        Capacity grows in blocks of growth_rows so storing one entry at a
+        time doesn't copy the whole matrix on every insert.
+        """
+        rows = np.asarray(embeddings, dtype=np.float32)
+        if rows.ndim == 1:
+            rows = rows.reshape(1, -1)
+        norms = np.linalg.norm(rows, axis=1, keepdims=True)
+        rows = rows / np.where(norms == 0, 1, norms)
+        
+        with self._lock:
+            needed = self._size + len(rows)
+            if self._matrix is None or needed > len(self._matrix):
+                capacity = -(-needed // self.growth_rows) * self.growth_rows
+                matrix = np.empty((capacity, rows.shape[1]), dtype=np.float32)
+                if self._size:
+                    matrix[:self._size] = self._matrix[:self._size]
+                self._matrix = matrix
+            
+            self._matrix[self._size:needed] = rows
+            self._responses.extend(responses)
+            self._size = needed
+    
+    def _nearest(self, embedding) -> Optional[tuple]:
+        """Return (similarity, response JSON) of the most similar cached query."""
+        query = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(query)
+        if norm == 0:
+            return None
+        
+        with self._lock:
+            if not self._size:
+                return None
+            similarities = self._matrix[:self._size] @ (query / norm)
+            best = int(similarities.argmax())
+            return float(similarities[best]), self._responses[best]
+    
+    def _embed(self, query: str):
+        """Embed a query with the shared embedding client."""
+        if self._embedding_client is None:
+            # Imported here to avoid loading the ingest pipeline until needed
+            from ..ingest.data_processor import EmbeddingClient
+            self._embedding_client = EmbeddingClient()
+        return self._embedding_client.get_embedding(query)
+    
+    def lookup(self, query: str, embedding=None) -> Optional[Dict]:
+        """
+        Return the cached response for a semantically equivalent query.
+        
+        Args:
+            query: User query
+            embedding: Query embedding, if the caller already computed it for retrieval
+        
+        Returns:
+            Cached response dictionary, or None on a miss
+        """
+        # Mock embeddings are identical for every query and would always "hit"
+        if mock_fallback.fallback_active:
+            return None
+        
+        if self._get_collection() is None or not self._size:
+            self.stats["misses"] += 1
+            return None
+        
+        try:
+            nearest = self._nearest(self._embed(query) if embedding is None else embedding)
+        except Exception as e:
+            print(f"⚠️ Semantic cache lookup failed: {e}")
+            return None
+        
+        if mock_fallback.fallback_active or nearest is None:
+            self.stats["misses"] += 1
+            return None
+        
+        similarity, response_json = nearest
+        if similarity < self.threshold:
+            self.stats["misses"] += 1
+            return None
+        
+        self.stats["hits"] += 1
+        response = fast_json.loads(response_json)
+        response["from_cache"] = True
+        response["semantic_cache"] = {"similarity": similarity, "threshold": self.threshold}
+        return response
+    
+    def store(self, query: str, response: Dict, embedding=None):
+        """
+        Cache a freshly generated response for future similar queries.
+        
+        Args:
+            query: User query that produced the response
+            response: Response dictionary from the LLM
+            embedding: Query embedding, if the caller already computed it
+        """
+        if mock_fallback.fallback_active or str(response.get("model", "")).startswith("mock"):
+            return
+        
+        collection = self._get_collection()
+        if collection is None:
+            return
+        
+        try:
+            if embedding is None:
+                embedding = self._embed(query)
+            if mock_fallback.fallback_active:
+                return
+            response_json = fast_json.dumps(response)
+            collection.add(
+                ids=[str(uuid.uuid4())],
+                embeddings=[embedding],
+                documents=[query],
+                metadatas=[{"response": response_json}]
+            )
+            self._append_rows(embedding, [response_json])
+        except Exception as e:
+            print(f"⚠️ Failed to store response in semantic cache: {e}")
+    
+    def record_feedback(self, high_quality: bool):
+        """
+        Record user feedback on a semantic hit and adapt the threshold.
+        
+        Nudges t_s up by one step when the observed quality rate is below
+        target, and down by one step when it is at or above target.
+        
+        Args:
+            high_quality: Whether the user rated the cached answer as helpful
+        """
+        self.stats["high_quality" if high_quality else "low_quality"] += 1
+        rated = self.stats["high_quality"] + self.stats["low_quality"]
+        quality_rate = self.stats["high_quality"] / rated
+        
+        if quality_rate < self.target_quality:
+            self.threshold = min(self.max_threshold, self.threshold + self.step)
+        else:
+            self.threshold = max(self.min_threshold, self.threshold - self.step)
+    
+    def get_status_info(self) -> Dict:
+        """Get current semantic cache status."""
+        rated = self.stats["high_quality"] + self.stats["low_quality"]
+        return {
+            "threshold": self.threshold,
+            "target_quality": self.target_quality,
+            "quality_rate": self.stats["high_quality"] / rated if rated else None,
+            "entries": self._size,
+            **self.stats
+        }
+
+
+# Global semantic cache instance
+semantic_cache = SemanticCache()
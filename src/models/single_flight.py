@@ -0,0 +1,71 @@
+"""
+Single-Flight Call Deduplication for NYC Services GPT
+
+Collapses concurrent calls for the same key into one, so a popular question
+whose cached answer just expired reaches the LLM once instead of once per
+waiting request (cache stampede protection).
+"""
+
+import threading
+from typing import Any, Callable, Dict, Hashable
+
+
+class _Call:
+    """One in-flight computation and the result its followers will share."""
+
+    __slots__ = ("done", "result", "ok")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.ok = False
+
+
+class SingleFlight:
+    """
+    Run at most one call per key at a time.
+
+    The first caller for a key (the leader) runs the function; callers that
+    arrive while it is running wait for and return the leader's result. If
+    the leader fails or takes longer than timeout, a waiting caller runs the
+    function itself.
+    """
+
+    def __init__(self, timeout: float = 30):
+        """
+        Initialize the group.
+
+        Args:
+            timeout: Seconds a follower waits for the leader before computing itself
+        """
+        self.timeout = timeout
+        self.shared = 0
+        self._calls: Dict[Hashable, _Call] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        """Return fn(), sharing one call among concurrent callers with the same key."""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            if call.done.wait(self.timeout) and call.ok:
+                with self._lock:
+                    self.shared += 1
+                return call.result
+            return fn()
+
+        try:
+            call.result = fn()
+            call.ok = True
+            return call.result
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    def __len__(self) -> int:
+        return len(self._calls)
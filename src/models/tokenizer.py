@@ -0,0 +1,71 @@
+"""
+Token Counting for NYC Services GPT
+
+Counts tokens with the provider's real BPE encoding (via tiktoken) so budget
+checks and document statistics match what OpenAI actually bills. When
+tiktoken is not installed, falls back to the ~4 characters per token
+approximation.
+"""
+
+import os
+import math
+from functools import lru_cache
+from typing import List, Optional
+
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None
+
+DEFAULT_TOKENIZER_MODEL = "gpt-4o-mini"
+
+
+@lru_cache(maxsize=8)
+def _get_encoding(model: str):
+    """Load (once per model) the tiktoken encoding for model."""
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        # Unknown model names share the encoding of the current chat models
+        return tiktoken.get_encoding("o200k_base")
+
+
+def count_tokens(text: str, model: Optional[str] = None) -> int:
+    """
+    Count the tokens text costs for model.
+    
+    Args:
+        text: Text to count
+        model: OpenAI model name (defaults to gpt-4o-mini)
+    
+    Returns:
+        Number of BPE tokens, or an approximation if tiktoken is unavailable
+    """
+    if not text:
+        return 0
+    
+    if tiktoken is None:
+        return math.ceil(len(text) / 4)
+    
+    return len(_get_encoding(model or DEFAULT_TOKENIZER_MODEL).encode_ordinary(text))
+
+
+def count_tokens_batch(texts: List[str], model: Optional[str] = None) -> List[int]:
+    """
+    Count the tokens each of texts costs for model in one tokenizer call.
+    
+    tiktoken encodes the batch on a thread pool outside the GIL, which is
+    much faster than calling count_tokens once per text.
+    
+    Args:
+        texts: Texts to count
+        model: OpenAI model name (defaults to gpt-4o-mini)
+    
+    Returns:
+        Token count of each text, in input order
+    """
+    if tiktoken is None:
+        return [math.ceil(len(text) / 4) for text in texts]
+    
+    encoding = _get_encoding(model or DEFAULT_TOKENIZER_MODEL)
+    return [len(tokens) for tokens in encoding.encode_ordinary_batch(texts, num_threads=os.cpu_count() or 1)]
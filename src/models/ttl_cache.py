@@ -0,0 +1,88 @@
+"""
+In-Process TTL Cache for NYC Services GPT
+
+Small LRU cache with per-entry expiry used to memoize hot, repeatable
+work (mock responses, query results) within a single process.
+"""
+
+import time
+import random
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional
+
+
+class TTLCache:
+    """
+    Thread-safe LRU cache whose entries expire after ttl seconds.
+
+    Lookups and inserts are O(1); once maxsize is reached the least
+    recently used entry is evicted.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 600, jitter: float = 0.0):
+        """
+        Initialize the cache.
+
+        Args:
+            maxsize: Maximum number of entries kept
+            ttl: Time-to-live for each entry in seconds
+            jitter: Extra random lifetime as a fraction of ttl, so entries
+                written together do not all expire together
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.jitter = jitter
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the cached value for key, or None if missing or expired."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or time.time() > entry[0]:
+                if entry is not None:
+                    del self._data[key]
+                self.misses += 1
+                return None
+
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key: Hashable, value: Any):
+        """Store value under key, evicting the least recently used entry if full."""
+        with self._lock:
+            ttl = self.ttl + random.uniform(0, self.ttl * self.jitter) if self.jitter else self.ttl
+            self._data[key] = (time.time() + ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def prune(self):
+        """Drop all expired entries."""
+        now = time.time()
+        with self._lock:
+            for key in [key for key, (expires, _) in self._data.items() if now > expires]:
+                del self._data[key]
+
+    def clear(self):
+        """Remove all entries."""
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def cache_info(self) -> Dict:
+        """Get cache statistics."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "ttl": self.ttl,
+            "jitter": self.jitter
+        }
@@ -12,6 +12,7 @@ The interface is designed to be easily switchable between different vector store
 import os
 from typing import List, Dict, Optional, Any
 from pathlib import Path
+import numpy as np
 import chromadb
 from chromadb.config import Settings
 
@@ -98,7 +99,8 @@ class VectorStore:
                 {
                     "text": str,
                     "embedding": List[float],
-                    "metadata": Dict
+                    "metadata": Dict,
+                    "embedding_scale": float  # Optional, for int8 embeddings
                 }
         
         Returns:
@@ -111,30 +113,68 @@ class VectorStore:
             >>> vector_store.add_documents(records)
             True
         """
+        try:
+            # Prepare data for ChromaDB; embeddings go over as one float32 matrix
+            embeddings = np.asarray([record["embedding"] for record in records], dtype=np.float32) if records else []
+            if records and embeddings.ndim != 2:
+                raise ValueError("every record needs an embedding vector of the same length")
+            if any("embedding_scale" in record for record in records):
+                # Dequantize int8 records (see data_processor.quantize_embeddings)
+                embeddings *= np.asarray([record.get("embedding_scale", 1.0) for record in records], dtype=np.float32)[:, None]
+            documents = [record["text"] for record in records]
+            metadatas = [record["metadata"] for record in records]
+        except Exception as e:
+            print(f"❌ Failed to add documents: {e}")
+            return False
+        
+        return self.add_arrays(
+            ids=[f"doc_{i}" for i in range(len(records))],
+            embeddings=embeddings,
+            documents=documents,
+            metadatas=metadatas
+        )
+    
+    def add_arrays(
+        self,
+        ids: List[str],
+        embeddings: List[List[float]],
+        documents: List[str],
+        metadatas: List[Dict]
+    ) -> bool:
+        """
+        Add documents to the vector store from parallel arrays.
+        
+        Passes the arrays straight to a single collection.add call, so callers
+        that already hold ids, embeddings, texts and metadata as lists skip
+        building per-record dictionaries.
+        
+        Args:
+            ids: Unique document ids
+            embeddings: Embedding vectors, aligned with ids
+            documents: Document texts, aligned with ids
+            metadatas: Metadata dictionaries, aligned with ids
+        
+        Returns:
+            True if documents added successfully, False otherwise
+        """
         if not self.collection:
             print("❌ Vector store not initialized. Call init_vector_store() first.")
             return False
         
-        if not records:
+        if not ids:
             print("⚠️ No records to add")
             return True
         
         try:
-            # Prepare data for ChromaDB
-            texts = [record["text"] for record in records]
-            embeddings = [record["embedding"] for record in records]
-            metadatas = [record["metadata"] for record in records]
-            ids = [f"doc_{i}" for i in range(len(records))]
-            
             # Add documents to collection
             self.collection.add(
-                documents=texts,
+                documents=documents,
                 embeddings=embeddings,
                 metadatas=metadatas,
                 ids=ids
             )
             
-            print(f"✅ Added {len(records)} documents to vector store")
+            print(f"✅ Added {len(ids)} documents to vector store")
             print(f"📊 Total documents in collection: {self.collection.count()}")
             return True
             
@@ -142,6 +182,65 @@ class VectorStore:
             print(f"❌ Failed to add documents: {e}")
             return False
     
+    def get_embeddings_by_hash(self, chunk_hashes: List[str], batch_size: int = 500) -> Dict[str, Any]:
+        """
+        Look up stored embeddings by the chunk_hash metadata field.
+        
+        Lets ingestion reuse the embedding of any chunk whose exact text is
+        already in the collection instead of paying for it again.
+        
+        Args:
+            chunk_hashes: Content hashes to look up
+            batch_size: Hashes per collection.get call
+            
+        Returns:
+            Dictionary mapping each found hash to its embedding
+        """
+        if not self.collection:
+            print("❌ Vector store not initialized. Call init_vector_store() first.")
+            return {}
+        
+        found = {}
+        try:
+            for start in range(0, len(chunk_hashes), batch_size):
+                results = self.collection.get(
+                    where={"chunk_hash": {"$in": chunk_hashes[start:start + batch_size]}},
+                    include=["embeddings", "metadatas"]
+                )
+                for metadata, embedding in zip(results["metadatas"], results["embeddings"]):
+                    found[metadata["chunk_hash"]] = embedding
+        except Exception as e:
+            print(f"⚠️ Could not look up existing embeddings: {e}")
+        
+        return found
+    
+    def delete_ids(self, ids: List[str]) -> bool:
+        """
+        Delete documents from the vector store by id.
+        
+        Used to drop the chunks of a document before re-ingesting a changed version.
+        
+        Args:
+            ids: Document ids to delete
+        
+        Returns:
+            True if documents deleted successfully, False otherwise
+        """
+        if not self.collection:
+            print("❌ Vector store not initialized. Call init_vector_store() first.")
+            return False
+        
+        if not ids:
+            return True
+        
+        try:
+            self.collection.delete(ids=ids)
+            print(f"🗑️ Deleted {len(ids)} documents from vector store")
+            return True
+        except Exception as e:
+            print(f"❌ Failed to delete documents: {e}")
+            return False
+    
     def query_vector_store(
         self, 
         query_embedding: List[float], 
@@ -309,6 +408,31 @@ def add_documents(vector_store: VectorStore, records: List[Dict]) -> bool:
     return vector_store.add_documents(records)
 
 
+def add_arrays(
+    vector_store: VectorStore,
+    ids: List[str],
+    embeddings: List[List[float]],
+    documents: List[str],
+    metadatas: List[Dict]
+) -> bool:
+    """
+    Add documents to the vector store from parallel arrays.
+    
+    Convenience function for bulk-adding pre-built arrays in one call.
+    
+    Args:
+        vector_store: Initialized VectorStore instance
+        ids: Unique document ids
+        embeddings: Embedding vectors, aligned with ids
+        documents: Document texts, aligned with ids
+        metadatas: Metadata dictionaries, aligned with ids
+        
+    Returns:
+        True if documents added successfully, False otherwise
+    """
+    return vector_store.add_arrays(ids, embeddings, documents, metadatas)
+
+
 def query_vector_store(
     vector_store: VectorStore, 
     query_embedding: List[float], 
@@ -4,14 +4,17 @@ Tests core functionality without memory-intensive operations
 """
 
 import pytest
+import numpy as np
+from array import array
+from pathlib import Path
 from unittest.mock import patch, MagicMock
 
 # Import the chunker module
-import sys
-import os
-sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
-
-from ingest.chunker import chunk_documents, count_tokens, validate_chunks, simple_tokenize
+from src.ingest.chunker import (
+    chunk_documents, chunk_documents_with_index, iter_chunks_with_index, chunk_texts, chunk_files,
+    chunk_text_stream, chunk_large_text_streaming, count_tokens, validate_chunks, simple_tokenize,
+    tokenize_with_offsets, token_offsets, compute_windows, _compute_windows_py, _split_document, is_file_path, read_text_file, MMAP_MIN_BYTES
+)
 
 class TestChunkerSimple:
     """Simplified test cases for document chunking functionality"""
@@ -106,6 +109,135 @@ class TestChunkerSimple:
         for chunk in chunks:
             token_count = count_tokens(chunk)
             assert token_count <= 20
+    
+    def test_chunk_documents_with_index(self):
+        """Test that indexed chunks match chunk_documents and carry their positions"""
+        docs = ["w0 w1 w2 w3 w4 w5", "short doc"]
+        
+        indexed = chunk_documents_with_index(docs, chunk_size=4, overlap=1)
+        
+        assert indexed == [(0, 0, "w0 w1 w2 w3"), (0, 1, "w3 w4 w5"), (1, 0, "short doc")]
+        assert [chunk for _, _, chunk in indexed] == chunk_documents(docs, chunk_size=4, overlap=1)
+        assert list(iter_chunks_with_index(iter(docs), chunk_size=4, overlap=1)) == indexed
+    
+    def test_tokenize_with_offsets(self):
+        """Test that token offsets point back into the original text"""
+        text = "  SNAP\tbenefits\n apply "
+        
+        tokens, starts, ends = tokenize_with_offsets(text)
+        
+        assert tokens == simple_tokenize(text)
+        assert [text[s:e] for s, e in zip(starts, ends)] == tokens
+        assert token_offsets(text) == (array('q', starts), array('q', ends))
+    
+    def test_chunk_documents_parallel_matches_serial(self):
+        """Test that the process-pool path returns the serial chunks in document order"""
+        docs = [" ".join(f"d{d}w{i}" for i in range(50)) for d in range(8)]
+        serial = chunk_documents(docs, chunk_size=20, overlap=5)
+        
+        with patch('src.ingest.chunker.os.cpu_count', return_value=4), patch('src.ingest.chunker.PARALLEL_MIN_CHARS', 0):
+            assert chunk_documents(docs, chunk_size=20, overlap=5) == serial
+    
+    def test_chunk_documents_without_overlap(self):
+        """Test that overlap=0 produces back-to-back chunks covering every token once"""
+        doc = "w0 w1\nw2 w3 w4 w5 w6"
+        
+        assert chunk_documents([doc], chunk_size=3, overlap=0) == ["w0 w1\nw2", "w3 w4 w5", "w6"]
+        assert chunk_documents([doc], chunk_size=7, overlap=0) == [doc]
+    
+    def test_compute_windows(self):
+        """Test that window bounds step by chunk_size - overlap and end at the last token"""
+        assert [tuple(w) for w in compute_windows(10, 4, 1)] == [(0, 4), (3, 7), (6, 10)]
+        assert [tuple(w) for w in compute_windows(11, 4, 1)] == [(0, 4), (3, 7), (6, 10), (9, 11)]
+        assert [tuple(w) for w in compute_windows(3, 4, 1)] == [(0, 3)]
+    
+    def test_compute_windows_jit_matches_python(self):
+        """Test that the numba kernel used for huge documents returns the pure-Python bounds"""
+        pytest.importorskip("numba")
+        with patch('src.ingest.chunker.JIT_MIN_TOKENS', 0):
+            for n_tokens, chunk_size, overlap in [(10, 4, 1), (11, 4, 1), (3, 4, 1), (9, 3, 5), (20, 5, 0)]:
+                windows = compute_windows(n_tokens, chunk_size, overlap)
+                assert windows.dtype == np.int64
+                assert [tuple(w) for w in windows] == _compute_windows_py(n_tokens, chunk_size, overlap)
+    
+    def test_chunk_documents_slices_original_text(self):
+        """Test that multi-chunk documents keep the original whitespace inside each chunk"""
+        doc = "w0 w1\nw2  w3 w4\n\nw5"
+        
+        chunks = chunk_documents([doc], chunk_size=4, overlap=1)
+        
+        assert chunks == ["w0 w1\nw2  w3", "w3 w4\n\nw5"]
+    
+    def test_chunk_large_text_streaming_line_overlap(self):
+        """Test that streamed line chunks carry trailing lines within the overlap budget"""
+        text = "a b\nc\nd e\nf g"
+        
+        chunks = list(chunk_large_text_streaming(text, chunk_size=4, overlap=2))
+        
+        assert chunks == ["a b\nc", "c\nd e", "d e\nf g"]
+    
+    def test_chunk_texts_and_files(self, tmp_path):
+        """Test the explicit text and file entry points against chunk_documents"""
+        path = tmp_path / "snap.txt"
+        path.write_text("w0 w1 w2 w3 w4 w5")
+        
+        assert chunk_files([path], chunk_size=4, overlap=1) == ["w0 w1 w2 w3", "w3 w4 w5"]
+        assert chunk_texts([str(path)], chunk_size=4, overlap=1) == [str(path)]
+        assert chunk_documents([str(path)], chunk_size=4, overlap=1) == ["w0 w1 w2 w3", "w3 w4 w5"]
+    
+    def test_is_file_path_skips_multiline_text(self):
+        """Test that multi-line text is classified without a filesystem probe"""
+        with patch('pathlib.Path.exists', return_value=True) as mock_exists:
+            assert is_file_path("See section 2.\nApply online.") is False
+            mock_exists.assert_not_called()
+    
+    def test_is_file_path_trusts_path_objects(self):
+        """Test that Path inputs are files without a filesystem probe"""
+        with patch('pathlib.Path.exists', return_value=False) as mock_exists:
+            assert is_file_path(Path("docs/snap.txt")) is True
+            mock_exists.assert_not_called()
+    
+    def test_read_text_file_small_and_mapped(self, tmp_path):
+        """Test that small and memory-mapped large files read back identically"""
+        small = tmp_path / "small.txt"
+        small.write_bytes("SNAP\r\nbenefits".encode("utf-8"))
+        large = tmp_path / "large.txt"
+        large.write_bytes(("Medicaid\r\ncasé\r" * (MMAP_MIN_BYTES // 10)).encode("utf-8"))
+        
+        assert read_text_file(small) == "SNAP\nbenefits"
+        assert read_text_file(large) == "Medicaid\ncasé\n" * (MMAP_MIN_BYTES // 10)
+    
+    def test_chunk_text_stream_across_pages(self):
+        """Test that streamed pages are chunked with overlap across page boundaries"""
+        pages = ["w0 w1 w2 w3\n", "w4 w5 w6\n", "w7 w8 w9"]
+        
+        chunks = list(chunk_text_stream(pages, chunk_size=4, overlap=1))
+        
+        assert chunks == ["w0 w1 w2 w3", "w3 w4 w5 w6", "w6 w7 w8 w9"]
+        
+        # Short streams produce a single chunk
+        assert list(chunk_text_stream(["one page only"], chunk_size=20, overlap=5)) == ["one page only"]
+    
+    def test_compiled_chunker_matches_python(self):
+        """Test that the Cython _chunker extension splits and counts exactly like the Python path"""
+        compiled = pytest.importorskip("src.ingest._chunker")
+        texts = [
+            "",
+            "   ",
+            "single",
+            " w0 w1\tw2\nw3  w4\r\nw5 ",
+            # No-break, em, ideographic and line/paragraph separator spaces
+            "SNAP\u00a0benefits\u2003apply\u3000online\u2028now\u2029café\x1fnaïve \u200bzero-width",
+            " ".join(f"w{i}" for i in range(50)),
+        ]
+        
+        for text in texts:
+            assert compiled.count_tokens(text) == len(token_offsets(text)[0])
+            # overlap >= chunk_size falls back to advancing one token per window
+            for chunk_size, overlap in [(4, 1), (5, 0), (3, 3), (2, 5), (1, 0)]:
+                with patch('src.ingest.chunker._split_document_c', None):
+                    expected = _split_document(text, chunk_size, overlap)
+                assert compiled.split_document(text, chunk_size, overlap) == expected
 
 if __name__ == "__main__":
     pytest.main([__file__]) 
\ No newline at end of file
@@ -8,11 +8,7 @@ from unittest.mock import patch, MagicMock
 from pathlib import Path
 
 # Import the chunker module
-import sys
-import os
-sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
-
-from ingest.chunker import chunk_documents, count_tokens, validate_chunks, simple_tokenize
+from src.ingest.chunker import chunk_documents, count_tokens, validate_chunks, simple_tokenize
 
 class TestChunker:
     """Test cases for document chunking functionality"""
@@ -3,12 +3,6 @@
 Simple test script for the new memory-efficient chunking functions.
 """
 
-import sys
-from pathlib import Path
-
-# Add src to path for imports
-sys.path.append(str(Path(__file__).parent / "src"))
-
 from src.ingest.chunker import (
     chunk_large_text_streaming, 
     chunk_large_text_batched,
@@ -9,12 +9,6 @@ This script tests real queries through the complete RAG pipeline:
 4. Response quality evaluation
 """
 
-import sys
-from pathlib import Path
-
-# Add src to path for imports
-sys.path.append(str(Path(__file__).parent / "src"))
-
 from src.retrieve.vector_store import init_vector_store, query_vector_store
 from src.ingest.data_processor import EmbeddingClient
 from src.models.llm_client import create_llm_client
@@ -8,10 +8,6 @@ This script tests the rate limiting functionality without running the full evalu
 import os
 import sys
 import time
-from pathlib import Path
-
-# Add src to path
-sys.path.insert(0, str(Path(__file__).parent / "src"))
 
 from src.models.rate_limiter import rate_limiter
 from src.models.llm_client import LLMClient
@@ -87,7 +83,7 @@ def test_embedding_client():
     embeddings = client.get_embeddings(texts)
     
     print(f"Generated embeddings: {len(embeddings)}")
-    if embeddings and embeddings[0]:
+    if len(embeddings):
         print(f"Embedding dimensions: {len(embeddings[0])}")
     
     # Test second identical batch (should hit cache)
@@ -3,36 +3,39 @@
 Test script to process just the small PDFs first to verify memory improvements.
 """
 
-import sys
 import gc
 import psutil
 import os
 from pathlib import Path
 
-# Add src to path for imports
-sys.path.append(str(Path(__file__).parent / "src"))
-
 from src.ingest.pdf_processor import PDFProcessor
 from src.ingest.data_processor import process_documents
 from src.ingest.chunker import chunk_large_text_streaming
 from src.retrieve.vector_store import init_vector_store, add_documents
 
 
+# Memory logging is observability only; enable it with DEBUG_MEM=1
+_MEM_DEBUG = os.environ.get("DEBUG_MEM") == "1"
+
+# Built once; constructing a Process costs several syscalls on some platforms
+_PROCESS = psutil.Process(os.getpid())
+
+
 def get_memory_usage():
     """Get current memory usage information."""
-    process = psutil.Process(os.getpid())
-    memory_info = process.memory_info()
+    memory_info = _PROCESS.memory_info()
     return {
         'rss': memory_info.rss / 1024 / 1024,  # MB
         'vms': memory_info.vms / 1024 / 1024,  # MB
-        'percent': process.memory_percent()
+        'percent': _PROCESS.memory_percent()
     }
 
 
 def log_memory_usage(stage: str):
-    """Log memory usage at different stages."""
-    memory = get_memory_usage()
-    print(f"💾 Memory usage at {stage}: {memory['rss']:.1f}MB RSS, {memory['vms']:.1f}MB VMS")
+    """Log memory usage at different stages (only when DEBUG_MEM=1)."""
+    if _MEM_DEBUG:
+        memory = get_memory_usage()
+        print(f"💾 Memory usage at {stage}: {memory['rss']:.1f}MB RSS, {memory['vms']:.1f}MB VMS")
 
 
 def cleanup_memory():
@@ -56,12 +59,8 @@ def process_small_pdf(pdf_path: Path, processor: PDFProcessor, chunk_size: int =
             print(f"⚠️ No text extracted from {pdf_path.name}")
             return None
         
-        # Classify service type
-        service_type = processor.classify_service_type(text, pdf_path.name)
-        
-        # Extract metadata
-        doc_title = processor.extract_document_title(text, pdf_path.name)
-        doc_date = processor.extract_date(text, pdf_path.name)
+        # Classify service type and extract metadata (cached per file)
+        service_type, doc_title, doc_date = processor.describe_document(pdf_path, text)
         
         print(f"✅ Extracted text: {len(text)} characters")
         print(f"✅ Classified as: {service_type}")
@@ -70,6 +69,15 @@ def process_small_pdf(pdf_path: Path, processor: PDFProcessor, chunk_size: int =
         # Use streaming chunking for all documents to avoid memory issues
         print(f"🔪 Chunking document with streaming approach...")
         
+        # Per-file values, computed once rather than per chunk
+        file_size = pdf_path.stat().st_size
+        file_stem = pdf_path.stem
+        file_name = pdf_path.name
+        file_str = str(pdf_path)
+        
+        # Count chunks up front so every record carries the real total
+        total_chunks = sum(1 for _ in chunk_large_text_streaming(text, chunk_size=chunk_size, overlap=overlap))
+        
         all_final_records = []
         chunk_count = 0
         
@@ -86,7 +94,8 @@ def process_small_pdf(pdf_path: Path, processor: PDFProcessor, chunk_size: int =
                 embedded_record = process_documents(
                     [chunk],
                     chunk_size=chunk_size,
-                    overlap=overlap
+                    overlap=overlap,
+                    pre_chunked=True
                 )
                 
                 if embedded_record and len(embedded_record) > 0:
@@ -96,16 +105,16 @@ def process_small_pdf(pdf_path: Path, processor: PDFProcessor, chunk_size: int =
                         "embedding": embedded_record[0]["embedding"],
                         "metadata": {
                             **embedded_record[0]["metadata"],
-                            "source": str(pdf_path),
+                            "source": file_str,
                             "service_type": service_type,
                             "doc_title": doc_title,
                             "date": doc_date,
-                            "filename": pdf_path.name,
-                            "file_size": pdf_path.stat().st_size,
-                            "record_id": f"{pdf_path.stem}_chunk_{chunk_count}",
+                            "filename": file_name,
+                            "file_size": file_size,
+                            "record_id": f"{file_stem}_chunk_{chunk_count}",
                             "source_type": "pdf_document",
                             "chunk_index": chunk_count,
-                            "total_chunks": "unknown"  # We don't know total until done
+                            "total_chunks": total_chunks
                         }
                     }
                     all_final_records.append(final_record)
@@ -0,0 +1,19 @@
+"""
+Shared test fixtures
+
+The OpenAI circuit breaker is a process-wide singleton; tests that drive
+embedding failures can trip it, so it is reset around every test to keep
+modules independent of run order.
+"""
+
+import pytest
+
+from src.models.circuit_breaker import openai_breaker
+
+
+@pytest.fixture(autouse=True)
+def reset_openai_breaker():
+    """Start and finish every test with a closed openai_breaker."""
+    openai_breaker.reset()
+    yield
+    openai_breaker.reset()
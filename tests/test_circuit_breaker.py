@@ -0,0 +1,73 @@
+"""
+Test suite for the OpenAI circuit breaker
+
+Ensures a flaky provider is short-circuited to the mock fallback instead of
+paying a full timeout on every call.
+"""
+
+from unittest.mock import Mock, patch
+
+from src.models.circuit_breaker import CircuitBreaker, CLOSED, OPEN, HALF_OPEN
+
+
+class TestCircuitBreaker:
+    """Test the CircuitBreaker state machine"""
+    
+    def test_opens_after_threshold_failures(self):
+        """Test that N failures within the window open the circuit"""
+        breaker = CircuitBreaker(failure_threshold=3, window_seconds=60, cooldown_seconds=30)
+        
+        for _ in range(2):
+            breaker.record_failure()
+        assert breaker.state == CLOSED
+        
+        breaker.record_failure()
+        assert breaker.state == OPEN
+        assert breaker.allow_request() is False
+    
+    def test_half_open_probe_after_cooldown(self):
+        """Test that one probe is allowed after the cooldown"""
+        breaker = CircuitBreaker(failure_threshold=1, cooldown_seconds=30)
+        
+        with patch("src.models.circuit_breaker.time.time", return_value=1000.0):
+            breaker.record_failure()
+        
+        with patch("src.models.circuit_breaker.time.time", return_value=1031.0):
+            assert breaker.allow_request() is True
+            assert breaker.state == HALF_OPEN
+            assert breaker.allow_request() is False
+        
+        breaker.record_success()
+        assert breaker.state == CLOSED
+    
+    def test_protect_routes_to_fallback_when_open(self):
+        """Test that protected calls use the fallback while open"""
+        breaker = CircuitBreaker(failure_threshold=1)
+        fallback = Mock(return_value="mock")
+        api_call = Mock(return_value="real")
+        protected = breaker.protect(fallback=fallback)(api_call)
+        
+        assert protected("query") == "real"
+        
+        breaker.record_failure()
+        assert protected("query") == "mock"
+        fallback.assert_called_once_with("query")
+        assert api_call.call_count == 1
+    
+    def test_protect_counts_failure_exceptions(self):
+        """Test that configured exceptions are recorded and fall back"""
+        breaker = CircuitBreaker(failure_threshold=1, failure_exceptions=(TimeoutError,))
+        protected = breaker.protect(fallback=lambda *args: "mock")(Mock(side_effect=TimeoutError()))
+        
+        assert protected() == "mock"
+        assert breaker.state == OPEN
+    
+    def test_reset_closes_and_forgets_failures(self):
+        """Test that reset returns an open breaker to a clean CLOSED state"""
+        breaker = CircuitBreaker(failure_threshold=1)
+        breaker.record_failure()
+        
+        breaker.reset()
+        
+        assert breaker.state == CLOSED
+        assert breaker.get_status_info() == {"state": CLOSED, "recent_failures": 0, "last_opened_at": None}
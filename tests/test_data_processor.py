@@ -6,11 +6,16 @@ ensuring proper integration with chunker and embedding generation for
 the 100-query evaluation targeting ≥ 90% Self-Service Success Rate.
 """
 
+import asyncio
+import numpy as np
 import pytest
 from unittest.mock import Mock, patch, mock_open
 from typing import List, Dict
 
-from src.ingest.data_processor import process_documents, validate_records, EmbeddingClient
+from src.ingest.data_processor import (
+    process_documents, process_documents_to_matrix, validate_records, EmbeddingClient,
+    quantize_embeddings, dequantize_embeddings
+)
 
 
 class TestEmbeddingClient:
@@ -33,9 +38,9 @@ class TestEmbeddingClient:
         texts = ["test text 1", "test text 2"]
         embeddings = client.get_embeddings(texts)
         
-        assert len(embeddings) == 2
-        assert all(len(emb) == 1536 for emb in embeddings)
-        assert all(isinstance(emb, list) for emb in embeddings)
+        assert isinstance(embeddings, np.ndarray)
+        assert embeddings.shape == (2, 1536)
+        assert embeddings.dtype == np.float32
     
     @patch('openai.embeddings.create')
     def test_get_embeddings_with_api_key(self, mock_create):
@@ -46,15 +51,16 @@ class TestEmbeddingClient:
             Mock(embedding=[0.1, 0.2, 0.3]),
             Mock(embedding=[0.4, 0.5, 0.6])
         ]
+        mock_response.usage = None
         mock_create.return_value = mock_response
         
-        client = EmbeddingClient(api_key="test_key")
+        client = EmbeddingClient(api_key="test_key", cache_enabled=False)
         texts = ["text 1", "text 2"]
         embeddings = client.get_embeddings(texts)
         
-        assert len(embeddings) == 2
-        assert embeddings[0] == [0.1, 0.2, 0.3]
-        assert embeddings[1] == [0.4, 0.5, 0.6]
+        assert embeddings.shape == (2, 3)
+        assert embeddings.dtype == np.float32
+        np.testing.assert_allclose(embeddings, [[0.1, 0.2, 0.3], [0.4, 0.5, 0.6]], rtol=1e-6)
         mock_create.assert_called_once_with(input=texts, model="text-embedding-ada-002")
     
     @patch('openai.embeddings.create')
@@ -62,22 +68,112 @@ class TestEmbeddingClient:
         """Test fallback to mock embeddings when API fails"""
         mock_create.side_effect = Exception("API Error")
         
-        client = EmbeddingClient(api_key="test_key")
+        client = EmbeddingClient(api_key="test_key", cache_enabled=False)
         texts = ["test text"]
         embeddings = client.get_embeddings(texts)
         
         assert len(embeddings) == 1
         assert len(embeddings[0]) == 1536
 
+    
+    def test_aget_embeddings_batches_preserve_order(self):
+        """Test async embedding splits into batches and keeps input order"""
+        client = EmbeddingClient(api_key=None, max_concurrency=2)
+        texts = [f"text {i}" for i in range(5)]
+        
+        with patch.object(client, 'get_embeddings', side_effect=lambda batch: [[float(t.split()[1])] for t in batch]) as mock_get:
+            embeddings = asyncio.run(client.aget_embeddings(texts, batch_size=2))
+        
+        assert embeddings.tolist() == [[0.0], [1.0], [2.0], [3.0], [4.0]]
+        assert mock_get.call_count == 3
+    
+    def test_aget_embeddings_defaults_to_request_sized_batches(self):
+        """Test async embedding uses the same sub-batch limits as the sync path"""
+        client = EmbeddingClient(api_key=None, max_batch_items=3)
+        texts = [f"text {i}" for i in range(7)]
+        
+        with patch.object(client, 'get_embeddings', side_effect=lambda batch: [[float(t.split()[1])] for t in batch]) as mock_get:
+            embeddings = asyncio.run(client.aget_embeddings(texts))
+        
+        assert embeddings.tolist() == [[float(i)] for i in range(7)]
+        assert [len(call.args[0]) for call in mock_get.call_args_list] == [3, 3, 1]
+    
+    @patch('openai.embeddings.create')
+    def test_get_embeddings_splits_into_sub_batches(self, mock_create):
+        """Test that large inputs are sent as several bounded requests and reassembled in order"""
+        mock_create.side_effect = lambda input, model: Mock(
+            data=[Mock(embedding=[float(t.split()[1])]) for t in input], usage=None
+        )
+        
+        client = EmbeddingClient(api_key="test_key", cache_enabled=False, max_batch_items=2)
+        texts = [f"text {i}" for i in range(5)]
+        
+        assert [len(batch) for batch, _ in client._split_batches(texts)] == [2, 2, 1]
+        
+        with patch('src.ingest.data_processor.rate_limiter.get_cached_response', return_value=None):
+            embeddings = client.get_embeddings(texts)
+        
+        assert embeddings.tolist() == [[0.0], [1.0], [2.0], [3.0], [4.0]]
+        assert mock_create.call_count == 3
+    
+    @patch('openai.embeddings.create')
+    def test_get_embeddings_requests_truncated_dimensions(self, mock_create):
+        """Test that text-embedding-3 models are asked for truncated vectors"""
+        mock_response = Mock()
+        mock_response.data = [Mock(embedding=[0.6, 0.8, 0.0])]
+        mock_response.usage = None
+        mock_create.return_value = mock_response
+        
+        client = EmbeddingClient(api_key="test_key", model="text-embedding-3-small", cache_enabled=False, dimensions=3)
+        embeddings = client.get_embeddings(["text 1"])
+        
+        mock_create.assert_called_once_with(input=["text 1"], model="text-embedding-3-small", dimensions=3)
+        assert embeddings.shape == (1, 3)
+        assert client.validate_embedding(embeddings[0])
+    
+    def test_unknown_embedding_model_fails_fast(self):
+        """Test that a model without rate limits raises instead of waiting out the timeout"""
+        from src.models.rate_limiter import rate_limiter
+        
+        with patch('src.models.rate_limiter.time.sleep') as mock_sleep:
+            with pytest.raises(ValueError):
+                rate_limiter.wait_for_capacity("text-embedding-unknown", 10)
+        mock_sleep.assert_not_called()
+    
+    def test_get_embeddings_truncates_locally(self):
+        """Test that other models are truncated and renormalized client-side"""
+        client = EmbeddingClient(api_key=None, dimensions=512)
+        embeddings = client.get_embeddings(["text 1", "text 2"])
+        
+        assert embeddings.shape == (2, 512)
+        np.testing.assert_allclose(np.linalg.norm(embeddings, axis=1), [1.0, 1.0], rtol=1e-5)
+    
+    def test_mock_embeddings_share_one_vector(self):
+        """Test that mock embeddings are a read-only view of one cached vector"""
+        client = EmbeddingClient(api_key=None, dimensions=512)
+        embeddings = client.get_embeddings(["text 1", "text 2", "text 3"])
+        
+        assert embeddings.shape == (3, 512)
+        assert not embeddings.flags.writeable
+        assert np.shares_memory(embeddings, client.get_embeddings(["text 4"]))
+        np.testing.assert_allclose(np.linalg.norm(embeddings, axis=1), [1.0, 1.0, 1.0], rtol=1e-5)
+    
+    def test_validate_embeddings_vectorized(self):
+        """Test that matrix validation flags non-finite rows and wrong shapes"""
+        client = EmbeddingClient(api_key=None, dimensions=3)
+        embeddings = np.array([[0.1, 0.2, 0.3], [np.nan, 0.0, 0.0], [0.0, np.inf, 0.0]], dtype=np.float32)
+        
+        assert client.validate_embeddings(embeddings).tolist() == [True, False, False]
+        assert client.validate_embeddings(np.zeros((2, 4), dtype=np.float32)).tolist() == [False, False]
 
 class TestProcessDocuments:
     """Test the process_documents function"""
     
-    @patch('src.ingest.data_processor.chunk_documents')
+    @patch('src.ingest.data_processor.iter_chunks_with_index')
     def test_process_documents_raw_text(self, mock_chunk_documents):
         """Test processing raw text inputs"""
         # Mock chunker to return known chunks
-        mock_chunk_documents.return_value = ["chunk 1", "chunk 2", "chunk 3"]
+        mock_chunk_documents.return_value = [(0, 0, "chunk 1"), (0, 1, "chunk 2"), (1, 0, "chunk 3")]
         
         # Mock embedding client
         mock_client = Mock()
@@ -104,15 +200,19 @@ class TestProcessDocuments:
         assert records[0]["embedding"] == [0.1, 0.2, 0.3]
         assert records[0]["metadata"]["source"] == "raw_text"
         assert records[0]["metadata"]["chunk_index"] == 0
+        assert records[2]["metadata"]["chunk_index"] == 0
+        
+        # Documents are chunked in a single pass
+        mock_chunk_documents.assert_called_once()
     
-    @patch('src.ingest.data_processor.chunk_documents')
+    @patch('src.ingest.data_processor.iter_chunks_with_index')
     @patch('builtins.open', new_callable=mock_open, read_data="File content for unemployment benefits")
     @patch('pathlib.Path.exists')
     def test_process_documents_file_paths(self, mock_exists, mock_file, mock_chunk_documents):
         """Test processing actual file paths"""
         # Setup mocks
         mock_exists.return_value = True
-        mock_chunk_documents.return_value = ["file chunk 1", "file chunk 2"]
+        mock_chunk_documents.return_value = [(0, 0, "file chunk 1"), (0, 1, "file chunk 2")]
         
         mock_client = Mock()
         mock_client.get_embeddings.return_value = [
@@ -127,14 +227,14 @@ class TestProcessDocuments:
         assert records[0]["metadata"]["source"] == "./docs/unemployment.txt"
         assert records[0]["text"] == "file chunk 1"
     
-    @patch('src.ingest.data_processor.chunk_documents')
+    @patch('src.ingest.data_processor.iter_chunks_with_index')
     def test_process_documents_mixed_inputs(self, mock_chunk_documents):
         """Test processing mix of file paths and raw text"""
         # Mock chunker for different calls
         def mock_chunker_side_effect(docs, **kwargs):
-            if "raw text input" in docs[0]:
-                return ["raw chunk"]
-            return ["all chunks combined"]
+            if "raw text input" in list(docs)[0]:
+                return [(0, 0, "raw chunk")]
+            return [(0, 0, "all chunks combined")]
         
         mock_chunk_documents.side_effect = mock_chunker_side_effect
         
@@ -147,10 +247,10 @@ class TestProcessDocuments:
         assert len(records) == 1
         assert records[0]["metadata"]["source"] == "raw_text"
     
-    @patch('src.ingest.data_processor.chunk_documents')
+    @patch('src.ingest.data_processor.iter_chunks_with_index')
     def test_process_documents_custom_chunk_params(self, mock_chunk_documents):
         """Test process_documents with custom chunking parameters"""
-        mock_chunk_documents.return_value = ["test chunk"]
+        mock_chunk_documents.return_value = [(0, 0, "test chunk")]
         
         mock_client = Mock()
         mock_client.get_embeddings.return_value = [[0.5, 0.5]]
@@ -164,16 +264,16 @@ class TestProcessDocuments:
         )
         
         # Verify chunking was called with correct parameters
-        mock_chunk_documents.assert_called_with(["test text"], chunk_size=500, overlap=100)
+        assert mock_chunk_documents.call_args.kwargs == {"chunk_size": 500, "overlap": 100}
         
         # Verify metadata contains chunking parameters
         assert records[0]["metadata"]["chunk_size"] == 500
         assert records[0]["metadata"]["overlap"] == 100
     
-    @patch('src.ingest.data_processor.chunk_documents')
+    @patch('src.ingest.data_processor.iter_chunks_with_index')
     def test_process_documents_empty_chunks(self, mock_chunk_documents):
         """Test handling of empty or whitespace-only chunks"""
-        mock_chunk_documents.return_value = ["", "  ", "valid chunk", ""]
+        mock_chunk_documents.return_value = [(0, 0, ""), (0, 1, "  "), (0, 2, "valid chunk"), (0, 3, "")]
         
         mock_client = Mock()
         mock_client.get_embeddings.return_value = [[1.0, 2.0, 3.0]]
@@ -185,10 +285,95 @@ class TestProcessDocuments:
         assert len(records) == 1
         assert records[0]["text"] == "valid chunk"
     
+    @patch('src.ingest.data_processor.iter_chunks_with_index')
+    def test_process_documents_pre_chunked(self, mock_chunk_documents):
+        """Test that pre-chunked inputs are embedded as-is without re-chunking"""
+        mock_client = Mock()
+        mock_client.get_embeddings.return_value = [[1.0], [2.0]]
+        
+        records = process_documents(["chunk one", "chunk two"], embedding_client=mock_client, pre_chunked=True)
+        
+        mock_chunk_documents.assert_not_called()
+        mock_client.get_embeddings.assert_called_once_with(["chunk one", "chunk two"])
+        assert [record["text"] for record in records] == ["chunk one", "chunk two"]
+    
+    @patch('src.ingest.data_processor.iter_chunks_with_index')
+    def test_process_documents_embeds_in_batches(self, mock_chunk_documents):
+        """Test that chunks are streamed to the embedding client batch by batch"""
+        mock_chunk_documents.return_value = iter([(0, 0, "chunk a"), (0, 1, "chunk b"), (1, 0, "chunk c")])
+        
+        mock_client = Mock()
+        mock_client.get_embeddings.side_effect = lambda batch: [[float(len(batch))]] * len(batch)
+        
+        records = process_documents(["doc one", "doc two"], embedding_client=mock_client, batch_size=2)
+        
+        assert [call.args[0] for call in mock_client.get_embeddings.call_args_list] == [["chunk a", "chunk b"], ["chunk c"]]
+        assert [record["text"] for record in records] == ["chunk a", "chunk b", "chunk c"]
+        assert records[2]["metadata"]["chunk_index"] == 0
+    
+    @patch('src.ingest.data_processor.iter_chunks_with_index')
+    @patch('pathlib.Path.exists')
+    def test_process_documents_declared_texts_skip_filesystem(self, mock_exists, mock_chunk_documents):
+        """Test that inputs declared as texts are never probed as file paths"""
+        mock_chunk_documents.return_value = [(0, 0, "docs/snap.txt")]
+        
+        mock_client = Mock()
+        mock_client.get_embeddings.return_value = [[1.0]]
+        
+        records = process_documents(["docs/snap.txt"], embedding_client=mock_client, inputs="texts")
+        
+        mock_exists.assert_not_called()
+        assert records[0]["metadata"]["source"] == "raw_text"
+    
+    @patch('src.ingest.data_processor.iter_chunks_with_index')
+    def test_process_documents_embeds_duplicate_chunks_once(self, mock_chunk_documents):
+        """Test that repeated boilerplate chunks are embedded once and shared"""
+        mock_chunk_documents.return_value = [(0, 0, "NYC HRA footer"), (0, 1, "SNAP rules"), (1, 0, "NYC HRA footer")]
+        
+        mock_client = Mock()
+        mock_client.get_embeddings.return_value = np.array([[1.0], [2.0]], dtype=np.float32)
+        mock_client.validate_embeddings.side_effect = lambda embeddings: np.ones(len(embeddings), dtype=bool)
+        
+        records = process_documents(["doc one", "doc two"], embedding_client=mock_client)
+        
+        mock_client.get_embeddings.assert_called_once_with(["NYC HRA footer", "SNAP rules"])
+        assert [record["embedding"].tolist() for record in records] == [[1.0], [2.0], [1.0]]
+        assert records[2]["metadata"]["source"] == "raw_text"
+    
+    @patch('src.ingest.data_processor.iter_chunks_with_index')
+    def test_process_documents_int8_embeddings(self, mock_chunk_documents):
+        """Test that records can carry int8 embeddings with a per-record scale"""
+        mock_chunk_documents.return_value = [(0, 0, "chunk a"), (0, 1, "chunk b")]
+        
+        mock_client = Mock()
+        mock_client.get_embeddings.return_value = [[0.5, -1.0], [0.0, 0.0]]
+        
+        records = process_documents(["doc"], embedding_client=mock_client, embedding_dtype="int8")
+        
+        assert records[0]["embedding"].dtype == np.int8
+        assert records[0]["embedding"].tolist() == [64, -127]
+        assert records[0]["embedding_scale"] == pytest.approx(1.0 / 127)
+        assert records[1]["embedding"].tolist() == [0, 0]
+        assert validate_records(records, dimensions=2) is True
+    
+    def test_process_documents_splits_each_document_once(self):
+        """Test that chunk_index comes from the single chunking pass"""
+        import src.ingest.chunker as chunker
+        
+        docs = ["one two three four five six seven", "alpha beta gamma delta"]
+        mock_client = Mock()
+        mock_client.get_embeddings.side_effect = lambda texts: [[0.1, 0.2]] * len(texts)
+        
+        with patch.object(chunker, '_split_document', wraps=chunker._split_document) as mock_split:
+            records = process_documents(docs, chunk_size=3, overlap=1, embedding_client=mock_client)
+        
+        assert mock_split.call_count == len(docs)
+        assert [r["metadata"]["chunk_index"] for r in records] == [0, 1, 2, 0, 1]
+    
     def test_process_documents_no_embedding_client(self):
         """Test process_documents creates default embedding client"""
-        with patch('src.ingest.data_processor.chunk_documents') as mock_chunk:
-            mock_chunk.return_value = ["test chunk"]
+        with patch('src.ingest.data_processor.iter_chunks_with_index') as mock_chunk:
+            mock_chunk.return_value = [(0, 0, "test chunk")]
             
             paths = ["test input"]
             records = process_documents(paths)
@@ -196,10 +381,10 @@ class TestProcessDocuments:
             # Should create at least one record with mock embeddings
             assert len(records) >= 0  # May be 0 if no valid chunks
     
-    @patch('src.ingest.data_processor.chunk_documents')
+    @patch('src.ingest.data_processor.iter_chunks_with_index')
     def test_process_documents_token_counting(self, mock_chunk_documents):
         """Test that token counts are calculated correctly"""
-        mock_chunk_documents.return_value = ["this is a test chunk with seven tokens"]
+        mock_chunk_documents.return_value = [(0, 0, "this is a test chunk with seven tokens")]
         
         mock_client = Mock()
         mock_client.get_embeddings.return_value = [[0.1, 0.2]]
@@ -211,6 +396,51 @@ class TestProcessDocuments:
         assert records[0]["metadata"]["token_count"] == 8  # "this is a test chunk with seven tokens" = 8 tokens
 
 
+class TestProcessDocumentsToMatrix:
+    """Test collecting embeddings into one normalized matrix"""
+    
+    @pytest.mark.parametrize("use_memmap", [False, True])
+    @patch('src.ingest.data_processor.iter_chunks_with_index')
+    def test_matrix_rows_align_with_records(self, mock_chunk_documents, use_memmap, tmp_path):
+        """Test that row i is the normalized embedding of records[i]"""
+        mock_chunk_documents.return_value = [(0, i, f"chunk {i}") for i in range(1500)]
+        
+        mock_client = Mock()
+        mock_client.get_embeddings.side_effect = lambda batch: [[float(t.split()[1]), 1.0] for t in batch]
+        
+        memmap_path = tmp_path / "embeddings.f32" if use_memmap else None
+        records, matrix = process_documents_to_matrix(["doc"], embedding_client=mock_client, memmap_path=memmap_path)
+        
+        assert len(records) == 1500
+        assert "embedding" not in records[0]
+        assert matrix.shape == (1500, 2)
+        assert matrix.dtype == np.float32
+        expected = np.column_stack([np.arange(1500), np.ones(1500)])
+        np.testing.assert_allclose(matrix, expected / np.linalg.norm(expected, axis=1, keepdims=True), rtol=1e-6)
+        if use_memmap:
+            assert isinstance(matrix, np.memmap)
+            assert memmap_path.stat().st_size == 1500 * 2 * 4
+
+
+class TestQuantization:
+    """Test int8 embedding quantization"""
+    
+    def test_round_trip_preserves_cosine_similarity(self):
+        """Test that dequantized vectors stay within 1% cosine of the originals"""
+        rng = np.random.default_rng(0)
+        embeddings = rng.normal(size=(8, 1536)).astype(np.float32)
+        
+        quantized, scales = quantize_embeddings(embeddings)
+        restored = dequantize_embeddings(quantized, scales)
+        
+        assert quantized.dtype == np.int8
+        assert scales.shape == (8,)
+        cosine = (embeddings * restored).sum(axis=1) / (
+            np.linalg.norm(embeddings, axis=1) * np.linalg.norm(restored, axis=1)
+        )
+        assert cosine.min() > 0.99
+
+
 class TestValidateRecords:
     """Test the validate_records function"""
     
@@ -237,7 +467,7 @@ class TestValidateRecords:
             }
         ]
         
-        assert validate_records(valid_records) is True
+        assert validate_records(valid_records, dimensions=3) is True
     
     def test_validate_records_missing_top_level_field(self):
         """Test validation fails for missing top-level fields"""
@@ -294,7 +524,7 @@ class TestValidateRecords:
 class TestIntegration:
     """Integration tests for the full data processing pipeline"""
     
-    @patch('src.ingest.data_processor.chunk_documents')
+    @patch('src.ingest.data_processor.iter_chunks_with_index')
     def test_nyc_services_query_processing(self, mock_chunk_documents):
         """Test processing NYC services queries from our 100-query seed set"""
         # Sample queries from PROJECT_SPEC.md
@@ -308,8 +538,8 @@ class TestIntegration:
         
         # Mock chunker to return one chunk per query
         mock_chunk_documents.return_value = [
-            "unemployment chunk", "snap chunk", "medicaid chunk", 
-            "cash assistance chunk", "childcare chunk"
+            (0, 0, "unemployment chunk"), (1, 0, "snap chunk"), (2, 0, "medicaid chunk"),
+            (3, 0, "cash assistance chunk"), (4, 0, "childcare chunk")
         ]
         
         # Mock embedding client
@@ -346,7 +576,7 @@ class TestIntegration:
             
             # Check RAG-ready structure
             assert isinstance(record["text"], str)
-            assert isinstance(record["embedding"], list)
+            assert isinstance(record["embedding"], np.ndarray)
             assert isinstance(record["metadata"]["source"], str)
             assert isinstance(record["metadata"]["chunk_index"], int)
             assert isinstance(record["metadata"]["token_count"], int)
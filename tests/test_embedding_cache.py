@@ -0,0 +1,91 @@
+"""
+Test suite for the chunk embedding disk cache
+
+Ensures previously embedded chunks are served from disk so re-ingesting
+the NYC service PDFs only embeds new content.
+"""
+
+import pytest
+import tempfile
+import numpy as np
+from unittest.mock import patch
+
+from src.ingest.embedding_cache import EmbeddingCache
+from src.ingest.data_processor import EmbeddingClient
+from src.models.mock_fallback import mock_fallback
+
+
+class TestEmbeddingCache:
+    """Test the EmbeddingCache class"""
+    
+    def test_make_key_depends_on_model_and_text(self):
+        """Test that keys differ by model and by text"""
+        key = EmbeddingCache.make_key("text-embedding-ada-002", "SNAP eligibility")
+        assert key == EmbeddingCache.make_key("text-embedding-ada-002", "SNAP eligibility")
+        assert key != EmbeddingCache.make_key("text-embedding-3-small", "SNAP eligibility")
+        assert key != EmbeddingCache.make_key("text-embedding-ada-002", "Medicaid eligibility")
+    
+    def test_get_many_returns_hits_by_index(self):
+        """Test that only cached texts are returned, keyed by position"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            cache = EmbeddingCache(cache_dir=temp_dir)
+            cache.set_many("model", ["a", "c"], np.array([[1.0, 2.0], [3.0, 4.0]], dtype=np.float32))
+            
+            hits = cache.get_many("model", ["a", "b", "c"])
+            assert sorted(hits) == [0, 2]
+            assert hits[2].tolist() == [3.0, 4.0]
+            assert hits[2].dtype == np.float32
+            assert len(cache) == 2
+    
+    def test_stores_half_precision(self):
+        """Test that vectors are stored as float16 on disk"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            cache = EmbeddingCache(cache_dir=temp_dir)
+            cache.set_many("model", ["a"], np.full((1, 1536), 0.1, dtype=np.float32))
+            
+            (blob,) = cache._conn.execute("SELECT v FROM cache").fetchone()
+            assert len(blob) == 1536 * 2
+            assert cache.get_many("model", ["a"])[0][0] == pytest.approx(0.1, abs=1e-3)
+    
+    def test_evicts_least_recently_used(self):
+        """Test that entries beyond max_entries are evicted, sparing recent hits"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            cache = EmbeddingCache(cache_dir=temp_dir, max_entries=2)
+            with patch("src.ingest.embedding_cache.time.time", side_effect=[1.0, 2.0, 3.0, 4.0]):
+                cache.set_many("model", ["a"], np.ones((1, 2), dtype=np.float32))
+                cache.set_many("model", ["b"], np.ones((1, 2), dtype=np.float32))
+                cache.get_many("model", ["a"])
+                cache.set_many("model", ["c"], np.ones((1, 2), dtype=np.float32))
+            
+            assert sorted(cache.get_many("model", ["a", "b", "c"])) == [0, 2]
+            assert len(cache) == 2
+    
+    def test_persists_across_instances(self):
+        """Test that embeddings survive a new cache instance"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            EmbeddingCache(cache_dir=temp_dir).set_many("model", ["a"], np.ones((1, 4), dtype=np.float32))
+            assert EmbeddingCache(cache_dir=temp_dir).get_many("model", ["a"])[0].tolist() == [1.0] * 4
+
+
+class TestEmbeddingClientCache:
+    """Test that EmbeddingClient only embeds cache misses"""
+    
+    def setup_method(self):
+        """Clear fallback mode left on by earlier tests; misses aren't cached while it is active"""
+        mock_fallback.deactivate_fallback()
+    
+    def test_only_misses_reach_the_api(self):
+        """Test that cached chunks are reused and results stay in input order"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            with patch.dict("os.environ", {"EMBEDDING_CACHE_DIR": temp_dir}):
+                client = EmbeddingClient(api_key="test-key")
+            client.cache.set_many(client.model, ["cached"], np.full((1, 1536), 0.5, dtype=np.float32))
+            
+            fresh = np.full((1, 1536), 0.25, dtype=np.float32)
+            with patch.object(client, "_get_embeddings_batched", return_value=fresh) as mock_embed:
+                embeddings = client.get_embeddings(["new", "cached"])
+            
+            mock_embed.assert_called_once_with(["new"])
+            assert embeddings[0][0] == pytest.approx(0.25)
+            assert embeddings[1][0] == pytest.approx(0.5)
+            assert sorted(client.cache.get_many(client.model, ["new", "cached"])) == [0, 1]
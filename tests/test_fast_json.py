@@ -0,0 +1,34 @@
+"""
+Test suite for the JSON encoding helpers
+
+Ensures cache keys and payloads round-trip and encode deterministically
+whether or not orjson is installed.
+"""
+
+import json
+from unittest.mock import patch
+
+from src.models import fast_json
+
+
+class TestFastJson:
+    """Test the fast_json helpers"""
+    
+    def test_round_trip(self):
+        """Test that responses survive an encode/decode cycle"""
+        response = {"response": "Apply at ACCESS NYC – café hours", "confidence": 0.85, "sources_used": ["snap.pdf"]}
+        assert fast_json.loads(fast_json.dumps(response)) == response
+    
+    def test_sorted_keys_are_deterministic(self):
+        """Test that key order does not change the encoded text used for hashing"""
+        assert fast_json.dumps({"b": 1, "a": [1, 2]}, sort_keys=True) == '{"a":[1,2],"b":1}'
+        assert fast_json.dumps({"a": [1, 2], "b": 1}, sort_keys=True) == '{"a":[1,2],"b":1}'
+    
+    def test_stdlib_fallback_matches(self):
+        """Test that the json fallback produces the same compact output"""
+        payload = {"model": "gpt-4o-mini", "messages": [{"role": "user", "content": "¿SNAP?"}]}
+        expected = fast_json.dumps(payload, sort_keys=True)
+        
+        with patch.object(fast_json, "orjson", None):
+            assert fast_json.dumps(payload, sort_keys=True) == expected
+            assert fast_json.loads(expected) == json.loads(expected)
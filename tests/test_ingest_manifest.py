@@ -0,0 +1,70 @@
+"""
+Test suite for the PDF ingestion manifest
+
+Ensures unchanged PDFs are skipped on rerun and changed PDFs report the
+chunk ids of their previous version.
+"""
+
+import os
+
+from src.ingest.ingest_manifest import IngestManifest, file_sha256
+
+
+class TestIngestManifest:
+    """Test the IngestManifest class"""
+    
+    def test_new_file_is_not_current(self, tmp_path):
+        """Test that a file never recorded needs ingesting"""
+        pdf = tmp_path / "snap.pdf"
+        pdf.write_bytes(b"%PDF snap")
+        
+        manifest = IngestManifest(tmp_path / ".ingest_manifest.json")
+        is_current, sha = manifest.check(pdf)
+        
+        assert not is_current
+        assert sha == file_sha256(pdf)
+    
+    def test_recorded_file_is_skipped_after_reload(self, tmp_path):
+        """Test that a recorded file is current across runs, even if touched"""
+        pdf = tmp_path / "snap.pdf"
+        pdf.write_bytes(b"%PDF snap")
+        manifest_path = tmp_path / ".ingest_manifest.json"
+        
+        manifest = IngestManifest(manifest_path)
+        _, sha = manifest.check(pdf)
+        manifest.record(pdf, sha, ["snap_chunk_0", "snap_chunk_1"])
+        manifest.save()
+        
+        reloaded = IngestManifest(manifest_path)
+        assert reloaded.check(pdf) == (True, sha)
+        
+        # Same contents with a new mtime are still recognized by hash
+        os.utime(pdf, (1, 1))
+        assert reloaded.check(pdf) == (True, sha)
+    
+    def test_changed_file_reports_stale_chunks(self, tmp_path):
+        """Test that editing a file invalidates it and exposes its old chunk ids"""
+        pdf = tmp_path / "snap.pdf"
+        pdf.write_bytes(b"%PDF snap")
+        
+        manifest = IngestManifest(tmp_path / ".ingest_manifest.json")
+        _, old_sha = manifest.check(pdf)
+        manifest.record(pdf, old_sha, ["snap_chunk_0"])
+        
+        pdf.write_bytes(b"%PDF snap, revised and longer")
+        is_current, new_sha = manifest.check(pdf)
+        
+        assert not is_current
+        assert new_sha != old_sha
+        assert manifest.stale_chunk_ids(pdf) == ["snap_chunk_0"]
+        
+        manifest.record(pdf, new_sha, ["snap_chunk_0", "snap_chunk_1"])
+        assert old_sha not in manifest.entries
+        assert len(manifest) == 1
+    
+    def test_corrupt_manifest_starts_empty(self, tmp_path):
+        """Test that an unreadable manifest does not break ingestion"""
+        manifest_path = tmp_path / ".ingest_manifest.json"
+        manifest_path.write_text("{not json")
+        
+        assert len(IngestManifest(manifest_path)) == 0
@@ -0,0 +1,60 @@
+"""
+Test suite for the LLM response disk cache
+
+Ensures deterministic responses are persisted and reused across runs so
+repeated evaluation queries don't spend tokens twice.
+"""
+
+import tempfile
+from unittest.mock import patch
+
+from src.models import llm_client
+from src.models.llm_cache import DiskLLMCache
+
+
+class TestDiskLLMCache:
+    """Test the DiskLLMCache class"""
+    
+    def test_make_key_is_deterministic(self):
+        """Test that identical requests produce identical keys"""
+        messages = [{"role": "user", "content": "How do I apply for SNAP?"}]
+        key_a = DiskLLMCache.make_key("gpt-4o-mini", messages, 0.0)
+        key_b = DiskLLMCache.make_key("gpt-4o-mini", list(messages), 0.0)
+        assert key_a == key_b
+        assert len(key_a) == 64
+        assert DiskLLMCache.make_key("gpt-4o-mini", messages, 0.3) != key_a
+    
+    def test_set_and_get_roundtrip(self):
+        """Test storing and retrieving a response"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            cache = DiskLLMCache(cache_dir=temp_dir)
+            cache.set("key", {"response": "Apply online", "tokens_used": 12})
+            
+            assert cache.get("key") == {"response": "Apply online", "tokens_used": 12}
+            assert cache.get("missing") is None
+    
+    def test_persists_across_instances(self):
+        """Test that responses survive a new cache instance"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            DiskLLMCache(cache_dir=temp_dir).set("key", {"response": "cached"})
+            assert DiskLLMCache(cache_dir=temp_dir).get("key") == {"response": "cached"}
+    
+    def test_expired_entries_are_dropped(self):
+        """Test that entries past their TTL are not returned"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            cache = DiskLLMCache(cache_dir=temp_dir)
+            cache.set("key", {"response": "stale"}, expire=-1)
+            assert cache.get("key") is None
+    
+    def test_clients_share_one_cache_at_temperature_zero(self):
+        """Test that deterministic clients reuse one cache and sampling clients open none"""
+        with tempfile.TemporaryDirectory() as temp_dir, \
+             patch.dict("os.environ", {"LLM_CACHE_DIR": temp_dir}), \
+             patch.object(llm_client, "_disk_cache", None):
+            assert llm_client.LLMClient(temperature=0.3).cache is None
+            assert llm_client._disk_cache is None
+            
+            first = llm_client.LLMClient(temperature=0)
+            second = llm_client.LLMClient(temperature=0)
+            assert first.cache is not None
+            assert first.cache is second.cache
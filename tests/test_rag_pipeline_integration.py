@@ -13,6 +13,7 @@ The integration test processes documents through the full pipeline:
 
 import pytest
 import tempfile
+import numpy as np
 import shutil
 from pathlib import Path
 from typing import List, Dict, Tuple
@@ -365,8 +366,9 @@ class TestRAGPipelineIntegration:
             assert "text" in record, "Record should have text"
             assert "embedding" in record, "Record should have embedding"
             assert "metadata" in record, "Record should have metadata"
-            assert isinstance(record["embedding"], list), "Embedding should be list"
-            assert len(record["embedding"]) == 1536, "Embedding should be 1536 dimensions"
+            assert isinstance(record["embedding"], np.ndarray), "Embedding should be an ndarray"
+            assert record["embedding"].dtype == np.float32, "Embedding should be float32"
+            assert record["embedding"].shape == (1536,), "Embedding should be 1536 dimensions"
             
             # Validate metadata structure
             metadata = record["metadata"]
@@ -0,0 +1,103 @@
+"""
+Test suite for the LLM semantic cache
+
+Ensures near-duplicate NYC service queries are answered from cache and
+that the similarity threshold adapts to user feedback.
+"""
+
+import json
+import math
+import pytest
+from unittest.mock import Mock
+import tempfile
+
+from src.models.semantic_cache import SemanticCache
+from src.models.mock_fallback import mock_fallback
+
+
+class TestSemanticCache:
+    """Test the SemanticCache class"""
+    
+    def setup_method(self):
+        """Clear fallback mode left on by earlier tests; lookups are skipped while it is active"""
+        mock_fallback.deactivate_fallback()
+    
+    def _make_cache(self, temp_dir: str, distance: float) -> SemanticCache:
+        """Build a cache holding one entry at the given cosine distance from every query"""
+        cache = SemanticCache(db_path=temp_dir, growth_rows=4)
+        cache.collection = Mock()
+        
+        stored = [0.0] * 1536
+        stored[0] = 2.0  # Not unit length; rows are normalized on insert
+        cache._append_rows(stored, [json.dumps({"response": "Apply online", "model": "gpt-4o-mini"})])
+        
+        similarity = 1 - distance
+        query = [0.0] * 1536
+        query[0] = similarity
+        query[1] = math.sqrt(1 - similarity ** 2)
+        cache._embed = Mock(return_value=query)
+        return cache
+    
+    def test_lookup_hit_above_threshold(self):
+        """Test that a close neighbour is served from cache"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            cache = self._make_cache(temp_dir, distance=0.03)
+            response = cache.lookup("How do I apply for unemployment benefits?")
+            
+            assert response["response"] == "Apply online"
+            assert response["from_cache"] is True
+            assert response["semantic_cache"]["similarity"] == pytest.approx(0.97)
+            assert cache.stats["hits"] == 1
+    
+    def test_lookup_miss_below_threshold(self):
+        """Test that a distant neighbour is not served"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            cache = self._make_cache(temp_dir, distance=0.2)
+            assert cache.lookup("What co-payments apply for child care?") is None
+            assert cache.stats["misses"] == 1
+    
+    def test_lookup_reuses_supplied_embedding(self):
+        """Test that a precomputed query embedding skips re-embedding"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            cache = self._make_cache(temp_dir, distance=0.5)
+            query = [0.0] * 1536
+            query[0] = 1.0
+            
+            response = cache.lookup("SNAP requirements", embedding=query)
+            
+            assert response["response"] == "Apply online"
+            cache._embed.assert_not_called()
+    
+    def test_store_skips_mock_responses(self):
+        """Test that fallback responses are never cached"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            cache = self._make_cache(temp_dir, distance=0.0)
+            cache.store("query", {"response": "mock", "model": "mock-fallback-snap"})
+            cache.collection.add.assert_not_called()
+    
+    def test_store_grows_matrix_and_serves_best_match(self):
+        """Test that stored entries are appended in blocks and the closest one wins"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            cache = self._make_cache(temp_dir, distance=0.5)
+            
+            for i in range(5):
+                cache._embed = Mock(return_value=[0.0] * (i + 2) + [1.0] + [0.0] * (1533 - i))
+                cache.store(f"query {i}", {"response": f"answer {i}", "model": "gpt-4o-mini"})
+            
+            assert cache._size == 6
+            assert len(cache._matrix) == 8
+            
+            cache._embed = Mock(return_value=[0.0] * 4 + [1.0] + [0.0] * 1531)
+            assert cache.lookup("query 2")["response"] == "answer 2"
+    
+    def test_feedback_adapts_threshold(self):
+        """Test that low-quality feedback tightens and high-quality relaxes t_s"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            cache = SemanticCache(db_path=temp_dir, threshold=0.92)
+            
+            cache.record_feedback(high_quality=False)
+            assert cache.threshold == pytest.approx(0.93)
+            
+            for _ in range(20):
+                cache.record_feedback(high_quality=True)
+            assert cache.threshold < 0.93
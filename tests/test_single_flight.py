@@ -0,0 +1,68 @@
+"""
+Test suite for single-flight call deduplication
+
+Ensures concurrent callers for the same key share one computation.
+"""
+
+import threading
+import time
+
+import pytest
+
+from src.models.single_flight import SingleFlight
+
+
+class TestSingleFlight:
+    """Test the SingleFlight class"""
+    
+    def test_concurrent_callers_share_one_call(self):
+        """Test that followers receive the leader's result without recomputing"""
+        flight = SingleFlight(timeout=5)
+        calls = []
+        started = threading.Event()
+        release = threading.Event()
+        
+        def answer():
+            calls.append(1)
+            started.set()
+            release.wait(5)
+            return {"answer": "Apply online through ACCESS NYC"}
+        
+        results = []
+        leader = threading.Thread(target=lambda: results.append(flight.do("snap", answer)))
+        leader.start()
+        started.wait(5)
+        
+        followers = [threading.Thread(target=lambda: results.append(flight.do("snap", answer))) for _ in range(4)]
+        for thread in followers:
+            thread.start()
+        time.sleep(0.05)
+        release.set()
+        for thread in [leader] + followers:
+            thread.join(5)
+        
+        assert len(calls) == 1
+        assert len(results) == 5
+        assert all(result is results[0] for result in results)
+        assert flight.shared == 4
+        assert len(flight) == 0
+    
+    def test_sequential_calls_recompute(self):
+        """Test that a finished call is not reused by later callers"""
+        flight = SingleFlight()
+        counter = iter(range(10))
+        
+        assert flight.do("snap", lambda: next(counter)) == 0
+        assert flight.do("snap", lambda: next(counter)) == 1
+    
+    def test_leader_error_propagates_and_releases_key(self):
+        """Test that a failing leader raises and does not leave the key in flight"""
+        flight = SingleFlight()
+        
+        def fail():
+            raise RuntimeError("rate_limit")
+        
+        with pytest.raises(RuntimeError):
+            flight.do("snap", fail)
+        assert len(flight) == 0
+        assert flight.do("snap", lambda: "ok") == "ok"
@@ -0,0 +1,41 @@
+"""
+Test suite for BPE token counting
+
+Ensures budget estimates use the real tokenizer when available and a
+stable approximation otherwise.
+"""
+
+import pytest
+from unittest.mock import patch
+
+from src.models import tokenizer
+
+
+class TestCountTokens:
+    """Test the count_tokens helper"""
+    
+    def test_empty_text(self):
+        """Test that empty text costs nothing"""
+        assert tokenizer.count_tokens("") == 0
+    
+    def test_fallback_without_tiktoken(self):
+        """Test the ~4 characters per token approximation"""
+        with patch.object(tokenizer, "tiktoken", None):
+            assert tokenizer.count_tokens("How do I apply for SNAP?") == 6
+    
+    def test_bpe_count(self):
+        """Test that tiktoken counts match the model encoding"""
+        tiktoken = pytest.importorskip("tiktoken")
+        text = "How do I apply for unemployment benefits in NYC?"
+        
+        expected = len(tiktoken.encoding_for_model("gpt-4o-mini").encode_ordinary(text))
+        assert tokenizer.count_tokens(text) == expected
+        assert tokenizer.count_tokens(text, "an-unknown-model") == expected
+    
+    def test_batch_matches_single(self):
+        """Test that batched counts equal per-text counts, with or without tiktoken"""
+        texts = ["How do I apply for SNAP?", "", "Medicaid renewal deadlines in NYC"]
+        
+        assert tokenizer.count_tokens_batch(texts) == [tokenizer.count_tokens(text) for text in texts]
+        with patch.object(tokenizer, "tiktoken", None):
+            assert tokenizer.count_tokens_batch(texts) == [tokenizer.count_tokens(text) for text in texts]
@@ -0,0 +1,60 @@
+"""
+Test suite for the in-process TTL cache
+
+Ensures memoized responses are evicted by recency and expire after their TTL.
+"""
+
+from unittest.mock import patch
+
+from src.models.ttl_cache import TTLCache
+
+
+class TestTTLCache:
+    """Test the TTLCache class"""
+    
+    def test_get_and_set(self):
+        """Test basic hits and misses"""
+        cache = TTLCache(maxsize=4, ttl=60)
+        assert cache.get(("snap", "how do i apply?")) is None
+        
+        cache.set(("snap", "how do i apply?"), "Apply online through ACCESS NYC")
+        assert cache.get(("snap", "how do i apply?")) == "Apply online through ACCESS NYC"
+        assert cache.cache_info()["hits"] == 1
+        assert cache.cache_info()["misses"] == 1
+    
+    def test_lru_eviction(self):
+        """Test that the least recently used entry is evicted when full"""
+        cache = TTLCache(maxsize=2, ttl=60)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+        
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+        assert cache.get("c") == 3
+    
+    def test_expiry_and_prune(self):
+        """Test that expired entries are not returned and are pruned"""
+        cache = TTLCache(maxsize=4, ttl=10)
+        with patch("src.models.ttl_cache.time.time", return_value=1000.0):
+            cache.set("a", 1)
+            cache.set("b", 2)
+        
+        with patch("src.models.ttl_cache.time.time", return_value=1011.0):
+            assert cache.get("a") is None
+            cache.prune()
+        
+        assert len(cache) == 0
+    
+    def test_jitter_extends_expiry(self):
+        """Test that jittered entries live between ttl and ttl * (1 + jitter)"""
+        cache = TTLCache(maxsize=4, ttl=10, jitter=0.1)
+        with patch("src.models.ttl_cache.time.time", return_value=1000.0), \
+             patch("src.models.ttl_cache.random.uniform", return_value=1.0):
+            cache.set("a", 1)
+        
+        with patch("src.models.ttl_cache.time.time", return_value=1010.5):
+            assert cache.get("a") == 1
+        with patch("src.models.ttl_cache.time.time", return_value=1011.5):
+            assert cache.get("a") is None
@@ -6,6 +6,7 @@ ensuring reliable document storage and retrieval for the 100-query evaluation
 targeting ≥ 90% Self-Service Success Rate.
 """
 
+import numpy as np
 import pytest
 from unittest.mock import Mock, patch, MagicMock
 from typing import List, Dict
@@ -135,6 +136,107 @@ class TestVectorStore:
             assert len(call_args[1]["embeddings"]) == 2
             assert len(call_args[1]["metadatas"]) == 2
             assert len(call_args[1]["ids"]) == 2
+            assert call_args[1]["embeddings"].shape == (2, 3)
+            assert call_args[1]["embeddings"].dtype == np.float32
+    
+    @patch('chromadb.PersistentClient')
+    def test_add_documents_dequantizes_int8(self, mock_client_class):
+        """Test that int8 records are scaled back to float32 before insert"""
+        mock_client = Mock()
+        mock_collection = Mock()
+        mock_client.get_or_create_collection.return_value = mock_collection
+        mock_client_class.return_value = mock_client
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            vector_store = VectorStore(db_path=temp_dir)
+            vector_store.init_vector_store()
+            
+            records = [
+                {
+                    "text": "SNAP income limits",
+                    "embedding": np.array([127, -64], dtype=np.int8),
+                    "embedding_scale": 0.5,
+                    "metadata": {"source": "snap.txt"}
+                }
+            ]
+            
+            assert vector_store.add_documents(records) is True
+            embeddings = mock_collection.add.call_args[1]["embeddings"]
+            assert embeddings.dtype == np.float32
+            assert embeddings.tolist() == [[63.5, -32.0]]
+    
+    @patch('chromadb.PersistentClient')
+    def test_add_documents_malformed_embeddings(self, mock_client_class):
+        """Test that ragged or missing embeddings return False instead of raising"""
+        mock_client = Mock()
+        mock_collection = Mock()
+        mock_client.get_or_create_collection.return_value = mock_collection
+        mock_client_class.return_value = mock_client
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            vector_store = VectorStore(db_path=temp_dir)
+            vector_store.init_vector_store()
+            
+            ragged = [
+                {"text": "a", "embedding": [0.1, 0.2], "metadata": {}},
+                {"text": "b", "embedding": [0.3], "metadata": {}}
+            ]
+            missing = [{"text": "c", "embedding": None, "metadata": {}}]
+            
+            assert vector_store.add_documents(ragged) is False
+            assert vector_store.add_documents(missing) is False
+            mock_collection.add.assert_not_called()
+    
+    @patch('chromadb.PersistentClient')
+    def test_add_arrays_single_bulk_call(self, mock_client_class):
+        """Test that parallel arrays are passed straight to one collection.add"""
+        mock_client = Mock()
+        mock_collection = Mock()
+        mock_client.get_or_create_collection.return_value = mock_collection
+        mock_client_class.return_value = mock_client
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            vector_store = VectorStore(db_path=temp_dir)
+            vector_store.init_vector_store()
+            
+            ids = ["snap_chunk_0", "snap_chunk_1"]
+            embeddings = [[0.1, 0.2], [0.3, 0.4]]
+            documents = ["SNAP income limits", "SNAP household size"]
+            metadatas = [{"service_type": "snap"}, {"service_type": "snap"}]
+            
+            success = vector_store.add_arrays(ids, embeddings, documents, metadatas)
+            
+            assert success is True
+            mock_collection.add.assert_called_once_with(
+                documents=documents,
+                embeddings=embeddings,
+                metadatas=metadatas,
+                ids=ids
+            )
+    
+    @patch('chromadb.PersistentClient')
+    def test_get_embeddings_by_hash(self, mock_client_class):
+        """Test that stored embeddings are looked up by chunk_hash metadata"""
+        mock_client = Mock()
+        mock_collection = Mock()
+        mock_collection.get.return_value = {
+            "metadatas": [{"chunk_hash": "a1b2c3d4e5f60718"}],
+            "embeddings": [[0.1, 0.2]]
+        }
+        mock_client.get_or_create_collection.return_value = mock_collection
+        mock_client_class.return_value = mock_client
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            vector_store = VectorStore(db_path=temp_dir)
+            vector_store.init_vector_store()
+            
+            found = vector_store.get_embeddings_by_hash(["a1b2c3d4e5f60718", "ffffffffffffffff"])
+            
+            assert found == {"a1b2c3d4e5f60718": [0.1, 0.2]}
+            mock_collection.get.assert_called_once_with(
+                where={"chunk_hash": {"$in": ["a1b2c3d4e5f60718", "ffffffffffffffff"]}},
+                include=["embeddings", "metadatas"]
+            )
     
     @patch('chromadb.PersistentClient')
     def test_add_documents_failure(self, mock_client_class):
@@ -0,0 +1,10 @@
+"""
+WSGI entrypoint for NYC Services GPT API Server
+
+Used by production servers, e.g.:
+    gunicorn --worker-class gthread --workers 2 --threads 32 wsgi:application
+"""
+
+from src.api.server import app
+
+application = app